@@ -1,6 +1,7 @@
 from ferdelance.config import config_manager
 from ferdelance.logging import get_logger, get_log_formatter
 from ferdelance.node.deployment import start_node, wait_node
+from ferdelance.tasks.jobs.execution import ray_options
 
 import logging
 import ray
@@ -14,7 +15,7 @@ if __name__ == "__main__":
     config = config_manager.get()
     config.dump()
 
-    ray.init()
+    ray.init(**ray_options(config.node))
 
     # set ray loggers
     for log_name in ("ray", "ray.serve"):
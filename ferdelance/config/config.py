@@ -104,11 +104,63 @@ class NodeConfiguration(BaseModel):
     # concat server node each interval in second for update when mode=client
     heartbeat: float = 2.0
 
+    # create the jobs of an Iterate step one iteration at a time, when the previous one completes:
+    # this bounds the pending jobs, while the jobs of completed iterations stay in the database
+    lazy_iterations: bool = False
+
+    # order in which a worker receives its scheduled jobs: "fifo", "priority", or "fair"
+    scheduling_policy: str = "fifo"
+    # weights of the projects (by token) for the "fair" policy, projects not listed have weight 1
+    scheduling_weights: dict[str, float] = dict()
+    # seconds of past activity considered by the "fair" policy
+    scheduling_window: float = 3600.0
+
+    # CPUs that the jobs of this node can use together, 0 to use all the available ones
+    cpus: int = 0
+    # CPUs (and threads) of each job, 0 to give each job all the CPUs of the node, so that one job runs at a time
+    # when cpus is set, or to not limit the jobs when it is not
+    cpus_per_job: int = 0
+
     @model_validator(mode="before")
     @classmethod
     def env_var_validate(cls, values: dict[str, Any]):
         return check_for_env_variables(values, "ferdelance_node")
 
+    @model_validator(mode="after")
+    def check_cpus(self) -> "NodeConfiguration":
+        if self.cpus < 0 or self.cpus_per_job < 0:
+            raise ValueError("cpus and cpus_per_job cannot be negative")
+
+        # a job that requires more CPUs than the node has would never start
+        if self.cpus_per_job > self.cpu_budget():
+            raise ValueError(f"cpus_per_job={self.cpus_per_job} is greater than the node budget={self.cpu_budget()}")
+
+        return self
+
+    def cpu_budget(self) -> int:
+        """Number of CPUs available to the jobs of this node."""
+        return self.cpus or os.cpu_count() or 1
+
+    def job_cpus(self) -> int | None:
+        """Number of CPUs reserved by a single job, or None when jobs are not limited."""
+        if self.cpus_per_job:
+            return self.cpus_per_job
+
+        if self.cpus:
+            return self.cpus
+
+        return None
+
+    def max_jobs(self) -> int | None:
+        """Number of jobs that this node can run at the same time, or None when
+        jobs are not limited."""
+        job_cpus = self.job_cpus()
+
+        if job_cpus is None:
+            return None
+
+        return max(1, self.cpu_budget() // job_cpus)
+
 
 class JoinConfiguration(BaseModel):
     first: bool = False
@@ -143,7 +195,10 @@ class DataSourceConfiguration(BaseModel):
     kind: str
     type: str
     conn: str | None = None
+    table: str | None = None
     path: str | None = None
+    # read the datasource in batches of this many rows instead of loading it all in memory
+    batch_size: int | None = None
 
     @model_validator(mode="before")
     @classmethod
@@ -167,16 +222,19 @@ class DataSourceStorage:
 
             if ds.kind == "db":
                 if ds.conn is None:
-                    LOGGER.error(f"Missing connection for datasource with name={ds.conn}")
+                    LOGGER.error(f"Missing connection for datasource with name={ds.name}")
+                    continue
+                if ds.table is None:
+                    LOGGER.error(f"Missing table for datasource with name={ds.name}")
                     continue
-                datasource = DataSourceDB(ds.name, ds.type, ds.conn, tokens)
+                datasource = DataSourceDB(ds.name, ds.type, ds.conn, ds.table, tokens, batch_size=ds.batch_size)
                 self.datasources[datasource.hash] = datasource
 
             if ds.kind == "file":
                 if ds.path is None:
                     LOGGER.error(f"Missing path for datasource with name={ds.conn}")
                     continue
-                datasource = DataSourceFile(ds.name, ds.type, ds.path, tokens)
+                datasource = DataSourceFile(ds.name, ds.type, ds.path, tokens, batch_size=ds.batch_size)
                 self.datasources[datasource.hash] = datasource
 
     def metadata(self) -> Metadata:
@@ -298,6 +356,9 @@ class Configuration(BaseSettings):
     def storage_artifact(self, artifact_id: str, iteration: int = 0) -> Path:
         return self.storage_artifact_dir() / artifact_id / str(iteration)
 
+    def storage_steps(self, artifact_id: str) -> Path:
+        return self.storage_artifact_dir() / artifact_id / "steps"
+
     def storage_job(self, artifact_id: str, job_id: str, iteration: int = 0) -> Path:
         d = self.storage_artifact(artifact_id, iteration) / job_id
         os.makedirs(d, exist_ok=True)
@@ -10,7 +10,10 @@ __all__ = [
     "Initialize",
     "Parallel",
     "Sequential",
+    "SecureParallel",
+    "Ring",
     "RoundRobin",
+    "TreeAggregation",
     "Finalize",
     "Iterate",
     "Artifact",
@@ -25,7 +28,7 @@ __all__ = [
 from .entity import Entity
 from .environment import Environment, EnvResource, EnvProduct
 from .interfaces import SchedulerContext, SchedulerJob, Step, BaseStep, Iterate
-from .steps import Initialize, Parallel, Sequential, RoundRobin, Finalize
+from .steps import Initialize, Parallel, Sequential, SecureParallel, Ring, TreeAggregation, Finalize
 from .artifacts import Artifact, ArtifactStatus
 from .model import TModel as Model
 from .metrics import Metrics
@@ -17,6 +17,8 @@ class Artifact(Entity):
     project_id: str
     steps: SerializeAsAny[Sequence[BaseStep | Iterate | Step]]
     random_state: Any = None
+    # artifacts with higher priority are executed first, when the node uses the priority scheduling policy
+    priority: int = 0
 
     def jobs(self, context: SchedulerContext) -> Sequence[SchedulerJob]:
         jobs = []
@@ -29,7 +31,7 @@ class Artifact(Entity):
         for step0, step1 in pairwise(self.steps):
             jobs1 = step1.jobs(context)
 
-            step0.bind(jobs0, jobs1)
+            step1.bind_previous(step0, jobs0, jobs1)
 
             jobs += jobs0
             jobs0 = jobs1
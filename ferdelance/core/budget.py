@@ -0,0 +1,99 @@
+from typing import Any
+
+from ferdelance.logging import get_logger
+
+from threadpoolctl import threadpool_limits
+
+import os
+
+LOGGER = get_logger(__name__)
+
+
+# variables read by the numerical libraries when their thread pools are created
+THREAD_VARIABLES = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+# budget of the current process, with the state to restore when it is removed
+_budget: dict[str, Any] = {
+    "cpus": None,
+    "limits": None,
+    "environ": dict(),
+}
+
+
+def set_cpu_budget(cpus: int | None) -> None:
+    """Limits the CPUs used by the current process. The thread pools of the
+    numerical libraries already loaded (BLAS, OpenMP) are resized, the environment
+    variables read by the ones loaded later are set, and the models capping their
+    `n_jobs` with `cap_n_jobs()` will use at most this number of CPUs.
+
+    Args:
+        cpus (int | None):
+            Number of CPUs that can be used. If None, a previous budget is removed
+            and the original limits are restored.
+
+    Raises:
+        ValueError:
+            If the number of CPUs is less than one.
+    """
+    if cpus is not None and cpus < 1:
+        raise ValueError(f"invalid CPU budget: {cpus}")
+
+    if _budget["limits"] is not None:
+        _budget["limits"].restore_original_limits()
+
+        for var, value in _budget["environ"].items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
+
+    _budget["cpus"] = cpus
+    _budget["limits"] = None
+    _budget["environ"] = dict()
+
+    if cpus is None:
+        return
+
+    LOGGER.info(f"limiting process to {cpus} CPU(s)")
+
+    for var in THREAD_VARIABLES:
+        _budget["environ"][var] = os.environ.get(var)
+        os.environ[var] = str(cpus)
+
+    _budget["limits"] = threadpool_limits(limits=cpus)
+
+
+def get_cpu_budget() -> int | None:
+    """Returns the number of CPUs the current process can use, or None if it is
+    not limited."""
+    return _budget["cpus"]
+
+
+def cap_n_jobs(n_jobs: int | None) -> int | None:
+    """Caps the `n_jobs` parameter of a model to the CPU budget of the process.
+    The parameter follows the semantic of scikit-learn: None is a single job,
+    -1 all the CPUs, -2 all the CPUs but one, and so on.
+
+    Args:
+        n_jobs (int | None):
+            Value requested for the parameter.
+
+    Returns:
+        int | None:
+            The value to use, unchanged when there is no budget.
+    """
+    cpus = get_cpu_budget()
+
+    if cpus is None or n_jobs is None:
+        return n_jobs
+
+    if n_jobs < 0:
+        return max(1, cpus + 1 + n_jobs)
+
+    return max(1, min(n_jobs, cpus))
@@ -0,0 +1,266 @@
+"""Container format used to store the resources produced by the tasks.
+
+A container is a single file with a small JSON index followed by one data block
+for each key of the stored dictionary. The blocks are aligned so that numpy
+arrays can be used directly from a memory-mapped file:
+
+    MAGIC | index length (uint64) | index (JSON) | padding | block | padding | block | ...
+
+Numpy arrays are stored as raw buffers, pandas objects as Arrow IPC streams, and
+everything else falls back to pickle. Containers are written with the `SUFFIX`
+extension. Files without the magic prefix are plain pickle files, written with
+the `.pkl` extension by previous versions, and are still loaded as such.
+"""
+
+from typing import Any, Iterator, Mapping
+
+from pathlib import Path
+
+import io
+import json
+import mmap
+import os
+import pickle
+import struct
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+MAGIC: bytes = b"FDLCNT01"
+SUFFIX: str = ".bin"
+ALIGNMENT: int = 64
+
+HEADER = struct.Struct("<Q")
+
+
+def _aligned(n: int) -> int:
+    return (n + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _arrow_frame(df: pd.DataFrame) -> bytes | None:
+    if not all(isinstance(c, str) for c in df.columns):
+        return None
+
+    try:
+        table = pa.Table.from_pandas(df)
+    except (pa.ArrowException, TypeError, ValueError):
+        return None
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    return sink.getvalue().to_pybytes()
+
+
+def _encode(value: Any) -> tuple[dict[str, Any], Any]:
+    """Returns the index entry and the content of the block for the given value."""
+    if isinstance(value, np.ndarray) and value.dtype.kind in "biufcmM":
+        value = np.ascontiguousarray(value)
+        meta = {
+            "kind": "ndarray",
+            "dtype": value.dtype.str,
+            "shape": list(value.shape),
+        }
+        return meta, value.reshape(-1).view(np.uint8)
+
+    if isinstance(value, pd.DataFrame):
+        content = _arrow_frame(value)
+        if content is not None:
+            return {"kind": "frame"}, content
+
+    if isinstance(value, pd.Series) and (value.name is None or isinstance(value.name, str)):
+        content = _arrow_frame(value.to_frame(name="values"))
+        if content is not None:
+            return {"kind": "series", "name": value.name}, content
+
+    return {"kind": "pickle"}, pickle.dumps(value)
+
+
+def _decode(buffer: memoryview, meta: dict[str, Any]) -> Any:
+    kind = meta["kind"]
+
+    if kind == "ndarray":
+        dtype = np.dtype(meta["dtype"])
+        shape = tuple(meta["shape"])
+        return np.frombuffer(buffer, dtype=dtype, count=int(np.prod(shape, dtype=np.int64))).reshape(shape)
+
+    if kind == "frame":
+        return pa.ipc.open_stream(pa.py_buffer(buffer)).read_all().to_pandas()
+
+    if kind == "series":
+        df = pa.ipc.open_stream(pa.py_buffer(buffer)).read_all().to_pandas()
+        series = df["values"]
+        series.name = meta["name"]
+        return series
+
+    if kind == "pickle":
+        return pickle.loads(buffer)
+
+    raise ValueError(f"Unsupported block kind={kind}")
+
+
+class ResourceContainer(Mapping[str, Any]):
+    """Read-only view of a stored container. Values are decoded only when
+    accessed for the first time, and numpy arrays are backed by the underlying
+    buffer (copy-on-write when the buffer is a memory-mapped file).
+    """
+
+    def __init__(self, buffer: Any) -> None:
+        """
+        Args:
+            buffer (Any):
+                Content of the container, as bytes or as a memory-mapped file.
+
+        Raises:
+            ValueError:
+                If the content is not a valid container.
+        """
+        self._buffer: Any = buffer
+        view = memoryview(buffer)
+
+        if bytes(view[: len(MAGIC)]) != MAGIC:
+            raise ValueError("Content is not a resource container")
+
+        start = len(MAGIC)
+        (index_len,) = HEADER.unpack_from(view, start)
+        start += HEADER.size
+
+        self._index: dict[str, dict[str, Any]] = json.loads(bytes(view[start : start + index_len]))
+        self._data_offset: int = _aligned(start + index_len)
+        self._view: memoryview = view
+        self._cache: dict[str, Any] = dict()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._cache:
+            meta = self._index[key]
+            offset = self._data_offset + meta["offset"]
+            block = self._view[offset : offset + meta["length"]]
+
+            self._cache[key] = _decode(block, meta)
+
+        return self._cache[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __repr__(self) -> str:
+        return f"ResourceContainer(keys={list(self._index)})"
+
+    def to_dict(self) -> dict[str, Any]:
+        """Decodes all the values and returns them as a standard dictionary."""
+        return {k: self[k] for k in self._index}
+
+
+def dumps(data: dict[str, Any]) -> bytes:
+    """Serializes a dictionary in the container format.
+
+    Args:
+        data (dict[str, Any]):
+            Dictionary to serialize.
+
+    Returns:
+        bytes:
+            The serialized content.
+    """
+    buffer = io.BytesIO()
+    _write(data, buffer)
+    return buffer.getvalue()
+
+
+def dump(data: Any, path: Path) -> None:
+    """Stores the given data on disk. Dictionaries with string keys are stored
+    in the container format, any other object is pickled.
+
+    The data are written to a temporary file that then replaces the destination:
+    values memory-mapped from the destination itself, as a loaded resource set
+    again, stay valid while they are written.
+
+    Args:
+        data (Any):
+            Data to store.
+        path (Path):
+            Destination file.
+    """
+    tmp = Path(path).with_name(f".{Path(path).name}.{os.getpid()}.tmp")
+
+    try:
+        with open(tmp, "wb") as f:
+            if isinstance(data, dict) and all(isinstance(k, str) for k in data):
+                _write(data, f)
+            else:
+                pickle.dump(data, f)
+
+        os.replace(tmp, path)
+
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _write(data: dict[str, Any], f: Any) -> None:
+    index: dict[str, dict[str, Any]] = dict()
+    blocks: list[Any] = list()
+
+    offset = 0
+    for key, value in data.items():
+        meta, content = _encode(value)
+        length = len(memoryview(content).cast("B"))
+
+        index[key] = meta | {"offset": offset, "length": length}
+        blocks.append(content)
+
+        offset = _aligned(offset + length)
+
+    index_bytes = json.dumps(index).encode("utf8")
+    header = MAGIC + HEADER.pack(len(index_bytes)) + index_bytes
+
+    f.write(header)
+    f.write(b"\0" * (_aligned(len(header)) - len(header)))
+
+    for key, content in zip(index, blocks):
+        length = index[key]["length"]
+        f.write(content)
+        f.write(b"\0" * (_aligned(length) - length))
+
+
+def load(path: Path) -> Any:
+    """Loads data stored with `dump()`. Containers are memory-mapped and decoded
+    lazily, while pickle files are fully loaded.
+
+    Args:
+        path (Path):
+            File to load.
+
+    Returns:
+        Any:
+            A ResourceContainer, or the unpickled object.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            f.seek(0)
+            return pickle.load(f)
+
+        # the mapping stays valid after the file has been closed
+        return ResourceContainer(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY))
+
+
+def loads(data: bytes) -> Any:
+    """Loads data serialized in the container format or with pickle.
+
+    Args:
+        data (bytes):
+            Serialized content.
+
+    Returns:
+        Any:
+            A ResourceContainer, or the unpickled object.
+    """
+    if data[: len(MAGIC)] != MAGIC:
+        return pickle.loads(data)
+
+    return ResourceContainer(data)
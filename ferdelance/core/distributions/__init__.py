@@ -5,9 +5,11 @@ __all__ = [
     "Arrange",
     "Distribute",
     "DirectToNext",
+    "Tree",
 ]
 
 from .core import TDistribution as Distribution
 from .many import Distribute, Collect, Arrange
 from .circulars import RoundRobin
 from .sequentials import DirectToNext
+from .trees import Tree
@@ -3,7 +3,7 @@ from ferdelance.core.distributions.core import Distribution
 
 class RoundRobin(Distribution):
     def bind_locks(self, job_ids0: list[int], job_ids1: list[int]) -> list[list[int]]:
-        locks = []
+        locks: list[list[int]] = []
 
         if len(job_ids0) != len(job_ids1):
             raise ValueError("Different amount of jobs between previous and next step")
@@ -13,6 +13,6 @@ class RoundRobin(Distribution):
         for i in range(n):
             x = (i + 1) % n
 
-            locks += [job_ids1[x]]
+            locks.append([job_ids1[x]])
 
         return locks
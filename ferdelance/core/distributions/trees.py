@@ -0,0 +1,25 @@
+from ferdelance.core.distributions.core import Distribution
+
+
+class Tree(Distribution):
+    """Groups the jobs of a step in blocks of `arity` consecutive jobs and
+    assigns each block to a single job of the next step, like the leaves of a
+    k-ary tree with their parent.
+
+    The i-th job of jobs0 locks the (i // arity)-th job of jobs1: only the
+    first jobs of jobs1 are used, the others are free to be locked by
+    different jobs (as the upper levels of a `Tree` step).
+    """
+
+    arity: int = 2
+
+    def bind_locks(self, job_ids0: list[int], job_ids1: list[int]) -> list[list[int]]:
+        if self.arity < 2:
+            raise ValueError("Arity of a tree must be at least 2")
+
+        n_parents = -(-len(job_ids0) // self.arity)
+
+        if len(job_ids1) < n_parents:
+            raise ValueError(f"Not enough jobs in next step, expected at least {n_parents} got {len(job_ids1)}")
+
+        return [[job_ids1[i // self.arity]] for i in range(len(job_ids0))]
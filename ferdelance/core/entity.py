@@ -53,6 +53,9 @@ def create_entities(values: Any) -> Any:
             if "entity" in params:
                 values[key] = class_from_name(params)
 
+            else:
+                create_entities(params)
+
     return values
 
 
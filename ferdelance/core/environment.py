@@ -1,8 +1,11 @@
-from typing import Any
-from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+from dataclasses import InitVar, dataclass, field
+
+from ferdelance.core import containers
 
 from pandas import DataFrame
 from pathlib import Path
+from urllib.parse import quote
 
 import os
 import pickle
@@ -18,8 +21,8 @@ class EnvResource:
 
     def get(self) -> Any:
         if self.data is None:
-            with open(self.path, "rb") as f:
-                self.data = pickle.load(f)
+            # values are decoded only when accessed
+            self.data = containers.load(self.path)
         return self.data
 
 
@@ -43,17 +46,19 @@ class Environment:
 
     label: str = ""
 
-    df: DataFrame | None = None
+    # input data already in memory; df is a property, so that data can also be loaded lazily
+    df: InitVar[DataFrame | None] = None
 
     X_tr: DataFrame | None = None
     Y_tr: DataFrame | None = None
     X_ts: DataFrame | None = None
     Y_ts: DataFrame | None = None
 
-    # resource produced in this step that will stay locally
+    # resource produced in this step that will stay locally, loaded from disk on first access
     locals: dict[str, Any] = field(default_factory=dict)
 
-    _local_path: Path = field(init=False)
+    _locals_dir: Path = field(init=False)
+    _dirty: set[str] = field(init=False, default_factory=set)
 
     # resources that has been created in previous steps
     resources: dict[str, EnvResource] = field(default_factory=dict)
@@ -61,13 +66,44 @@ class Environment:
     # resource produced in this step that will be sent to the next node(s)
     products: dict[str, Any] = field(default_factory=dict)
 
-    def __post_init__(self) -> None:
-        self._local_path = self.working_dir / ".." / "local.pkl"
+    # when set, input data are loaded in df only on first access
+    df_loader: Callable[[], DataFrame] | None = None
+
+    # when set, input data are read in batches from the datasources instead of being loaded in df
+    batch_loader: Callable[[], Iterator[DataFrame]] | None = None
+
+    # datasources the input data comes from
+    datasources: list[Any] = field(default_factory=list)
+
+    _df: DataFrame | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self, df: DataFrame | None) -> None:
+        # each local variable is stored in its own file
+        self._locals_dir = self.working_dir / ".." / "locals"
+
+        # locals given at creation are new values
+        self._dirty = set(self.locals.keys())
+
+        # when df is not given, its default is the property defined below
+        if isinstance(df, DataFrame):
+            self.df = df
+
+    @property
+    def df(self) -> DataFrame | None:
+        if self._df is None and self.df_loader is not None:
+            self._df = self.df_loader()
+            self.df_loader = None
 
-        # load (if exists) local variables
-        if os.path.exists(self._local_path):
-            with open(self._local_path, "rb") as f:
-                self.locals = pickle.load(f)
+        return self._df
+
+    @df.setter
+    def df(self, value: DataFrame | None) -> None:
+        self._df = value
+        self.df_loader = None
+
+    def has_data(self) -> bool:
+        """True when input data are available, without loading them."""
+        return self._df is not None or self.df_loader is not None or self.batch_loader is not None
 
     def __getitem__(self, key: str) -> Any:
         """Returns values stored as a local variable or as a resource.
@@ -75,12 +111,16 @@ class Environment:
         Args:
             key (str):
                 Key used to get the data. If starts with a dot ".", a local
-                variable will be returned; otherwise the relative resource.
+                variable will be returned (loaded from disk on first access);
+                otherwise the relative resource.
 
         Returns:
             Any: values stored as a local variable or as a resource.
         """
         if key.startswith("."):
+            if key not in self.locals:
+                self.locals[key] = self._load_local(key)
+
             return self.locals[key]
 
         if key in self.resources:
@@ -95,16 +135,37 @@ class Environment:
         Args:
             key (str):
                 Key used to set the data. If it starts with a dot ".", a local
-                variable will be set; otherwise the product value will be set.
+                variable will be set and saved by the next `store()`; otherwise
+                the product value will be set. Local variables changed in place
+                must be set again to be saved.
             value (Any):
                 Value to set.
         """
 
         if key.startswith("."):
             self.locals[key] = value
+            self._dirty.add(key)
         else:
             self.products[key] = value
 
+    def is_chunked(self) -> bool:
+        """True when the input data are read in batches instead of being available in df."""
+        return self.batch_loader is not None
+
+    def batches(self) -> Iterator[DataFrame]:
+        """Iterates over the input data one batch at time. When the input data are
+        loaded in memory, the whole df is returned as a single batch.
+
+        Returns:
+            Iterator[DataFrame]:
+                The batches of input data.
+        """
+        if self.batch_loader is not None:
+            yield from self.batch_loader()
+
+        elif self.df is not None:
+            yield self.df
+
     def add_resource(self, resource_id: str, path: Path) -> None:
         """Add a resource with an assigned path on disk."""
         res = EnvResource(
@@ -117,14 +178,59 @@ class Environment:
     def list_resource_ids(self) -> list[str]:
         return list(self.resources.keys())
 
+    def iter_resources(self) -> Iterator[Any]:
+        """Iterates over the content of the resources, one at time. Resources read
+        from disk are released after each iteration, so that only one of them is
+        kept in memory.
+
+        Returns:
+            Iterator[Any]:
+                The content of each resource.
+        """
+        for res in self.resources.values():
+            loaded = res.data is not None
+
+            yield res.get()
+
+            if not loaded:
+                res.data = None
+
     def product_path(self) -> Path:
-        return self.working_dir / f"{self.product_id}.pkl"
+        return self.working_dir / f"{self.product_id}{containers.SUFFIX}"
+
+    def _local_path(self, key: str, suffix: str = containers.SUFFIX) -> Path:
+        return self._locals_dir / f"{quote(key, safe='')}{suffix}"
+
+    def _load_local(self, key: str) -> Any:
+        # locals stored with the pickle extension by previous versions
+        for path in (self._local_path(key), self._local_path(key, ".pkl")):
+            if os.path.exists(path):
+                return containers.load(path)[key]
+
+        # locals stored all together by previous versions
+        legacy = self.working_dir / ".." / "local.pkl"
+
+        if os.path.exists(legacy):
+            with open(legacy, "rb") as f:
+                content = pickle.load(f)
+
+            if key in content:
+                return content[key]
+
+        raise KeyError(key)
+
+    def store_locals(self) -> None:
+        """Stores only the local variables that changed."""
+        if self._dirty:
+            os.makedirs(self._locals_dir, exist_ok=True)
+
+        for key in self._dirty:
+            containers.dump({key: self.locals[key]}, self._local_path(key))
+
+        self._dirty.clear()
 
     def store(self) -> None:
-        # store local data
-        with open(self._local_path, "wb") as f:
-            pickle.dump(self.locals, f)
+        self.store_locals()
 
         # store product
-        with open(self.product_path(), "wb") as f:
-            pickle.dump(self.products, f)
+        containers.dump(self.products, self.product_path())
@@ -1,13 +1,21 @@
 __all__ = [
     "Estimator",
     "CountEstimator",
+    "CovarianceEstimator",
+    "FusedEstimator",
     "GroupCountEstimator",
     "GroupMeanEstimator",
     "MeanEstimator",
+    "MomentsEstimator",
+    "QuantileEstimator",
 ]
 
 from .core import TEstimator as Estimator
 from .counters import CountEstimator
+from .covariance import CovarianceEstimator
 from .means import MeanEstimator
 from .group_means import GroupMeanEstimator
 from .group_counters import GroupCountEstimator
+from .moments import MomentsEstimator
+from .quantiles import QuantileEstimator
+from .fused import FusedEstimator
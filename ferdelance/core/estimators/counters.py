@@ -5,7 +5,7 @@ from ferdelance.core.interfaces import Step
 from ferdelance.core.environment import Environment
 from ferdelance.core.estimators.core import Estimator
 from ferdelance.core.operations import Operation, QueryOperation
-from ferdelance.core.steps import Sequential
+from ferdelance.core.steps import SecureParallel, Sequential
 
 import numpy as np
 
@@ -23,20 +23,30 @@ class InitCounter(Operation):
 
 
 class Count(QueryOperation):
+    """Counts the records. The count is added to the partial count received from
+    the previous worker, if any: without resources only the local count is
+    produced, as in the parallel variant."""
+
     def exec(self, env: Environment) -> Environment:
-        if self.query is not None:
-            env = self.query.apply(env)
+        ids = env.list_resource_ids()
+        if len(ids) > 1:
+            raise ValueError("Count algorithm requires at most one resource")
 
-        if env.df is None:
-            raise ValueError("Input data not set")
+        count = 0
 
-        ids = env.list_resource_ids()
-        if len(ids) != 1:
-            raise ValueError("Count algorithm requires exactly one resource")
+        pushdown = self.pushdown(env)
 
-        r = ids[0]
+        if pushdown is not None:
+            datasources, filters = pushdown
+
+            for ds in datasources:
+                count += ds.count(filters)
+
+        else:
+            for df in self.batches(env):
+                count += df.shape[0]
 
-        env["count"] = env[r]["count"] + env.df.shape[0]
+        env["count"] = env[ids[0]]["count"] + count if ids else count
 
         return env
 
@@ -55,7 +65,17 @@ class CleanCounter(Operation):
 
 
 class CountEstimator(Estimator):
+    # when True, all workers count in parallel with secure aggregation instead of in sequence
+    parallel: bool = False
+
     def get_steps(self) -> Sequence[Step]:
+        if self.parallel:
+            return [
+                SecureParallel(
+                    operation=Count(query=self.query),
+                ),
+            ]
+
         return [
             Sequential(
                 init_operation=InitCounter(),
@@ -0,0 +1,196 @@
+from __future__ import annotations
+from typing import Mapping, Sequence
+
+from ferdelance.core.distributions import Collect
+from ferdelance.core.environment import Environment
+from ferdelance.core.estimators.core import Estimator
+from ferdelance.core.interfaces import Step
+from ferdelance.core.operations import Operation, QueryOperation
+from ferdelance.core.steps import Finalize, Parallel, SecureParallel
+
+import numpy as np
+import pandas as pd
+
+# matrices with the sufficient statistics, with a row and a column for each feature
+COUNT = "count"  # records where both features have a value
+SUMS = "sums"  # sum of the row feature, where both features have a value
+SQUARES = "squares"  # sum of the squares of the row feature, where both features have a value
+PRODUCTS = "products"  # sum of the products of the two features
+
+STATISTICS = (COUNT, SUMS, SQUARES, PRODUCTS)
+
+
+def empty_cross_products(n_features: int) -> dict[str, np.ndarray]:
+    return {k: np.zeros((n_features, n_features), dtype=np.float64) for k in STATISTICS}
+
+
+def cross_products(df: pd.DataFrame, features: list[str], block_size: int) -> dict[str, np.ndarray]:
+    """Computes the sufficient statistics for covariance and correlation of a
+    batch of records. Missing values are excluded pairwise.
+
+    The features are processed in blocks of `block_size` columns, so that only
+    two blocks at time are converted to dense arrays: for wide tables the memory
+    used, besides the output matrices, is bounded by the size of the blocks.
+
+    Args:
+        df (pd.DataFrame):
+            Batch of records.
+        features (list[str]):
+            Numeric features to use.
+        block_size (int):
+            Number of features for each block.
+
+    Returns:
+        dict[str, np.ndarray]:
+            Count, sums, squares, and products matrices.
+    """
+    stats = empty_cross_products(len(features))
+
+    blocks = [(i, i + block_size) for i in range(0, len(features), block_size)]
+
+    def block(start: int, end: int) -> tuple[np.ndarray, np.ndarray]:
+        x = df[features[start:end]].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(x)
+        return np.where(valid, x, 0.0), valid.astype(np.float64)
+
+    for bi, (i0, i1) in enumerate(blocks):
+        xi, mi = block(i0, i1)
+
+        for j0, j1 in blocks[bi:]:
+            xj, mj = (xi, mi) if j0 == i0 else block(j0, j1)
+
+            ij, ji = np.s_[i0:i1, j0:j1], np.s_[j0:j1, i0:i1]
+
+            stats[COUNT][ij] = mi.T @ mj
+            stats[PRODUCTS][ij] = xi.T @ xj
+            stats[SUMS][ij] = xi.T @ mj
+            stats[SUMS][ji] = xj.T @ mi
+            stats[SQUARES][ij] = (xi * xi).T @ mj
+            stats[SQUARES][ji] = (xj * xj).T @ mi
+
+            stats[COUNT][ji] = stats[COUNT][ij].T
+            stats[PRODUCTS][ji] = stats[PRODUCTS][ij].T
+
+    return stats
+
+
+def derive_covariance(stats: Mapping[str, np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """Computes the sample covariance and the Pearson correlation matrices from
+    the sufficient statistics. Pairs with less than two values are NaN.
+
+    Args:
+        stats (Mapping[str, np.ndarray]):
+            Count, sums, squares, and products matrices.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]:
+            Covariance and correlation matrices.
+    """
+    # counts may have been masked with other values
+    n = np.rint(stats[COUNT])
+    s = stats[SUMS]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        centered = stats[PRODUCTS] - s * s.T / n
+        var_rows = stats[SQUARES] - s * s / n
+        var_cols = var_rows.T
+
+        covariance = np.where(n > 1, centered / (n - 1), np.nan)
+        correlation = np.where(n > 1, centered / np.sqrt(var_rows * var_cols), np.nan)
+
+    return covariance, np.clip(correlation, -1.0, 1.0)
+
+
+class CrossProducts(QueryOperation):
+    """Computes the sufficient statistics for covariance and correlation of the
+    features in a single pass over the data."""
+
+    features: list[str]
+    block_size: int = 256
+
+    def exec(self, env: Environment) -> Environment:
+        stats = empty_cross_products(len(self.features))
+
+        for df in self.batches(env):
+            for k, v in cross_products(df, self.features, self.block_size).items():
+                stats[k] += v
+
+        for k, v in stats.items():
+            env[k] = v
+
+        return env
+
+
+class ComputeCovariance(Operation):
+    """Computes covariance and correlation matrices from the sufficient statistics."""
+
+    features: list[str]
+
+    def exec(self, env: Environment) -> Environment:
+        covariance, correlation = derive_covariance({k: env[k] for k in STATISTICS})
+
+        env["features"] = self.features
+        env["covariance"] = covariance
+        env["correlation"] = correlation
+
+        return env
+
+
+class CombineCrossProducts(ComputeCovariance):
+    """Sums the sufficient statistics received, then computes covariance and
+    correlation matrices."""
+
+    def exec(self, env: Environment) -> Environment:
+        stats = empty_cross_products(len(self.features))
+
+        for res in env.iter_resources():
+            if isinstance(res, Mapping) and PRODUCTS in res:
+                for k in STATISTICS:
+                    stats[k] += res[k]
+
+        for k, v in stats.items():
+            env[k] = v
+
+        return super().exec(env)
+
+
+class CovarianceEstimator(Estimator):
+    """Covariance and correlation matrices of the given features, with a row and
+    a column for each feature. Missing values are excluded pairwise, as in
+    `DataFrame.cov()` and `DataFrame.corr()`.
+
+    Each worker computes the sufficient statistics with one pass over its data
+    and blocked matrix products, then they are combined in a single round of
+    jobs. When `masked`, the statistics are hidden with random masks and the
+    initiator only receives their sum; otherwise, the initiator receives the
+    statistics of each worker."""
+
+    features: list[str]
+    # number of features multiplied at time: bounds the memory used on the workers
+    block_size: int = 256
+    masked: bool = False
+
+    def get_steps(self) -> Sequence[Step]:
+        operation = CrossProducts(
+            query=self.query,
+            features=self.features,
+            block_size=self.block_size,
+        )
+
+        if self.masked:
+            return [
+                SecureParallel(
+                    operation=operation,
+                    final_operation=ComputeCovariance(features=self.features),
+                )
+            ]
+
+        return [
+            Parallel(
+                operation,
+                Collect(),
+            ),
+            Finalize(
+                CombineCrossProducts(features=self.features),
+            ),
+        ]
@@ -0,0 +1,85 @@
+from __future__ import annotations
+from typing import Any, Sequence
+
+from ferdelance.core.estimators.core import Estimator, TEstimator
+from ferdelance.core.interfaces import BaseStep, Step
+from ferdelance.core.operations import Fused
+from ferdelance.core.operations.core import Operation
+from ferdelance.core.queries import Query
+
+
+def fuse_steps(steps: dict[str, Sequence[Step]], query: Query | None = None) -> list[Step]:
+    """Merges the steps of multiple estimators into a single sequence of steps.
+
+    The steps in the same position must be of the same type and must have the
+    same parameters, except for their operations: these are merged in a `Fused`
+    operation, with the name of their estimator as key.
+
+    Args:
+        steps (dict[str, Sequence[Step]]):
+            The steps of each estimator, by name of the estimator.
+        query (Query | None, optional):
+            Query applied once to the data, before all the fused operations.
+            Defaults to None.
+
+    Raises:
+        ValueError:
+            If the steps cannot be merged.
+
+    Returns:
+        list[Step]:
+            The fused steps.
+    """
+    lengths = {len(s) for s in steps.values()}
+
+    if len(lengths) != 1:
+        raise ValueError("Estimators with a different number of steps cannot be fused")
+
+    fused: list[Step] = list()
+
+    for group in zip(*steps.values()):
+        first = group[0]
+
+        if not isinstance(first, BaseStep) or any(type(s) is not type(first) for s in group):
+            raise ValueError(f"Cannot fuse steps of different types: {[type(s).__name__ for s in group]}")
+
+        update: dict[str, Any] = dict()
+
+        for field in type(first).model_fields:
+            values = [getattr(s, field) for s in group]
+
+            if any(isinstance(v, Operation) for v in values):
+                update[field] = Fused(
+                    query=query,
+                    operations={name: v for name, v in zip(steps.keys(), values) if v is not None},
+                )
+
+            elif any(v != values[0] for v in values):
+                raise ValueError(f"Cannot fuse {type(first).__name__} steps with different values of {field}")
+
+        fused.append(first.model_copy(update=update))
+
+    return fused
+
+
+class FusedEstimator(Estimator):
+    """Computes multiple estimators over the same query with a single sequence of
+    jobs. Each worker loads the data and applies the query once, then computes
+    all the estimators on them.
+
+    The estimators must produce the same kind of steps: for example, all in the
+    sequential variant or all in the parallel one. The results of each estimator
+    are products of the final job, under the name of the estimator. Queries of
+    the single estimators are applied after the query of this estimator.
+    """
+
+    estimators: dict[str, TEstimator]
+
+    def get_steps(self) -> Sequence[Step]:
+        if not self.estimators:
+            raise ValueError("At least one estimator is required")
+
+        return fuse_steps(
+            {name: estimator.get_steps() for name, estimator in self.estimators.items()},
+            self.query,
+        )
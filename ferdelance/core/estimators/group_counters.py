@@ -5,9 +5,10 @@ from ferdelance.core.environment import Environment
 from ferdelance.core.estimators import Estimator
 from ferdelance.core.interfaces import Step
 from ferdelance.core.operations import Operation, QueryOperation
-from ferdelance.core.steps import Sequential
+from ferdelance.core.steps import SecureParallel, Sequential
 
 import numpy as np
+import pandas as pd
 
 
 class InitGroupCounter(Operation):
@@ -18,49 +19,85 @@ class InitGroupCounter(Operation):
 
         env[".init_value"] = rand_value
         env["noise"] = rand_value
+        env["noised"] = dict()
         env["counts"] = dict()
 
         return env
 
 
+def as_series(counts: Any) -> pd.Series:
+    """Converts the counts of a feature to a Series indexed by the sorted group keys."""
+    if isinstance(counts, pd.Series):
+        return counts
+
+    return pd.Series(counts, dtype=np.int64).sort_index()
+
+
 class GroupCount(QueryOperation):
+    """Counts the records of each group. The counts are added to the partial ones
+    received from the previous worker, if any: without resources only the local
+    counts are produced, as in the parallel variant.
+
+    The counts of each feature are exchanged as a Series indexed by the sorted
+    group keys, so they are merged and masked without iterating over the keys.
+
+    Only the groups counted by the first worker receive the noise: the groups that
+    appear later are tracked in `noised`, so that the noise is removed only from
+    the keys that received it."""
+
     by: list[str]
     features: list[str]
 
     def exec(self, env: Environment) -> Environment:
-        if self.query is not None:
-            env = self.query.apply(env)
+        ids = env.list_resource_ids()
+        if len(ids) > 1:
+            raise ValueError("Count algorithm requires at most one resource")
 
-        if env.df is None:
-            raise ValueError("Input data not set")
+        noise: int = env[ids[0]]["noise"] if ids else 0
+        counts_in: dict[str, Any] = env[ids[0]]["counts"] if ids else dict()
+        noised_in: dict[str, pd.Index] = env[ids[0]]["noised"] if ids else dict()
+        counts_out: dict[str, pd.Series] = dict()
+        noised_out: dict[str, pd.Index] = dict()
 
-        ids = env.list_resource_ids()
-        if len(ids) != 1:
-            raise ValueError("Count algorithm requires exactly one resource")
+        group_count: pd.DataFrame | None = None
 
-        r = ids[0]
+        pushdown = self.pushdown(env)
+
+        if pushdown is not None:
+            datasources, filters = pushdown
+            partials = (ds.group_count(self.by, filters) for ds in datasources)
+        else:
+            partials = (df.groupby(self.by).count() for df in self.batches(env))
 
-        noise: int = env[r]["noise"]
-        counts_in: dict[str, Any] = env[r]["counts"]
-        counts_out: dict[str, Any] = dict()
+        for batch_count in partials:
+            if group_count is None:
+                group_count = batch_count
+            else:
+                group_count = group_count.add(batch_count, fill_value=0)
 
-        group_count = env.df.groupby(self.by).count().to_dict()
+        if group_count is None:
+            group_count = pd.DataFrame()
+
+        group_count = group_count.fillna(0).astype(np.int64)
 
         for feature in self.features:
-            x: dict[str, int] = counts_in.get(feature, dict())
-            y: dict[str, int] = group_count[feature]
+            y = group_count[feature] if feature in group_count else pd.Series(dtype=np.int64)
 
-            counts_out_feature = {k: x.get(k, 0) + y.get(k, 0) for k in set(x) | set(y)}
+            if feature in counts_in:
+                y = as_series(counts_in[feature]).add(y, fill_value=0).astype(np.int64)
 
-            if noise == 0:
-                counts_out[feature] = counts_out_feature
-            else:
-                counts_out[feature] = {k: v + noise for k, v in counts_out_feature.items()}
+            counts_out[feature] = (y + noise).sort_index().rename(None)
+
+            if noise != 0:
+                noised_out[feature] = counts_out[feature].index
+            elif feature in noised_in:
+                noised_out[feature] = noised_in[feature]
 
         env["counts"] = counts_out
 
-        if noise != 0:
+        if ids:
             env["noise"] = 0
+            env["noised"] = noised_out
 
         return env
 
@@ -74,25 +111,54 @@ class CleanGroupCounter(Operation):
         r = ids[0]
 
         counts_in = env[r]["counts"]
-        counts_out = dict()
+        noised = env[r]["noised"]
 
-        for feature in counts_in.keys():
-            counts_out[feature] = dict()
+        counts_out: dict[str, dict[Any, int]] = dict()
 
-            for k in counts_in[feature].keys():
-                counts_out[feature][k] = counts_in[feature][k] - env[".init_value"]
+        for feature, counts in counts_in.items():
+            counts = as_series(counts).copy()
+
+            if feature in noised:
+                counts[counts.index.isin(noised[feature])] -= env[".init_value"]
+
+            counts_out[feature] = counts.to_dict()
 
         env["counts"] = counts_out
 
         return env
 
 
+class FormatGroupCounter(Operation):
+    """Converts the counts received to dictionaries, as produced by `CleanGroupCounter`."""
+
+    def exec(self, env: Environment) -> Environment:
+        env["counts"] = {
+            feature: as_series(counts).astype(np.int64).to_dict() for feature, counts in env["counts"].items()
+        }
+
+        return env
+
+
 class GroupCountEstimator(Estimator):
     # columns to group by
     by: list[str]
     features: list[str]
+    # when True, all workers count in parallel with secure aggregation instead of in sequence
+    parallel: bool = False
 
     def get_steps(self) -> Sequence[Step]:
+        if self.parallel:
+            return [
+                SecureParallel(
+                    operation=GroupCount(
+                        by=self.by,
+                        features=self.features,
+                        query=self.query,
+                    ),
+                    final_operation=FormatGroupCounter(),
+                )
+            ]
+
         return [
             Sequential(
                 init_operation=InitGroupCounter(),
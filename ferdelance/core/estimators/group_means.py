@@ -8,6 +8,7 @@ from ferdelance.core.operations import Operation, QueryOperation
 from ferdelance.core.steps import Sequential
 
 import numpy as np
+import pandas as pd
 
 
 class InitGroupMean(Operation):
@@ -33,12 +34,6 @@ class GroupMean(QueryOperation):
     features: list[str]
 
     def exec(self, env: Environment) -> Environment:
-        if self.query is not None:
-            env = self.query.apply(env)
-
-        if env.df is None:
-            raise ValueError("Input data not set")
-
         ids = env.list_resource_ids()
         if len(ids) != 1:
             raise ValueError("Mean algorithm requires exactly one resource")
@@ -54,14 +49,33 @@ class GroupMean(QueryOperation):
         sums_out: dict[str, Any] = dict()
         nums_out: dict[str, Any] = dict()
 
-        group_sum = env.df.groupby(self.by).sum().to_dict()
-        group_num = env.df.groupby(self.by).count().to_dict()
+        batch_sums: pd.DataFrame | None = None
+        batch_nums: pd.DataFrame | None = None
+
+        pushdown = self.pushdown(env)
+
+        if pushdown is not None:
+            datasources, filters = pushdown
+            partials = ((ds.group_sum(self.by, filters), ds.group_count(self.by, filters)) for ds in datasources)
+        else:
+            partials = ((g.sum(), g.count()) for g in (df.groupby(self.by) for df in self.batches(env)))
+
+        for part_sums, part_nums in partials:
+            if batch_sums is None or batch_nums is None:
+                batch_sums = part_sums
+                batch_nums = part_nums
+            else:
+                batch_sums = batch_sums.add(part_sums, fill_value=0)
+                batch_nums = batch_nums.add(part_nums, fill_value=0)
+
+        group_sum = dict() if batch_sums is None else batch_sums.to_dict()
+        group_num = dict() if batch_nums is None else batch_nums.fillna(0).astype(int).to_dict()
 
         for feature in self.features:
             xs: dict[str, int] = sums_in.get(feature, dict())
-            ys: dict[str, int] = group_sum[feature]
+            ys: dict[str, int] = group_sum.get(feature, dict())
             xn: dict[str, int] = nums_in.get(feature, dict())
-            yn: dict[str, int] = group_num[feature]
+            yn: dict[str, int] = group_num.get(feature, dict())
 
             sums_out_feature = {k: xs.get(k, 0) + ys.get(k, 0) for k in set(xs) | set(ys)}
             nums_out_feature = {k: xn.get(k, 0) + yn.get(k, 0) for k in set(xn) | set(yn)}
@@ -5,7 +5,7 @@ from ferdelance.core.environment import Environment
 from ferdelance.core.estimators.core import Estimator
 from ferdelance.core.interfaces import Step
 from ferdelance.core.operations import Operation, QueryOperation
-from ferdelance.core.steps import Sequential
+from ferdelance.core.steps import SecureParallel, Sequential
 
 import numpy as np
 
@@ -27,21 +27,39 @@ class InitMean(Operation):
 
 
 class Mean(QueryOperation):
+    """Sums and counts the records. The values are added to the partial ones
+    received from the previous worker, if any: without resources only the local
+    values are produced, as in the parallel variant."""
+
     def exec(self, env: Environment) -> Environment:
-        if self.query is not None:
-            env = self.query.apply(env)
+        ids = env.list_resource_ids()
+        if len(ids) > 1:
+            raise ValueError("Mean algorithm requires at most one resource")
 
-        if env.df is None:
-            raise ValueError("Input data not set")
+        total = 0
+        count = 0
 
-        ids = env.list_resource_ids()
-        if len(ids) != 1:
-            raise ValueError("Mean algorithm requires exactly one resource")
+        pushdown = self.pushdown(env)
 
-        r = ids[0]
+        if pushdown is not None:
+            datasources, filters = pushdown
+
+            for ds in datasources:
+                total = total + ds.sum(filters)
+                count += ds.count(filters)
+
+        else:
+            for df in self.batches(env):
+                # only numeric features, as the sums computed by the datasources
+                total = total + df.select_dtypes(include="number").sum(axis=0)
+                count += df.shape[0]
 
-        env["sum"] = env[r]["sum"] + env.df.sum(axis=0)
-        env["count"] = env[r]["count"] + env.df.shape[0]
+        if ids:
+            total = env[ids[0]]["sum"] + total
+            count = env[ids[0]]["count"] + count
+
+        env["sum"] = total
+        env["count"] = count
 
         return env
 
@@ -54,16 +72,34 @@ class CleanMean(Operation):
 
         r = ids[0]
 
-        sum = env[r]["sum"] - env[".init_sum"]
+        total = env[r]["sum"] - env[".init_sum"]
         count = env[r]["count"] - env[".init_count"]
 
-        env["mean"] = 1.0 * sum / count
+        env["mean"] = 1.0 * total / count
+
+        return env
+
+
+class ComputeMean(Operation):
+    def exec(self, env: Environment) -> Environment:
+        env["mean"] = 1.0 * env["sum"] / env["count"]
 
         return env
 
 
 class MeanEstimator(Estimator):
+    # when True, all workers compute in parallel with secure aggregation instead of in sequence
+    parallel: bool = False
+
     def get_steps(self) -> Sequence[Step]:
+        if self.parallel:
+            return [
+                SecureParallel(
+                    operation=Mean(query=self.query),
+                    final_operation=ComputeMean(),
+                )
+            ]
+
         return [
             Sequential(
                 init_operation=InitMean(),
@@ -0,0 +1,77 @@
+from __future__ import annotations
+from typing import Mapping, Sequence
+
+from ferdelance.core.distributions import Collect
+from ferdelance.core.environment import Environment
+from ferdelance.core.estimators.core import Estimator
+from ferdelance.core.interfaces import Step
+from ferdelance.core.moments import batch_moments, derive_moments, empty_moments, merge_moments
+from ferdelance.core.operations import Operation, QueryOperation
+from ferdelance.core.steps import Finalize, Parallel
+
+import numpy as np
+
+
+class Moments(QueryOperation):
+    """Computes count, sum, sum of squares, min, and max of all the features in a
+    single pass over the data. Missing values are ignored."""
+
+    features: list[str]
+
+    def exec(self, env: Environment) -> Environment:
+        moments = empty_moments(len(self.features))
+
+        for df in self.batches(env):
+            x = df[self.features].to_numpy(dtype=np.float64)
+            moments = merge_moments(moments, batch_moments(x))
+
+        env["moments"] = moments
+
+        return env
+
+
+class CombineMoments(Operation):
+    """Merges the moments received and computes the statistics of each feature."""
+
+    features: list[str]
+
+    def exec(self, env: Environment) -> Environment:
+        moments = empty_moments(len(self.features))
+
+        for res in env.iter_resources():
+            if isinstance(res, Mapping) and "moments" in res:
+                moments = merge_moments(moments, res["moments"])
+
+        env["features"] = self.features
+        env["moments"] = moments
+
+        for name, values in derive_moments(moments).items():
+            env[name] = values
+
+        return env
+
+
+class MomentsEstimator(Estimator):
+    """Count, mean, variance, standard deviation, min, and max of the given
+    features, computed with one pass over the data of each worker and a single
+    round of jobs. The results are arrays aligned with the features.
+
+    The initiator receives the aggregated values of each worker."""
+
+    features: list[str]
+
+    def get_steps(self) -> Sequence[Step]:
+        return [
+            Parallel(
+                Moments(
+                    query=self.query,
+                    features=self.features,
+                ),
+                Collect(),
+            ),
+            Finalize(
+                CombineMoments(
+                    features=self.features,
+                ),
+            ),
+        ]
@@ -0,0 +1,115 @@
+from __future__ import annotations
+from typing import Mapping, Sequence
+
+from ferdelance.core.distributions import Collect
+from ferdelance.core.environment import Environment
+from ferdelance.core.estimators.core import Estimator
+from ferdelance.core.interfaces import Step
+from ferdelance.core.operations import Operation, QueryOperation
+from ferdelance.core.sketches import Histogram, QuantileSketch
+from ferdelance.core.steps import Finalize, Parallel
+
+import numpy as np
+
+
+class Sketches(QueryOperation):
+    """Builds a quantile sketch, and optionally a histogram on fixed bins, of each
+    feature in a single pass over the data. Missing values are ignored."""
+
+    features: list[str]
+    k: int = 200
+    bins: list[float] | None = None
+
+    def exec(self, env: Environment) -> Environment:
+        sketches = {f: QuantileSketch(k=self.k) for f in self.features}
+        histograms = {f: Histogram(edges=self.bins) for f in self.features} if self.bins else dict()
+
+        for df in self.batches(env):
+            x = df[self.features].to_numpy(dtype=np.float64)
+
+            for i, f in enumerate(self.features):
+                sketches[f].update(x[:, i])
+
+                if f in histograms:
+                    histograms[f].update(x[:, i])
+
+        env["sketches"] = sketches
+        env["histograms"] = histograms
+
+        return env
+
+
+class CombineSketches(Operation):
+    """Merges the sketches and the histograms received and estimates the quantiles
+    of each feature."""
+
+    features: list[str]
+    quantiles: list[float]
+    k: int = 200
+    bins: list[float] | None = None
+
+    def exec(self, env: Environment) -> Environment:
+        sketches = {f: QuantileSketch(k=self.k) for f in self.features}
+        histograms = {f: Histogram(edges=self.bins) for f in self.features} if self.bins else dict()
+
+        for res in env.iter_resources():
+            if not isinstance(res, Mapping) or "sketches" not in res:
+                continue
+
+            for f in self.features:
+                sketches[f].merge(res["sketches"][f])
+
+                if f in histograms:
+                    histograms[f].merge(res["histograms"][f])
+
+        env["features"] = self.features
+        env["sketches"] = sketches
+        env["quantiles"] = np.column_stack([sketches[f].quantile(self.quantiles) for f in self.features])
+
+        if self.bins:
+            env["edges"] = np.asarray(self.bins, dtype=np.float64)
+            env["histograms"] = np.vstack([np.asarray(histograms[f].counts, dtype=np.int64) for f in self.features])
+
+        return env
+
+
+class QuantileEstimator(Estimator):
+    """Quantiles of the given features, estimated with mergeable sketches built
+    with one pass over the data of each worker, and a single round of jobs. The
+    memory used by each sketch is bounded by `k`, which also controls the error
+    on the rank of the quantiles.
+
+    The result is an array with a row for each quantile and a column for each
+    feature. When `bins` are given, also an exact histogram of each feature on
+    those edges is returned, with a row for each feature.
+
+    The initiator receives the sketches of each worker. A sketch is made of
+    values sampled from the data: when a worker has at most `k` values of a
+    feature, its sketch contains all of them. Use this estimator only when the
+    initiator is allowed to see individual values."""
+
+    features: list[str]
+    quantiles: list[float] = [0.25, 0.5, 0.75]
+    k: int = 200
+    bins: list[float] | None = None
+
+    def get_steps(self) -> Sequence[Step]:
+        return [
+            Parallel(
+                Sketches(
+                    query=self.query,
+                    features=self.features,
+                    k=self.k,
+                    bins=self.bins,
+                ),
+                Collect(),
+            ),
+            Finalize(
+                CombineSketches(
+                    features=self.features,
+                    quantiles=self.quantiles,
+                    k=self.k,
+                    bins=self.bins,
+                ),
+            ),
+        ]
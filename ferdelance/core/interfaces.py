@@ -39,6 +39,9 @@ class SchedulerContext(BaseModel):
 
     current_id: int = 0
 
+    # when True, Iterate steps create only the jobs of the current iteration
+    lazy: bool = False
+
     def get_id(self) -> int:
         i = self.current_id
         self.current_id += 1
@@ -88,6 +91,21 @@ class Step(ABC, Entity):
         """
         raise NotImplementedError()
 
+    def bind_previous(self, step: Step, jobs0: Sequence[SchedulerJob], jobs1: Sequence[SchedulerJob]) -> None:
+        """Binds the jobs of the previous step to the jobs of this step. By default,
+        the previous step assigns the locks with its own distribution; steps that
+        require a particular distribution of their input can override this method.
+
+        Args:
+            step (Step):
+                The previous step.
+            jobs0 (Sequence[SchedulerJob]):
+                Jobs created with the previous step.
+            jobs1 (Sequence[SchedulerJob]):
+                Jobs created with this step.
+        """
+        step.bind(jobs0, jobs1)
+
     @abstractmethod
     def step(self, env: Environment) -> Environment:
         raise NotImplementedError()
@@ -135,10 +153,28 @@ class Iterate(Step):
         raise ValueError("Iterate is a meta-step and does not have a bind method!")
 
     def jobs(self, context: SchedulerContext) -> list[SchedulerJob]:
+        """Creates the jobs of all the iterations, each one locked by the last
+        job of the previous iteration. If the context is lazy, only the jobs
+        of the current iteration of the context are created: the scheduler will
+        ask for the next iteration when the current one completes.
+
+        Args:
+            context (SchedulerContext):
+                Context of the scheduler.
+
+        Returns:
+            list[SchedulerJob]:
+                The jobs to schedule.
+        """
         job_list: Sequence[SchedulerJob] = []
 
+        if context.lazy:
+            iterations = range(context.iteration, min(context.iteration + 1, self.iterations))
+        else:
+            iterations = range(self.iterations)
+
         last_job = None
-        for it in range(self.iterations):
+        for it in iterations:
             # create jobs for current iteration
             it_jobs: Sequence[SchedulerJob] = []
 
@@ -148,7 +184,7 @@ class Iterate(Step):
             for step0, step1 in pairwise(self.steps):
                 jobs1 = step1.jobs(context)
 
-                step0.bind(jobs0, jobs1)
+                step1.bind_previous(step0, jobs0, jobs1)
 
                 it_jobs += jobs0
                 jobs0 = jobs1
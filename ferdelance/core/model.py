@@ -1,6 +1,7 @@
 from __future__ import annotations
-from typing import Any, Sequence
+from typing import Any, Iterable, Sequence
 from abc import ABC, abstractmethod
+from functools import reduce
 
 from ferdelance.core.entity import Entity
 from ferdelance.core.interfaces import Step
@@ -29,6 +30,9 @@ class Model(ABC, Entity):
 
     query: Query | None = None
 
+    # when True, the training starts from the model received from the previous step, if any
+    warm_start: bool = False
+
     _model: Any = PrivateAttr()
 
     def load(self, path: Path) -> None:
@@ -68,6 +72,29 @@ class Model(ABC, Entity):
     def aggregate(self, model_a, model_b) -> Any:
         raise NotImplementedError()
 
+    def aggregate_many(self, models: Iterable[Any]) -> Any:
+        """Aggregates any number of models in a single model. The models are
+        consumed one at time, so an iterator can be used to avoid keeping all of
+        them in memory.
+
+        The default implementation folds the models with `aggregate()`. Models
+        that can build the aggregate more efficiently when all the models are
+        known should override this method.
+
+        :param models:
+            Models to aggregate, at least one.
+        :raises ValueError:
+            If there are no models to aggregate.
+        """
+        it = iter(models)
+
+        try:
+            base = next(it)
+        except StopIteration:
+            raise ValueError("No models to aggregate")
+
+        return reduce(self.aggregate, it, base)
+
     @abstractmethod
     def predict(self, x) -> np.ndarray:
         """Predict the probabilities for the given instances of features.
@@ -6,16 +6,8 @@ from ferdelance.core.model_operations.core import ModelOperation
 
 class Aggregation(ModelOperation):
     def exec(self, env: Environment) -> Environment:
-        resource_ids = env.list_resource_ids()
-
-        base = env[resource_ids[0]]["model"]
-
-        for resource_id in resource_ids[1:]:
-            model = env[resource_id]["model"]
-
-            base = self.model.aggregate(base, model)
-
-        env["model"] = base
+        # resources are loaded one at time while the model aggregates them
+        env["model"] = self.model.aggregate_many(res["model"] for res in env.iter_resources())
 
         return env
 
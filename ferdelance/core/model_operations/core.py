@@ -1,7 +1,9 @@
 from __future__ import annotations
+from typing import Mapping
 
 from pydantic import SerializeAsAny
 
+from ferdelance.core.environment import Environment
 from ferdelance.core.metrics import Metrics
 from ferdelance.core.model import TModel as Model
 from ferdelance.core.operations import QueryOperation
@@ -20,6 +22,23 @@ class ModelOperation(QueryOperation):
 
     model: Model
 
+    def load_previous_model(self, env: Environment) -> None:
+        """Sets the model received from the previous step, as the aggregated model
+        of the previous iteration, as starting point of the training. This is done
+        only for models that support a warm start.
+
+        Args:
+            env (Environment):
+                The environment with the resources received.
+        """
+        if not self.model.warm_start:
+            return
+
+        for res in env.iter_resources():
+            if isinstance(res, Mapping) and "model" in res:
+                self.model.set_model(res["model"])
+                return
+
     def store_metrics(self, metrics: Metrics, path: Path) -> None:
         with open(path, "w") as f:
             content = json.dumps(metrics, indent=True)
@@ -1,48 +1,141 @@
+from __future__ import annotations
+from typing import Any
+
+from ferdelance.core import containers
+from ferdelance.core.budget import cap_n_jobs, get_cpu_budget
 from ferdelance.core.environment import Environment
 from ferdelance.core.metrics import Metrics
+from ferdelance.core.model import Model
 from ferdelance.core.model_operations.core import ModelOperation
 from ferdelance.logging import get_logger
 
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 from sklearn.model_selection import StratifiedKFold, KFold
+from threadpoolctl import threadpool_limits
+
+import multiprocessing
+import numpy as np
+import os
 
 
 LOGGER = get_logger(__name__)
 
 
+# training data and model of a process of the pool, set once by the initializer
+_worker: dict[str, Any] = dict()
+
+
+def _init_worker(path: Path, model: Model, threads: int) -> None:
+    data = containers.load(path)
+
+    # numpy arrays are memory-mapped: all the processes share the same pages
+    _worker["X"] = data["X"]
+    _worker["Y"] = data["Y"]
+    _worker["model"] = model
+
+    _worker["limits"] = threadpool_limits(limits=threads)
+
+
+def _worker_fold(tr: np.ndarray, ts: np.ndarray) -> Metrics:
+    return train_eval(_worker["model"], _worker["X"], _worker["Y"], tr, ts)
+
+
+def train_eval(model: Model, X: np.ndarray, Y: np.ndarray, tr: np.ndarray, ts: np.ndarray) -> Metrics:
+    """Trains the model on the train indexes and evaluates it on the test ones.
+    Only the rows of the fold are copied out of the training matrix."""
+    model.train(X[tr], Y[tr])
+    return model.eval(X[ts], Y[ts])
+
+
 class LocalCrossValidation(ModelOperation):
-    """Execution plan that duplicates the input data and apply two different plans to them."""
+    """Execution plan that evaluates the model with a k-fold cross validation on
+    the local training data.
+
+    With `parallel`, the folds are trained in a pool of processes. The training
+    data are written once in the working directory and memory-mapped by each
+    process, so they are not copied for each fold. The pool uses at most `n_jobs`
+    CPUs, or all the ones available to the job: these are split between the processes, and
+    the threads used by each fit (the `n_jobs` of the model and the BLAS threads)
+    are limited to the share of each process.
+    """
 
     folds: int = 10
     stratified: bool = True
     shuffle: bool = True
     source: str = "test"
 
+    parallel: bool = False
+    n_jobs: int | None = None
+
+    def cpu_budget(self) -> int:
+        if self.n_jobs is not None and self.n_jobs > 0:
+            return cap_n_jobs(self.n_jobs) or 1
+
+        return get_cpu_budget() or os.cpu_count() or 1
+
+    def run_parallel(self, env: Environment, X: np.ndarray, Y: np.ndarray, splits: list) -> list[Metrics]:
+        budget = self.cpu_budget()
+
+        processes = max(1, min(self.folds, budget))
+        threads = max(1, budget // processes)
+
+        model = self.model
+        if "n_jobs" in type(model).model_fields:
+            model = model.model_copy(update={"n_jobs": threads})
+
+        path = env.working_dir / "cross_validation.pkl"
+        containers.dump({"X": X, "Y": Y}, path)
+
+        LOGGER.info(
+            f"artifact={env.artifact_id}: cross validation on {processes} process(es), {threads} thread(s) each"
+        )
+
+        try:
+            # jobs run in multithreaded processes, where forking can deadlock
+            context = multiprocessing.get_context("forkserver")
+
+            with ProcessPoolExecutor(
+                processes,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(path, model, threads),
+            ) as pool:
+                futures = [pool.submit(_worker_fold, tr, ts) for tr, ts in splits]
+
+                return [f.result() for f in futures]
+
+        finally:
+            os.remove(path)
+
     def exec(self, env: Environment) -> Environment:
         if self.stratified:
             kf = StratifiedKFold(self.folds, shuffle=True, random_state=self.random_state)
         else:
             kf = KFold(self.folds, shuffle=self.shuffle, random_state=self.random_state)
 
-        X = env.X_tr
-        Y = env.Y_tr
-
-        if X is None:
+        if env.X_tr is None:
             raise ValueError("X_tr is required")
 
-        if Y is None:
+        if env.Y_tr is None:
             raise ValueError("y_tr is required")
 
-        metrics_list: list[Metrics] = list()
+        X = env.X_tr.to_numpy()
+        Y = env.Y_tr.to_numpy()
+
+        if Y.ndim == 2 and Y.shape[1] == 1:
+            Y = Y.ravel()
 
-        for fold, (tr, ts) in kf.split(X, Y):
-            x_tr = X.iloc[tr].copy()
-            y_tr = Y.iloc[tr].copy()
-            x_ts = X.iloc[ts].copy()
-            y_ts = Y.iloc[ts].copy()
+        splits = list(kf.split(X, Y))
 
-            model = self.model.train(x_tr, y_tr)
+        if self.parallel:
+            results = self.run_parallel(env, X, Y, splits)
+        else:
+            results = [train_eval(self.model, X, Y, tr, ts) for tr, ts in splits]
+
+        metrics_list: list[Metrics] = list()
 
-            metrics = model.eval(x_ts, y_ts)
+        for fold, metrics in enumerate(results):
             metrics.source = f"{self.source}_{fold}"
             metrics.artifact_id = env.artifact_id
 
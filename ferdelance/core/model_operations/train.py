@@ -21,6 +21,8 @@ class Train(ModelOperation):
         if env.X_tr is None or env.Y_tr is None:
             raise ValueError("Cannot train a model without X_tr and y_tr")
 
+        self.load_previous_model(env)
+
         # model training
         env["model"] = self.model.train(env.X_tr.values, env.Y_tr)
 
@@ -44,6 +46,8 @@ class TrainTest(ModelOperation):
         if env.X_tr is None or env.Y_tr is None:
             raise ValueError("Cannot train without train data")
 
+        self.load_previous_model(env)
+
         # model training
         env["model"] = self.model.train(env.X_tr, env.Y_tr)
 
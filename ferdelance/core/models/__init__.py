@@ -2,6 +2,9 @@ __all__ = [
     "AggregationModel",
     "FederatedRandomForestClassifier",
     "StrategyRandomForestClassifier",
+    "FederatedSGDModel",
+    "FederatedLogisticRegression",
+    "FederatedLinearRegression",
 ]
 
 from .meta import AggregationModel
@@ -9,3 +12,8 @@ from .federated_random_forest_classifier import (
     FederatedRandomForestClassifier,
     StrategyRandomForestClassifier,
 )
+from .federated_linear_models import (
+    FederatedSGDModel,
+    FederatedLogisticRegression,
+    FederatedLinearRegression,
+)
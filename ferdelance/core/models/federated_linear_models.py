@@ -0,0 +1,164 @@
+from __future__ import annotations
+from abc import abstractmethod
+from typing import Any, Iterable
+
+from ferdelance.core.metrics import Metrics
+from ferdelance.core.models.meta import AggregationModel
+from ferdelance.core.models.utils import get_model_parameters
+
+from sklearn.linear_model import SGDClassifier, SGDRegressor
+from sklearn.metrics import mean_squared_error
+
+from numpy.typing import ArrayLike
+
+import numpy as np
+
+
+class FederatedSGDModel(AggregationModel):
+    """
+    Base class for linear models trained with stochastic gradient descent and
+    aggregated with a weighted average of their parameters (FedAvg).
+
+    The size of the aggregated model does not depend on the number of workers,
+    and each new iteration starts from the parameters of the previous one: use
+    the steps of these models inside an `Iterate` to train for multiple rounds.
+
+    All the workers must see the same set of classes.
+
+    These parameters are default values from scikit-learn.
+    """
+
+    # the aggregated model of the previous iteration is used as starting point
+    warm_start: bool = True
+
+    penalty: str | None = "l2"
+    alpha: float = 0.0001
+    l1_ratio: float = 0.15
+    fit_intercept: bool = True
+    max_iter: int = 1000
+    tol: float | None = 0.001
+    shuffle: bool = True
+    learning_rate: str = "optimal"
+    eta0: float = 0.0
+    power_t: float = 0.5
+    early_stopping: bool = False
+    validation_fraction: float = 0.1
+    n_iter_no_change: int = 5
+    average: bool | int = False
+    random_state: int | None = None
+
+    @abstractmethod
+    def estimator(self) -> SGDClassifier | SGDRegressor:
+        raise NotImplementedError()
+
+    def train(self, x, y) -> SGDClassifier | SGDRegressor:
+        model = self.estimator()
+
+        y = np.asarray(y).ravel()
+
+        previous = getattr(self, "_model", None)
+
+        if previous is not None and hasattr(previous, "coef_"):
+            model.fit(x, y, coef_init=previous.coef_, intercept_init=previous.intercept_)
+        else:
+            model.fit(x, y)
+
+        # weight of this model in the aggregation
+        model.n_samples_ = len(y)
+
+        self._model = model
+        return self._model
+
+    def aggregate(self, model_a, model_b) -> SGDClassifier | SGDRegressor:
+        return self.aggregate_many([model_a, model_b])
+
+    def aggregate_many(self, models: Iterable[Any]) -> SGDClassifier | SGDRegressor:
+        """Averages the parameters of the models, weighted by the number of samples
+        used to train each one of them. Only the parameters are kept while the
+        models are consumed, then the average is computed at once.
+
+        The aggregated model has as weight the total number of samples, so
+        partial aggregates can be aggregated again.
+        """
+        base: SGDClassifier | SGDRegressor | None = None
+
+        coefs: list[np.ndarray] = []
+        intercepts: list[np.ndarray] = []
+        weights: list[int] = []
+
+        for model in models:
+            if base is None:
+                base = model
+            elif np.shape(model.coef_) != np.shape(base.coef_):
+                raise ValueError("Cannot aggregate models with parameters of different shapes")
+
+            coefs.append(model.coef_)
+            intercepts.append(np.atleast_1d(model.intercept_))
+            weights.append(getattr(model, "n_samples_", 1))
+
+        if base is None:
+            raise ValueError("No models to aggregate")
+
+        w = np.asarray(weights, dtype=np.float64)
+
+        base.coef_ = np.average(np.stack(coefs), axis=0, weights=w)
+        base.intercept_ = np.average(np.stack(intercepts), axis=0, weights=w)
+        base.n_samples_ = int(w.sum())
+
+        return base
+
+
+class FederatedLogisticRegression(FederatedSGDModel):
+    """
+    Logistic regression trained with SGD.
+
+    For more details, please refer to https://scikit-learn.org/stable/modules/generated/sklearn.linear_model.SGDClassifier.html
+    """
+
+    class_weight: dict[Any, float] | str | None = None
+
+    def estimator(self) -> SGDClassifier:
+        params = get_model_parameters(SGDClassifier, self.model_dump(exclude={"warm_start"}))
+        params["loss"] = "log_loss"
+        return SGDClassifier(**params)
+
+    def predict(self, x) -> np.ndarray:
+        if self._model is None:
+            raise ValueError("No model has been loaded or created")
+        return self._model.predict_proba(x)
+
+    def classify(self, x) -> np.ndarray | ArrayLike:
+        if self._model is None:
+            raise ValueError("No model has been loaded or created")
+        return self._model.predict(x)
+
+
+class FederatedLinearRegression(FederatedSGDModel):
+    """
+    Linear regression trained with SGD.
+
+    For more details, please refer to https://scikit-learn.org/stable/modules/generated/sklearn.linear_model.SGDRegressor.html
+    """
+
+    learning_rate: str = "invscaling"
+    eta0: float = 0.01
+    power_t: float = 0.25
+    epsilon: float = 0.1
+
+    def estimator(self) -> SGDRegressor:
+        params = get_model_parameters(SGDRegressor, self.model_dump(exclude={"warm_start"}))
+        params["loss"] = "squared_error"
+        return SGDRegressor(**params)
+
+    def predict(self, x) -> np.ndarray:
+        if self._model is None:
+            raise ValueError("No model has been loaded or created")
+        return self._model.predict(x)
+
+    def classify(self, x) -> np.ndarray | ArrayLike:
+        return self.predict(x)
+
+    def eval(self, x, y) -> Metrics:
+        return Metrics(
+            loss=float(mean_squared_error(np.asarray(y).ravel(), self.predict(x))),
+        )
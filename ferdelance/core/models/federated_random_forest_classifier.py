@@ -1,6 +1,8 @@
 from __future__ import annotations
+from typing import Any, Iterable
 from enum import Enum
 
+from ferdelance.core.budget import cap_n_jobs
 from ferdelance.core.models.meta import AggregationModel
 from ferdelance.core.models.utils import get_model_parameters
 
@@ -49,7 +51,8 @@ class FederatedRandomForestClassifier(AggregationModel):
     max_samples: int | None = None
 
     def train(self, x, y) -> RandomForestClassifier:
-        params = get_model_parameters(RandomForestClassifier, self.model_dump())
+        params = get_model_parameters(RandomForestClassifier, self.model_dump(exclude={"warm_start"}))
+        params["n_jobs"] = cap_n_jobs(self.n_jobs)
         self._model: RandomForestClassifier = RandomForestClassifier(**params)
         self._model.fit(x, y)
         return self._model
@@ -73,6 +76,32 @@ class FederatedRandomForestClassifier(AggregationModel):
 
         return model
 
+    def aggregate_many(self, models: Iterable[Any]) -> RandomForestClassifier | VotingClassifier:
+        if self.strategy == StrategyRandomForestClassifier.MERGE:
+            it = iter(models)
+
+            try:
+                model: RandomForestClassifier = next(it)
+            except StopIteration:
+                raise ValueError("No models to aggregate")
+
+            if not isinstance(model, RandomForestClassifier):
+                raise ValueError(
+                    "StrategyRandomForestClassifier.MERGE can be used only with RandomForestClassifier models"
+                )
+
+            for other in it:
+                model.estimators_ += other.estimators_
+
+            model.n_estimators = len(model.estimators_)  # type: ignore
+
+            return model
+
+        if self.strategy == StrategyRandomForestClassifier.MAJORITY_VOTE:
+            return self.voting(models)
+
+        raise ValueError(f"Unsupported strategy: {self.strategy}")
+
     def merge(self, model_a: RandomForestClassifier, model_b: RandomForestClassifier) -> RandomForestClassifier:
         """Solution adapted from: https://stackoverflow.com/a/28508619/1419058"""
 
@@ -84,25 +113,30 @@ class FederatedRandomForestClassifier(AggregationModel):
     def majority_vote(
         self, model_a: RandomForestClassifier | VotingClassifier, model_b: RandomForestClassifier
     ) -> VotingClassifier:
-        """Solution adapted from: https://stackoverflow.com/a/54610569/1419058"""
-
-        if isinstance(model_a, VotingClassifier):
-            assert model_a.estimators_ is not None
+        return self.voting([model_a, model_b])
 
-            models = []
+    def voting(self, models: Iterable[RandomForestClassifier | VotingClassifier]) -> VotingClassifier:
+        """Builds a single VotingClassifier with all the given models. The members
+        of VotingClassifiers, as the ones built by a previous aggregation, are
+        added as single models.
 
-            for i in range(len(model_a.estimators_)):
-                models.append((f"{i}", model_a.estimators_[i]))
+        Solution adapted from: https://stackoverflow.com/a/54610569/1419058
+        """
+        estimators: list[RandomForestClassifier] = []
 
-            models.append((f"{len(model_a.estimators_)}", model_b))
+        for model in models:
+            if isinstance(model, VotingClassifier):
+                estimators += model.estimators_
+            else:
+                estimators.append(model)
 
-        else:
-            models = [("0", model_a), ("1", model_b)]
+        if not estimators:
+            raise ValueError("No models to aggregate")
 
-        vc = VotingClassifier(estimators=models, voting="soft")
+        vc = VotingClassifier(estimators=[(f"{i}", e) for i, e in enumerate(estimators)], voting="soft")
 
-        vc.estimators_ = models
-        vc.le_ = LabelEncoder().fit(model_a.classes_)  # TODO: check if this is valid?
+        vc.estimators_ = estimators
+        vc.le_ = LabelEncoder().fit(estimators[0].classes_)  # TODO: check if this is valid?
         vc.classes_ = vc.le_.classes_
 
         return vc
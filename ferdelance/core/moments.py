@@ -0,0 +1,74 @@
+"""Moments of numeric features: count, sum, sum of squares, min, and max.
+
+Moments are computed one batch of records at time and moments computed on disjoint
+sets of records can be merged, so they are shared by the estimators and by the
+datasources that describe their own data.
+"""
+
+import numpy as np
+
+# rows of the moments array, each one with a column for each feature
+COUNT = 0
+SUM = 1
+SUM_SQUARES = 2
+MIN = 3
+MAX = 4
+
+
+def empty_moments(n_features: int) -> np.ndarray:
+    moments = np.zeros((5, n_features), dtype=np.float64)
+    moments[MIN] = np.inf
+    moments[MAX] = -np.inf
+    return moments
+
+
+def merge_moments(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Merges two moments arrays computed on disjoint sets of records."""
+    out = a[:MIN] + b[:MIN]
+    return np.vstack((out, np.fmin(a[MIN], b[MIN]), np.fmax(a[MAX], b[MAX])))
+
+
+def batch_moments(x: np.ndarray) -> np.ndarray:
+    """Computes the moments array of a batch of records, with a column for each
+    feature. Missing values are ignored."""
+    return np.vstack(
+        (
+            (~np.isnan(x)).sum(axis=0),
+            np.nansum(x, axis=0),
+            np.nansum(x * x, axis=0),
+            np.fmin.reduce(x, axis=0, initial=np.inf),
+            np.fmax.reduce(x, axis=0, initial=-np.inf),
+        )
+    )
+
+
+def derive_moments(moments: np.ndarray) -> dict[str, np.ndarray]:
+    """Computes the statistics of each feature from a moments array. Features
+    without values have NaN statistics.
+
+    Args:
+        moments (np.ndarray):
+            Array with count, sum, sum of squares, min, and max as rows.
+
+    Returns:
+        dict[str, np.ndarray]:
+            Count, mean, sample variance, standard deviation, min, and max of
+            each feature.
+    """
+    count = moments[COUNT]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(count > 0, moments[SUM] / count, np.nan)
+        variance = np.where(count > 1, (moments[SUM_SQUARES] - count * mean**2) / (count - 1), np.nan)
+
+    # rounding errors can make variance of constant features slightly negative
+    variance = np.where(variance < 0, 0.0, variance)
+
+    return {
+        "count": count,
+        "mean": mean,
+        "variance": variance,
+        "std": np.sqrt(variance),
+        "min": np.where(count > 0, moments[MIN], np.nan),
+        "max": np.where(count > 0, moments[MAX], np.nan),
+    }
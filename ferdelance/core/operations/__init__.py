@@ -6,8 +6,17 @@ __all__ = [
     "SumMatrix",
     "UniformMatrix",
     "Define",
+    "RingReduce",
+    "MaskProducts",
+    "SendMasked",
+    "SumMasks",
+    "Unmask",
+    "Fused",
 ]
 
 from .core import TOperation as Operation, QueryOperation, DoNothing
 from .matrices import SubtractMatrix, SumMatrix, UniformMatrix
 from .models import Define
+from .rings import RingReduce
+from .masks import MaskProducts, SendMasked, SumMasks, Unmask
+from .fused import Fused
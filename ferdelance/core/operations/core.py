@@ -1,9 +1,12 @@
+from typing import Any, Iterator
 from abc import abstractmethod
 
 from ferdelance.core.entity import Entity
 from ferdelance.core.environment import Environment
 from ferdelance.core.queries import Query
+from ferdelance.core.transformers import FederatedFilter
 
+from pandas import DataFrame
 from pydantic import SerializeAsAny
 
 
@@ -19,6 +22,62 @@ class Operation(Entity):
 class QueryOperation(Operation):
     query: Query | None = None
 
+    def batches(self, env: Environment) -> Iterator[DataFrame]:
+        """Iterates over the input data of the environment one batch at time,
+        with the query applied to each batch. Operations that only accumulate
+        values can use this method to work with constant memory on datasources
+        read in chunks.
+
+        Args:
+            env (Environment):
+                The environment with the input data.
+
+        Raises:
+            ValueError:
+                If the environment has no input data.
+
+        Returns:
+            Iterator[DataFrame]:
+                The transformed batches of input data.
+        """
+        if not env.has_data():
+            raise ValueError("Input data not set")
+
+        for df in env.batches():
+            if self.query is not None:
+                df = self.query.apply_batch(env, df)
+
+            yield df
+
+    def pushdown(self, env: Environment) -> tuple[list[Any], list[FederatedFilter]] | None:
+        """Checks if this operation can be computed where the data are stored
+        (i.e. as SQL aggregates inside a database) instead of loading the data.
+
+        This is possible only when all the datasources of the environment support
+        the pushdown of aggregates and the query is composed only by filters.
+
+        Args:
+            env (Environment):
+                The environment with the input data.
+
+        Returns:
+            tuple[list[Any], list[FederatedFilter]] | None:
+                The datasources and the filters to apply on them, or None if the
+                operation has to iterate over the data.
+        """
+        if not env.datasources or not all(ds.supports_pushdown() for ds in env.datasources):
+            return None
+
+        if self.query is None:
+            return env.datasources, list()
+
+        filters = self.query.filters()
+
+        if filters is None:
+            return None
+
+        return env.datasources, filters
+
 
 class DoNothing(Operation):
     def exec(self, env: Environment) -> Environment:
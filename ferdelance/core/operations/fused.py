@@ -0,0 +1,188 @@
+from __future__ import annotations
+from typing import Any, Callable, Iterator, Mapping
+from dataclasses import dataclass
+
+from ferdelance.core import containers
+from ferdelance.core.environment import EnvResource, Environment
+from ferdelance.core.operations.core import QueryOperation, TOperation
+from ferdelance.logging import get_logger
+
+from pandas import DataFrame
+from pathlib import Path
+from pydantic import model_validator
+
+import shutil
+
+LOGGER = get_logger(__name__)
+
+
+@dataclass
+class NamespacedResource(EnvResource):
+    """The part of a resource that belongs to a single namespace."""
+
+    parent: EnvResource | None = None
+    namespace: str = ""
+
+    def get(self) -> Any:
+        if self.data is None and self.parent is not None:
+            loaded = self.parent.data is not None
+
+            content = self.parent.get()
+
+            if isinstance(content, Mapping) and self.namespace in content:
+                self.data = content[self.namespace]
+            else:
+                self.data = dict()
+
+            # the other namespaces are not kept in memory
+            if not loaded:
+                self.parent.data = None
+
+        return self.data
+
+
+@dataclass
+class NamespacedEnvironment(Environment):
+    """Environment of a single operation of a `Fused` operation. Local variables
+    are stored next to the ones of the parent environment, with the namespace as
+    prefix of their keys."""
+
+    namespace: str = ""
+
+    def _local_path(self, key: str, suffix: str = containers.SUFFIX) -> Path:
+        return super()._local_path(f".{self.namespace}{key}", suffix)
+
+
+class SharedData:
+    """Input data of an environment, read and transformed by a query only once
+    and then shared by multiple operations.
+
+    Data loaded in memory are transformed once and kept. Data read in batches
+    are transformed during the first pass: when more than one operation needs
+    them, each transformed batch is also written to a spill directory, so that
+    the following passes read the batches from there, one at time.
+
+    Spilling trades I/O for the query: with m operations, the transformed data
+    are written once and read m - 1 times, instead of reading the datasource
+    and applying the query m times. It pays off when the query is expensive or
+    the datasource is slow (a remote database); for a cheap query on a local
+    file, it can double the I/O of the chunked path. Operations cannot consume
+    the same batch together because each one drives its own pass over the data.
+    """
+
+    def __init__(self, env: Environment, operation: QueryOperation, consumers: int, spill_dir: Path) -> None:
+        self.env: Environment = env
+        self.operation: QueryOperation = operation
+        self.consumers: int = consumers
+        self.spill_dir: Path = spill_dir
+
+        self.df: DataFrame | None = None
+        self.n_batches: int | None = None
+
+    def load(self) -> DataFrame:
+        if self.df is None:
+            self.df = next(self.operation.batches(self.env))
+
+        return self.df
+
+    def batches(self) -> Iterator[DataFrame]:
+        if self.n_batches is not None:
+            for i in range(self.n_batches):
+                yield containers.load(self.spill_dir / f"{i}{containers.SUFFIX}")["df"]
+            return
+
+        spill = self.consumers > 1
+
+        if spill:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+
+        n = 0
+        for df in self.operation.batches(self.env):
+            if spill:
+                containers.dump({"df": df}, self.spill_dir / f"{n}{containers.SUFFIX}")
+            n += 1
+
+            yield df
+
+        # replays are possible only after a complete pass
+        if spill:
+            self.n_batches = n
+
+    def loaders(self) -> tuple[Callable[[], DataFrame] | None, Callable[[], Iterator[DataFrame]] | None]:
+        """Returns the loaders to use as `df_loader` and `batch_loader` of an
+        environment, based on how the data are available in the source environment."""
+        if not self.env.has_data():
+            return None, None
+
+        if self.env.is_chunked():
+            return None, self.batches
+
+        return self.load, None
+
+    def clear(self) -> None:
+        self.df = None
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+
+class Fused(QueryOperation):
+    """Executes multiple operations on the same input data. The data are loaded,
+    and the query applied, only once for all the operations.
+
+    Each operation works in its own namespace, named as its key: the products of
+    an operation are stored under its key, it receives only its own part of the
+    resources, and its local variables are kept separated from the others.
+    Operations working on the data see the query already applied.
+    """
+
+    operations: dict[str, TOperation]
+
+    @model_validator(mode="after")
+    def check_names(self) -> Fused:
+        for name in self.operations:
+            if not name or name.startswith("."):
+                raise ValueError(f"invalid name for a fused operation: '{name}'")
+        return self
+
+    def namespace(self, env: Environment, name: str, data: SharedData) -> NamespacedEnvironment:
+        df_loader, batch_loader = data.loaders()
+
+        products = env.products.get(name, dict())
+
+        sub_env = NamespacedEnvironment(
+            artifact_id=env.artifact_id,
+            project_token=env.project_token,
+            product_id=env.product_id,
+            working_dir=env.working_dir,
+            label=env.label,
+            df_loader=df_loader,
+            batch_loader=batch_loader,
+            # aggregates cannot be pushed down when they do not include the query
+            datasources=env.datasources if self.query is None else list(),
+            resources={
+                res_id: NamespacedResource(id=res_id, parent=res, namespace=name)
+                for res_id, res in env.resources.items()
+            },
+            products=dict(products) if isinstance(products, Mapping) else dict(),
+            namespace=name,
+        )
+
+        return sub_env
+
+    def exec(self, env: Environment) -> Environment:
+        consumers = sum(isinstance(op, QueryOperation) for op in self.operations.values())
+
+        data = SharedData(env, self, consumers, env.working_dir / "fused")
+
+        try:
+            for name, operation in self.operations.items():
+                LOGGER.debug(f"artifact={env.artifact_id}: executing fused operation={name}")
+
+                sub_env = operation.exec(self.namespace(env, name, data))
+                sub_env.store_locals()
+
+                env[name] = sub_env.products
+
+        finally:
+            data.clear()
+
+        return env
@@ -0,0 +1,143 @@
+from __future__ import annotations
+from typing import Any, Mapping
+
+from ferdelance.core.environment import Environment
+from ferdelance.core.operations.core import Operation
+
+from pydantic import SerializeAsAny
+
+import numpy as np
+import pandas as pd
+
+MASK_LOW = -(2**31)
+MASK_HIGH = 2**31
+
+
+def random_like(value: Any, rng: np.random.Generator) -> Any:
+    """Creates a random mask with the same structure of the given value.
+
+    Args:
+        value (Any):
+            A number, a numpy array, a pandas object, or a dictionary of them.
+        rng (np.random.Generator):
+            Generator used to draw the masks.
+
+    Raises:
+        ValueError:
+            If the value cannot be masked.
+
+    Returns:
+        Any:
+            The mask, with integer values.
+    """
+    if isinstance(value, Mapping):
+        return {k: random_like(v, rng) for k, v in value.items()}
+
+    if isinstance(value, pd.Series):
+        return pd.Series(rng.integers(MASK_LOW, MASK_HIGH, size=value.shape), index=value.index)
+
+    if isinstance(value, pd.DataFrame):
+        return pd.DataFrame(
+            rng.integers(MASK_LOW, MASK_HIGH, size=value.shape),
+            index=value.index,
+            columns=value.columns,
+        )
+
+    if isinstance(value, np.ndarray):
+        return rng.integers(MASK_LOW, MASK_HIGH, size=value.shape)
+
+    if isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+        return int(rng.integers(MASK_LOW, MASK_HIGH))
+
+    raise ValueError(f"Cannot mask value of type {type(value)}")
+
+
+def add(a: Any, b: Any) -> Any:
+    """Sums two values with the same structure. Keys, or indexes, missing in
+    one of the values are considered as zeros."""
+    if isinstance(a, Mapping) and isinstance(b, Mapping):
+        return {k: add(a[k], b[k]) if k in a and k in b else (a[k] if k in a else b[k]) for k in {**a, **b}}
+
+    if isinstance(a, (pd.Series, pd.DataFrame)):
+        return a.add(b, fill_value=0)
+
+    return a + b
+
+
+def negate(a: Any) -> Any:
+    if isinstance(a, Mapping):
+        return {k: negate(v) for k, v in a.items()}
+
+    return -a
+
+
+class MaskProducts(Operation):
+    """Executes the operation and masks all its products with random values.
+
+    The masked products are kept in the local variables, while the masks become
+    the only product of this operation.
+    """
+
+    operation: SerializeAsAny[Operation]
+
+    def exec(self, env: Environment) -> Environment:
+        env = self.operation.exec(env)
+
+        rng = np.random.default_rng(self.random_state)
+
+        masks = random_like(env.products, rng)
+
+        env[".masked"] = add(env.products, masks)
+        env.products = {"mask": masks}
+
+        return env
+
+
+class SendMasked(Operation):
+    """Sends the products masked by a previous `MaskProducts` on the same worker."""
+
+    def exec(self, env: Environment) -> Environment:
+        env.products = {"masked": env[".masked"]}
+
+        return env
+
+
+class SumMasks(Operation):
+    """Sums the masks produced by all the workers. The negated sum is sent in the
+    same form of a masked product, so that it cancels out the masks."""
+
+    def exec(self, env: Environment) -> Environment:
+        total: Any = dict()
+
+        for resource_id in env.list_resource_ids():
+            res = env[resource_id]
+
+            if isinstance(res, Mapping) and "mask" in res:
+                total = add(total, res["mask"])
+
+        env.products = {"masked": negate(total)}
+
+        return env
+
+
+class Unmask(Operation):
+    """Sums all the masked products received, obtaining the sum of the original
+    products, then executes the optional operation on them."""
+
+    operation: SerializeAsAny[Operation | None] = None
+
+    def exec(self, env: Environment) -> Environment:
+        total: Any = dict()
+
+        for resource_id in env.list_resource_ids():
+            res = env[resource_id]
+
+            if isinstance(res, Mapping) and "masked" in res:
+                total = add(total, res["masked"])
+
+        env.products = dict(total)
+
+        if self.operation is not None:
+            env = self.operation.exec(env)
+
+        return env
@@ -0,0 +1,91 @@
+from __future__ import annotations
+from typing import Any, Mapping
+
+from ferdelance.core.environment import Environment
+from ferdelance.core.operations.core import Operation
+
+from pydantic import SerializeAsAny
+
+import numpy as np
+
+
+class RingReduce(Operation):
+    """One stage of a ring all-reduce executed by a worker.
+
+    The arrays in `env_names` are flattened and split in one chunk for each
+    worker of the ring. At each stage the worker receives a chunk from the
+    previous worker of the ring and sends one chunk to the next worker: during
+    the first n-1 stages the received chunks are summed to the local ones, during
+    the last n-1 stages the fully reduced chunks are copied. The chunks not in
+    transit are kept in local variables of the worker.
+
+    At the last stage, the reduced arrays are available as products with the
+    same names and shapes of the original ones.
+    """
+
+    # position of the worker in the ring
+    position: int
+    stage: int
+    n_workers: int
+
+    # executed at the first stage to produce the arrays to reduce
+    operation: SerializeAsAny[Operation | None] = None
+
+    def last_stage(self) -> int:
+        return 2 * (self.n_workers - 1)
+
+    def chunk_index(self) -> int:
+        """Index of the chunk received and sent in this stage."""
+        return (self.position - self.stage) % self.n_workers
+
+    def exec(self, env: Environment) -> Environment:
+        k = self.chunk_index()
+
+        if self.stage == 0:
+            if self.operation is not None:
+                env = self.operation.exec(env)
+
+            arrays = [np.asarray(env[name]) for name in self.env_names]
+            flat = np.concatenate([a.ravel() for a in arrays])
+
+            chunks = np.array_split(flat, self.n_workers)
+
+            env[".ring_shapes"] = [a.shape for a in arrays]
+
+        else:
+            chunks = env[".ring_chunks"]
+            received = self.received(env, k)
+
+            if self.stage < self.n_workers:
+                chunks[k] = chunks[k] + received
+            else:
+                chunks[k] = received
+
+        env[".ring_chunks"] = chunks
+
+        if self.stage < self.last_stage():
+            # only the chunk in transit is sent to the next worker
+            env.products = {"chunk": k, "data": chunks[k]}
+
+            return env
+
+        flat = np.concatenate(chunks)
+        start = 0
+
+        env.products = dict()
+
+        for name, shape in zip(self.env_names, env[".ring_shapes"]):
+            size = int(np.prod(shape))
+            env[name] = flat[start : start + size].reshape(shape)
+            start += size
+
+        return env
+
+    def received(self, env: Environment, k: int) -> Any:
+        for resource_id in env.list_resource_ids():
+            res = env[resource_id]
+
+            if isinstance(res, Mapping) and "chunk" in res and res["chunk"] == k:
+                return res["data"]
+
+        raise ValueError(f"artifact={env.artifact_id}: chunk={k} not received at stage={self.stage}")
@@ -8,6 +8,7 @@ from ferdelance.core.transformers.core import QueryTransformer
 from ferdelance.core.transformers import FederatedFilter
 
 from datetime import datetime
+from pandas import DataFrame
 
 
 def is_numeric(other) -> bool:
@@ -36,6 +37,71 @@ class Query(Entity):
 
         return env
 
+    def apply_batch(self, env: Environment, df: DataFrame) -> DataFrame:
+        """Applies the stages of this query to a single batch of input data. The
+        batch is transformed as if it was the train data of the environment.
+
+        When the environment reads its data in batches, only the stages with a
+        transformer that works row by row (such as filters) can be applied.
+
+        Args:
+            env (Environment):
+                The environment the batch belongs to.
+            df (DataFrame):
+                The batch of data to transform.
+
+        Raises:
+            ValueError:
+                If a stage cannot be applied to a batch of data.
+
+        Returns:
+            DataFrame:
+                The transformed batch.
+        """
+        X_tr, Y_tr, X_ts, Y_ts = env.X_tr, env.Y_tr, env.X_ts, env.Y_ts
+        env.X_tr, env.Y_tr, env.X_ts, env.Y_ts = df, None, None, None
+
+        try:
+            for stage in self.stages:
+                if stage.transformer is None:
+                    continue
+
+                if env.is_chunked() and not stage.transformer.batch_safe():
+                    raise ValueError(f"Transformer {stage.transformer.entity} cannot be applied to batches of data")
+
+                env, _ = stage.transformer.transform(env)
+
+            if env.X_tr is None:
+                raise ValueError("Query removed the batch of data")
+
+            return env.X_tr
+
+        finally:
+            env.X_tr, env.Y_tr, env.X_ts, env.Y_ts = X_tr, Y_tr, X_ts, Y_ts
+
+    def filters(self) -> list[FederatedFilter] | None:
+        """Returns the filters of this query, if the query is composed only by
+        filters. This is used to translate a query in a different language, such
+        as SQL, and execute it where the data are stored.
+
+        Returns:
+            list[FederatedFilter] | None:
+                The list of filters in this query, or None if there is at least
+                one stage with a transformer that is not a filter.
+        """
+        filters: list[FederatedFilter] = list()
+
+        for stage in self.stages:
+            if stage.transformer is None:
+                continue
+
+            if not isinstance(stage.transformer, FederatedFilter):
+                return None
+
+            filters.append(stage.transformer)
+
+        return filters
+
     def current(self) -> QueryStage:
         """Returns the most recent stage of the query.
 
@@ -0,0 +1,273 @@
+"""Mergeable summaries of the distribution of numeric values.
+
+Both summaries are built in streaming fashion, one batch of values at time, with
+bounded memory. Summaries built on disjoint sets of values can be merged, so each
+node can describe its own data and the scheduler can combine the descriptions
+into a global one without accessing the values.
+"""
+
+from __future__ import annotations
+from typing import Sequence
+
+from pydantic import BaseModel, model_validator
+
+import numpy as np
+
+
+def _values(values: np.ndarray | Sequence[float]) -> np.ndarray:
+    x = np.asarray(values, dtype=np.float64).ravel()
+    return x[~np.isnan(x)]
+
+
+class QuantileSketch(BaseModel):
+    """Approximate quantiles of a stream of values, in the style of KLL.
+
+    Values are kept in a hierarchy of compactors, where each item at level `h`
+    stands for 2**h values. When a level holds more than `k` items, they are
+    sorted and every other item is promoted to the next level. The memory is
+    bounded to about `k * log2(n / k)` items, while the error on the rank of the
+    quantiles decreases with `k`. Up to `k` values, the sketch is exact.
+
+    Missing values are ignored. Min and max are always exact.
+    """
+
+    k: int = 200
+
+    n: int = 0
+    v_min: float | None = None
+    v_max: float | None = None
+
+    levels: list[list[float]] = list()
+
+    @model_validator(mode="after")
+    def check_k(self) -> QuantileSketch:
+        if self.k < 2:
+            raise ValueError(f"sketch capacity must be at least 2, got k={self.k}")
+        return self
+
+    def _compact(self, levels: list[np.ndarray]) -> None:
+        h = 0
+        while h < len(levels):
+            items = levels[h]
+
+            if items.size > self.k:
+                items = np.sort(items)
+
+                # which half is promoted is chosen at random to avoid a systematic
+                # bias, seeded by the state so that the sketch is reproducible
+                offset = int(np.random.default_rng((self.n, h)).integers(2))
+
+                # an odd item stays at this level, the others are halved
+                odd = items.size % 2
+                if offset:
+                    keep, items = items[items.size - odd :], items[: items.size - odd]
+                else:
+                    keep, items = items[:odd], items[odd:]
+
+                promoted = items[offset::2]
+
+                levels[h] = keep
+
+                if h + 1 == len(levels):
+                    levels.append(promoted)
+                else:
+                    levels[h + 1] = np.concatenate((levels[h + 1], promoted))
+
+            h += 1
+
+        self.levels = [level.tolist() for level in levels]
+
+    def _arrays(self) -> list[np.ndarray]:
+        return [np.asarray(level, dtype=np.float64) for level in self.levels]
+
+    def update(self, values: np.ndarray | Sequence[float]) -> QuantileSketch:
+        """Adds a batch of values to the sketch.
+
+        Args:
+            values (np.ndarray | Sequence[float]):
+                New values, NaN values are ignored.
+
+        Returns:
+            QuantileSketch:
+                This same sketch, updated.
+        """
+        x = _values(values)
+
+        if x.size == 0:
+            return self
+
+        v_min, v_max = float(x.min()), float(x.max())
+
+        self.n += int(x.size)
+        self.v_min = v_min if self.v_min is None else min(self.v_min, v_min)
+        self.v_max = v_max if self.v_max is None else max(self.v_max, v_max)
+
+        levels = self._arrays()
+
+        if levels:
+            levels[0] = np.concatenate((levels[0], x))
+        else:
+            levels.append(x)
+
+        self._compact(levels)
+
+        return self
+
+    def merge(self, other: QuantileSketch) -> QuantileSketch:
+        """Adds to this sketch the values summarized by another sketch, built on a
+        disjoint set of values. The capacity of this sketch is kept.
+
+        Args:
+            other (QuantileSketch):
+                The sketch to merge in.
+
+        Returns:
+            QuantileSketch:
+                This same sketch, updated.
+        """
+        if other.n == 0:
+            return self
+
+        self.n += other.n
+        self.v_min = other.v_min if self.v_min is None else min(self.v_min, other.v_min)  # type: ignore
+        self.v_max = other.v_max if self.v_max is None else max(self.v_max, other.v_max)  # type: ignore
+
+        levels = self._arrays()
+
+        for h, items in enumerate(other._arrays()):
+            if h < len(levels):
+                levels[h] = np.concatenate((levels[h], items))
+            else:
+                levels.append(items)
+
+        self._compact(levels)
+
+        return self
+
+    def weighted(self) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the items kept by the sketch, sorted, and the number of values
+        each one stands for."""
+        levels = self._arrays()
+
+        if not levels:
+            return np.empty(0), np.empty(0)
+
+        items = np.concatenate(levels)
+        weights = np.concatenate([np.full(level.size, 2.0**h) for h, level in enumerate(levels)])
+
+        order = np.argsort(items, kind="stable")
+
+        return items[order], weights[order]
+
+    def quantile(self, q: float | Sequence[float]) -> float | np.ndarray:
+        """Estimates the quantiles of the values summarized.
+
+        Args:
+            q (float | Sequence[float]):
+                Quantile, or quantiles, to compute, each one in the [0, 1] range.
+
+        Raises:
+            ValueError:
+                If a quantile is outside the [0, 1] range.
+
+        Returns:
+            float | np.ndarray:
+                The estimated value for each requested quantile. NaN if the sketch
+                is empty.
+        """
+        qs = np.asarray(q, dtype=np.float64)
+
+        if np.any((qs < 0) | (qs > 1)):
+            raise ValueError(f"quantiles must be in the [0, 1] range, got {q}")
+
+        if self.n == 0:
+            out = np.full(qs.shape, np.nan)
+
+        else:
+            items, weights = self.weighted()
+            cum = np.cumsum(weights)
+
+            idx = np.searchsorted(cum, qs * cum[-1], side="left")
+            out = items[np.clip(idx, 0, items.size - 1)]
+
+            out = np.where(qs == 0, self.v_min, out)
+            out = np.where(qs == 1, self.v_max, out)
+
+        if out.ndim == 0:
+            return float(out)
+
+        return out
+
+    def histogram(self, edges: Sequence[float]) -> np.ndarray:
+        """Estimates how many values fall in each bin. Values outside the edges
+        are not counted.
+
+        Args:
+            edges (Sequence[float]):
+                Increasing edges of the bins, as in `np.histogram`.
+
+        Returns:
+            np.ndarray:
+                Estimated count for each bin.
+        """
+        items, weights = self.weighted()
+        counts, _ = np.histogram(items, bins=np.asarray(edges, dtype=np.float64), weights=weights)
+        return counts
+
+
+class Histogram(BaseModel):
+    """Exact counts of a stream of values on a fixed set of bins. Values outside
+    the edges, and missing values, are not counted. Histograms can be merged only
+    if they share the same edges."""
+
+    edges: list[float]
+    counts: list[int] = list()
+
+    @model_validator(mode="after")
+    def check_edges(self) -> Histogram:
+        if len(self.edges) < 2 or np.any(np.diff(self.edges) <= 0):
+            raise ValueError("histogram edges must be at least two and strictly increasing")
+
+        if not self.counts:
+            self.counts = [0] * (len(self.edges) - 1)
+
+        elif len(self.counts) != len(self.edges) - 1:
+            raise ValueError(f"expected {len(self.edges) - 1} counts, got {len(self.counts)}")
+
+        return self
+
+    def update(self, values: np.ndarray | Sequence[float]) -> Histogram:
+        """Counts a batch of values.
+
+        Args:
+            values (np.ndarray | Sequence[float]):
+                New values, NaN values are ignored.
+
+        Returns:
+            Histogram:
+                This same histogram, updated.
+        """
+        counts, _ = np.histogram(_values(values), bins=np.asarray(self.edges, dtype=np.float64))
+        self.counts = (np.asarray(self.counts, dtype=np.int64) + counts).tolist()
+        return self
+
+    def merge(self, other: Histogram) -> Histogram:
+        """Adds the counts of another histogram built on a disjoint set of values.
+
+        Args:
+            other (Histogram):
+                The histogram to merge in.
+
+        Raises:
+            ValueError:
+                If the two histograms have different edges.
+
+        Returns:
+            Histogram:
+                This same histogram, updated.
+        """
+        if self.edges != other.edges:
+            raise ValueError("cannot merge histograms with different edges")
+
+        self.counts = (np.asarray(self.counts, dtype=np.int64) + np.asarray(other.counts, dtype=np.int64)).tolist()
+        return self
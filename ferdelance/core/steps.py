@@ -2,9 +2,10 @@ from __future__ import annotations
 from typing import Sequence
 from itertools import pairwise
 
-from ferdelance.core.distributions import Distribution, DirectToNext
-from ferdelance.core.interfaces import SchedulerJob, SchedulerContext, BaseStep
-from ferdelance.core.operations import Operation
+from ferdelance.core.distributions import Distribution, DirectToNext, Tree
+from ferdelance.core.interfaces import SchedulerJob, SchedulerContext, BaseStep, Step
+from ferdelance.core.operations import Operation, RingReduce, MaskProducts, SendMasked, SumMasks, Unmask
+from ferdelance.schemas.components import Component
 
 from pydantic import SerializeAsAny
 
@@ -141,50 +142,308 @@ class Sequential(BaseStep):
         return job_list
 
 
-class RoundRobin(BaseStep):
-    """Circular distribution of jobs between workers."""
+class SecureParallel(BaseStep):
+    """Jobs are executed in parallel, and only their sum is revealed to the initiator.
+
+    Each worker masks the products of the operation with random values: the
+    masked products are sent to the initiator, while the masks are sent to the
+    first worker, which sums them. The initiator removes the sum of the masks
+    from the sum of the masked products, then executes the final operation.
+
+    The number of rounds does not depend on the number of workers. The values of
+    a single worker remain hidden as long as the initiator and the first worker
+    do not collude.
+    """
+
+    final_operation: SerializeAsAny[Operation | None] = None
 
     def __init__(
         self,
-        operation: Operation,
+        operation: SerializeAsAny[Operation],
+        final_operation: SerializeAsAny[Operation | None] = None,
+        distribution: SerializeAsAny[Distribution | None] = None,
         iteration: int = 1,
         **data,
     ) -> None:
-        super(RoundRobin, self).__init__(
+        super(SecureParallel, self).__init__(
             operation=operation,
+            final_operation=final_operation,  # type: ignore
+            distribution=distribution,
             iteration=iteration,
-            distribution=None,
             **data,
         )
 
+    def bind(self, jobs0: Sequence[SchedulerJob], jobs1: Sequence[SchedulerJob]) -> None:
+        # only the final job is bound to the next step
+        super(SecureParallel, self).bind(jobs0[-1:], jobs1)
+
+    def jobs(self, context: SchedulerContext) -> list[SchedulerJob]:
+        def job(worker: Component, operation: Operation) -> SchedulerJob:
+            return SchedulerJob(
+                id=context.get_id(),
+                worker=worker,
+                iteration=context.iteration,
+                step=BaseStep(
+                    iteration=self.iteration,
+                    operation=operation,
+                ),
+            )
+
+        mask_jobs = [job(worker, MaskProducts(operation=self.operation)) for worker in context.workers]
+        send_jobs = [job(worker, SendMasked()) for worker in context.workers]
+        sum_job = job(context.workers[0], SumMasks())
+        final_job = job(context.initiator, Unmask(operation=self.final_operation))
+
+        for mask_job, send_job in zip(mask_jobs, send_jobs):
+            mask_job.locks += [send_job.id, sum_job.id]
+            send_job.locks.append(final_job.id)
+
+        sum_job.locks.append(final_job.id)
+
+        return mask_jobs + send_jobs + [sum_job, final_job]
+
+
+class Ring(BaseStep):
+    """Ring all-reduce of arrays between workers.
+
+    Each worker executes the operation to produce the arrays in `env_names`,
+    then the arrays are summed between all the workers: the arrays are split in
+    one chunk for each worker, and the chunks are passed along the ring in
+    parallel, so that each worker sends and receives 2(n-1) chunks, each one of
+    1/n of the total size. The traffic of each worker does not depend on the
+    number of workers, and no job of the initiator aggregates the arrays.
+
+    Chunks sent by client workers are relayed by the scheduler, as any other
+    resource: in a deployment with clients the scheduler still carries the
+    traffic of the whole ring, 2(n-1) chunks for each worker.
+
+    At the end, each worker has the sum of the arrays of all the workers.
+    """
+
+    env_names: list[str]
+
+    def __init__(
+        self,
+        operation: SerializeAsAny[Operation],
+        env_names: list[str],
+        distribution: SerializeAsAny[Distribution | None] = None,
+        iteration: int = 1,
+        **data,
+    ) -> None:
+        super(Ring, self).__init__(
+            operation=operation,
+            env_names=env_names,  # type: ignore
+            distribution=distribution,
+            iteration=iteration,
+            **data,
+        )
+
+    def bind(self, jobs0: Sequence[SchedulerJob], jobs1: Sequence[SchedulerJob]) -> None:
+        # only the jobs of the last stage, one for each worker, are bound to the next step
+        n_workers = len({job.worker.id for job in jobs0})
+
+        super(Ring, self).bind(jobs0[-n_workers:], jobs1)
+
     def jobs(self, context: SchedulerContext) -> Sequence[SchedulerJob]:
-        job_list = []
+        """Creates one job for each worker and for each stage of the ring. The
+        jobs are sorted by stage, then by the position of the worker: the first
+        stage executes the operation.
 
-        n_workers = len(context.workers)
+        Each job locks the job of the next stage of the same worker, where the
+        local chunks are kept, and the job of the next stage of the next worker
+        in the ring, that receives the chunk in transit.
 
-        # TODO: this is a draft, check if it is correctly implemented
-        # FIXME: keep track of the produced resource! It need to pass through ALL workers!
+        Args:
+            context (SchedulerContext):
+                Context of the scheduler.
 
-        for _ in range(n_workers):
-            for i in range(n_workers):
-                start_worker = context.workers[i]
-                end_worker = context.workers[(i + 1) % n_workers]
+        Raises:
+            ValueError:
+                If there are no arrays to reduce.
+
+        Returns:
+            Sequence[SchedulerJob]:
+                The jobs of the ring, with the locks between them already set.
+        """
+        if not self.env_names:
+            raise ValueError("Ring requires at least one array to reduce")
+
+        n_workers = len(context.workers)
+        n_stages = 2 * (n_workers - 1) + 1
 
-                job_list.append(
+        stages: list[list[SchedulerJob]] = []
+
+        for stage in range(n_stages):
+            stages.append(
+                [
                     SchedulerJob(
                         id=context.get_id(),
-                        worker=start_worker,
+                        worker=worker,
                         iteration=context.iteration,
                         step=BaseStep(
                             iteration=self.iteration,
-                            operation=self.operation,
-                            distribution=DirectToNext(next=end_worker),
+                            operation=RingReduce(
+                                env_names=self.env_names,
+                                position=i,
+                                stage=stage,
+                                n_workers=n_workers,
+                                operation=self.operation if stage == 0 else None,
+                            ),
                         ),
                     )
+                    for i, worker in enumerate(context.workers)
+                ]
+            )
+
+        for curr, next in pairwise(stages):
+            for i, job in enumerate(curr):
+                job.locks.append(next[i].id)
+                job.locks.append(next[(i + 1) % n_workers].id)
+
+        return [job for stage in stages for job in stage]
+
+
+def RoundRobin(*args, **kwargs) -> Ring:
+    """The draft RoundRobin step has been replaced by `Ring`. Only this function
+    is left with the old name, since entities are deserialized by class name and
+    RoundRobin is the name of a distribution.
+
+    Raises:
+        ValueError:
+            Always, with the step to use instead.
+    """
+    raise ValueError(
+        "the RoundRobin step has been removed: use the Ring step, with the env_names of the arrays to reduce, "
+        "or the RoundRobin distribution"
+    )
+
+
+class TreeAggregation(BaseStep):
+    """Hierarchical aggregation of the jobs of the previous step.
+
+    The results of the workers are aggregated in a k-ary tree: each job of a
+    level aggregates the results of up to `arity` jobs of the level below and is
+    executed by the worker that produced the first of them. The root job is
+    executed by the initiator and receives at most `arity` partial results,
+    instead of one for each worker. The depth of the tree is log_arity(N), with
+    N the number of workers.
+
+    The previous step must have one job per worker, in the same order of the
+    workers in the context, as a `Parallel` step. Its jobs are bound to the first
+    level of the tree with a `Tree` distribution of the same arity: the previous
+    step can have no distribution or that one, any other raises an error.
+
+    The tree reduces the number of results that the initiator aggregates, not
+    the traffic of the scheduler: results sent by client workers are relayed by
+    the scheduler, so the results of all the workers pass through it anyway.
+    """
+
+    arity: int = 2
+
+    def __init__(
+        self,
+        operation: SerializeAsAny[Operation],
+        arity: int = 2,
+        distribution: SerializeAsAny[Distribution | None] = None,
+        iteration: int = 1,
+        **data,
+    ) -> None:
+        super(TreeAggregation, self).__init__(
+            operation=operation,
+            arity=arity,  # type: ignore
+            distribution=distribution,
+            iteration=iteration,
+            **data,
+        )
+
+    def bind(self, jobs0: Sequence[SchedulerJob], jobs1: Sequence[SchedulerJob]) -> None:
+        # only the root job is bound to the next step
+        super(TreeAggregation, self).bind(jobs0[-1:], jobs1)
+
+    def bind_previous(self, step: Step, jobs0: Sequence[SchedulerJob], jobs1: Sequence[SchedulerJob]) -> None:
+        distribution = Tree(arity=self.arity)
+
+        if not isinstance(step, BaseStep) or step.distribution not in (None, distribution):
+            raise ValueError(f"TreeAggregation requires a previous step without distribution or with {distribution}")
+
+        if len({job.worker.id for job in jobs0}) != len(jobs0):
+            raise ValueError("TreeAggregation requires a previous step with one job for each worker")
+
+        self._link(distribution, list(jobs0), list(jobs1))
+
+    def jobs(self, context: SchedulerContext) -> list[SchedulerJob]:
+        """Creates the jobs of the intermediate levels, from the one closest to
+        the leaves, followed by the root job.
+
+        Args:
+            context (SchedulerContext):
+                Context of the scheduler.
+
+        Raises:
+            ValueError:
+                If the arity is less than 2.
+
+        Returns:
+            list[SchedulerJob]:
+                The jobs of the tree, with the locks between the levels already set.
+        """
+        if self.arity < 2:
+            raise ValueError("Arity of a tree must be at least 2")
+
+        distribution = Tree(arity=self.arity)
+
+        job_list: list[SchedulerJob] = []
+        level: list[SchedulerJob] = []
+
+        n_nodes = len(context.workers)
+        depth = 0
+
+        # intermediate levels, executed by the workers
+        while n_nodes > self.arity:
+            n_nodes = -(-n_nodes // self.arity)
+            depth += 1
+
+            stride = self.arity**depth
+
+            next_level = [
+                SchedulerJob(
+                    id=context.get_id(),
+                    worker=context.workers[i * stride],
+                    iteration=context.iteration,
+                    step=BaseStep(
+                        iteration=self.iteration,
+                        operation=self.operation,
+                        distribution=distribution,
+                    ),
                 )
+                for i in range(n_nodes)
+            ]
+
+            self._link(distribution, level, next_level)
+
+            job_list += next_level
+            level = next_level
+
+        # root, executed by the initiator
+        root = SchedulerJob(
+            id=context.get_id(),
+            worker=context.initiator,
+            iteration=context.iteration,
+            step=self,
+        )
+
+        self._link(distribution, level, [root])
+
+        job_list.append(root)
 
         return job_list
 
+    def _link(self, distribution: Tree, jobs0: list[SchedulerJob], jobs1: list[SchedulerJob]) -> None:
+        locks = distribution.bind_locks([j.id for j in jobs0], [j.id for j in jobs1])
+
+        for job, lock in zip(jobs0, locks):
+            job.locks += lock
+
 
 class Finalize(BaseStep):
     """Completion job done by the initiator."""
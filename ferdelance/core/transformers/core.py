@@ -43,6 +43,12 @@ class QueryTransformer(ABC, Entity):
             return [f.name for f in self.features_out]
         return list()
 
+    def batch_safe(self) -> bool:
+        """Returns True when this transformer works row by row and can be applied
+        independently to each batch of data read from a chunked datasource.
+        Transformers that need to be fitted on the whole data are not batch safe."""
+        return False
+
     def __eq__(self, other: QueryTransformer) -> bool:
         if not isinstance(other, QueryTransformer):
             return False
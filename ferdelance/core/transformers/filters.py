@@ -32,7 +32,7 @@ class FederatedFilter(QueryTransformer):
 
         if feature not in df.columns:
             # no change applied
-            return pd.Series([True for _ in range(df.shape[0])])
+            return pd.Series(True, index=df.index)
 
         if op == FilterOperation.NUM_LESS_THAN:
             return df[feature] < float(parameter)
@@ -63,17 +63,20 @@ class FederatedFilter(QueryTransformer):
 
         raise ValueError(f'Unsupported operation "{self.operation}" ')
 
+    def batch_safe(self) -> bool:
+        return True
+
     def transform(self, env: Environment) -> tuple[Environment, Any]:
-        if env.X_tr:
+        if env.X_tr is not None:
             mask = self.apply(env.X_tr)
             env.X_tr = env.X_tr[mask]
-            if env.Y_tr:
+            if env.Y_tr is not None:
                 env.Y_tr = env.Y_tr[mask]
 
-        if env.X_ts:
+        if env.X_ts is not None:
             mask = self.apply(env.X_ts)
             env.X_ts = env.X_ts[mask]
-            if env.Y_ts:
+            if env.Y_ts is not None:
                 env.Y_ts = env.Y_ts[mask]
 
         return env, None
@@ -15,6 +15,9 @@ class FederatedPipeline(QueryTransformer):
 
     stages: SerializeAsAny[Sequence[QueryTransformer]] = list()
 
+    def batch_safe(self) -> bool:
+        return all(stage.batch_safe() for stage in self.stages)
+
     def transform(self, env: Environment) -> tuple[Environment, Any]:
         trs = list()
         for stage in self.stages:
@@ -98,6 +98,9 @@ class FederatedClamp(QueryTransformer):
         values["max_value"] = max_value
         return values
 
+    def batch_safe(self) -> bool:
+        return True
+
     def transform(self, env: Environment) -> tuple[Environment, Any]:
         c_in = self._columns_in()
         c_out = self._columns_out()
@@ -27,6 +27,9 @@ class FederatedDrop(QueryTransformer):
 
         super().__init__(features_in=features_in, features_out=[])
 
+    def batch_safe(self) -> bool:
+        return True
+
     def transform(self, env: Environment) -> tuple[Environment, Any]:
         c_in = self._columns_in()
 
@@ -48,6 +51,9 @@ class FederatedDrop(QueryTransformer):
 class FederatedRename(QueryTransformer):
     """Renames the input feature to the output features."""
 
+    def batch_safe(self) -> bool:
+        return True
+
     def transform(self, env: Environment) -> tuple[Environment, Any]:
         c_in = self._columns_in()
         c_out = self._columns_out()
@@ -6,9 +6,11 @@ __all__ = [
     "Session",
     "AsyncSession",
     "get_sync_session",
+    "create_or_migrate",
 ]
 
 from .tables import Base
+from .utils import create_or_migrate
 from .db_async import (
     DataBase,
     AsyncSession,
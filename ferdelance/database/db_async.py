@@ -7,6 +7,7 @@ from .utils import db_connection_url
 
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.engine import URL
+from sqlalchemy.pool import NullPool
 
 LOGGER = get_logger(__name__)
 
@@ -17,6 +18,7 @@ class DataBase:
         self.engine: AsyncEngine
         self.async_session_factory: Any
         self.async_session: Any
+        self.unpooled_session: Any
 
     def __new__(cls) -> DataBase:
         if not hasattr(cls, "instance"):
@@ -37,6 +39,18 @@ class DataBase:
                 autoflush=False,
             )
 
+            if cls.instance.database_url == "sqlite+aiosqlite://":
+                # an in-memory database exists only in the connection of the pool
+                cls.instance.unpooled_session = cls.instance.async_session
+            else:
+                cls.instance.unpooled_session = async_sessionmaker(
+                    bind=create_async_engine(cls.instance.database_url, poolclass=NullPool),
+                    class_=AsyncSession,
+                    expire_on_commit=False,
+                    autocommit=False,
+                    autoflush=False,
+                )
+
             LOGGER.info("dataBase connection established")
 
         return cls.instance
@@ -44,6 +58,12 @@ class DataBase:
     def session(self) -> AsyncSession:
         return self.async_session()
 
+    def session_unpooled(self) -> AsyncSession:
+        """Returns a session whose connection is opened and closed with the session.
+        Pooled connections belong to the event loop that created them: this kind
+        of session has to be used by code that runs in a different event loop."""
+        return self.unpooled_session()
+
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     db = DataBase()
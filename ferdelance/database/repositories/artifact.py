@@ -1,7 +1,7 @@
 from ferdelance.config import config_manager
 from ferdelance.core.artifacts import Artifact, ArtifactStatus
 from ferdelance.database.tables import Artifact as ArtifactDB
-from ferdelance.database.repositories.core import AsyncSession, Repository
+from ferdelance.database.repositories.core import AsyncSession, DescriptorCache, Repository
 from ferdelance.logging import get_logger
 from ferdelance.schemas.database import ServerArtifact
 from ferdelance.shared.status import ArtifactJobStatus
@@ -19,6 +19,9 @@ import json
 
 LOGGER = get_logger(__name__)
 
+# artifacts are immutable once stored: parsed descriptors are shared between sessions
+ARTIFACTS: DescriptorCache[Artifact] = DescriptorCache(maxsize=128)
+
 
 def view(artifact: ArtifactDB) -> ServerArtifact:
     return ServerArtifact(
@@ -77,6 +80,8 @@ class ArtifactRepository(Repository):
             id=artifact.id,
             path=str(path),
             status=status.name,
+            project_id=artifact.project_id or None,
+            priority=artifact.priority,
         )
 
         self.session.add(db_artifact)
@@ -150,12 +155,18 @@ class ArtifactRepository(Repository):
 
         Returns:
             Artifact:
-                The requested artifact.
+                The requested artifact. Loaded artifacts are cached and shared,
+                they must not be modified.
         """
 
         try:
             artifact_path: Path = await self.storage_location(artifact_id)
 
+            artifact = ARTIFACTS.get(artifact_path)
+
+            if artifact is not None:
+                return artifact
+
             LOGGER.info(f"artifact={artifact_id}: request loading from path={artifact_path}")
 
             if not await aos.path.exists(artifact_path):
@@ -163,7 +174,11 @@ class ArtifactRepository(Repository):
 
             async with aiofiles.open(artifact_path, "r") as f:
                 content = await f.read()
-                return Artifact(**json.loads(content))
+                artifact = Artifact(**json.loads(content))
+
+            ARTIFACTS.put(artifact_path, artifact)
+
+            return artifact
 
         except NoResultFound:
             raise ValueError(f"artifact={artifact_id} not found")
@@ -1,5 +1,14 @@
+from typing import Generic, TypeVar
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from collections import OrderedDict
+from pathlib import Path
+
+import os
+
+T = TypeVar("T")
+
 
 class Repository:
     """Base class for all repositories. This class guarantees the presence of a
@@ -8,3 +17,51 @@ class Repository:
 
     def __init__(self, session: AsyncSession) -> None:
         self.session: AsyncSession = session
+
+
+class DescriptorCache(Generic[T]):
+    """Least-recently-used cache for descriptors parsed from files on disk.
+
+    An entry is valid as long as the file keeps the same modification time and
+    size it had when the entry was stored, so a rewritten file is read again.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize: int = maxsize
+        self.entries: OrderedDict[str, tuple[int, int, T]] = OrderedDict()
+
+    def get(self, path: Path | str) -> T | None:
+        key = str(path)
+        entry = self.entries.get(key, None)
+
+        if entry is None:
+            return None
+
+        try:
+            stat = os.stat(key)
+        except OSError:
+            self.entries.pop(key, None)
+            return None
+
+        mtime, size, value = entry
+
+        if (stat.st_mtime_ns, stat.st_size) != (mtime, size):
+            self.entries.pop(key, None)
+            return None
+
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, path: Path | str, value: T) -> None:
+        key = str(path)
+
+        try:
+            stat = os.stat(key)
+        except OSError:
+            return
+
+        self.entries[key] = (stat.st_mtime_ns, stat.st_size, value)
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
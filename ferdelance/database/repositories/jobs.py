@@ -1,24 +1,47 @@
+from typing import Any, Sequence
+
 from ferdelance.config import config_manager
-from ferdelance.core.interfaces import SchedulerJob
-from ferdelance.database.tables import Job as JobDB, JobLock as JobLockDB
+from ferdelance.core.containers import SUFFIX
+from ferdelance.core.entity import create_entities
+from ferdelance.core.interfaces import BaseStep, Iterate, SchedulerJob
+from ferdelance.database.tables import (
+    Artifact as ArtifactDB,
+    Component as ComponentDB,
+    Job as JobDB,
+    JobLock as JobLockDB,
+    Project as ProjectDB,
+    Resource as ResourceDB,
+)
 from ferdelance.database.repositories import AsyncSession, Repository
+from ferdelance.database.repositories.component import viewComponent
+from ferdelance.database.repositories.core import DescriptorCache
+from ferdelance.database.repositories.resources import view as viewResource
 from ferdelance.logging import get_logger
+from ferdelance.schemas.components import Component
+from ferdelance.schemas.database import Resource
 from ferdelance.schemas.jobs import Job, JobLock
 from ferdelance.shared.status import JobStatus
 
-from sqlalchemy import func, select, update
+from sqlalchemy import func, insert, or_, select, update
 from sqlalchemy.exc import NoResultFound
+from sqlalchemy.sql.expression import Exists
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from uuid import uuid4
 
 import aiofiles
+import asyncio
+import hashlib
 import json
+import os
 
 
 LOGGER = get_logger(__name__)
 
+# step descriptors are immutable once written: parsed steps are shared between sessions
+STEPS: DescriptorCache[BaseStep | Iterate] = DescriptorCache()
+
 
 def view(job: JobDB) -> Job:
     return Job(
@@ -34,6 +57,54 @@ def view(job: JobDB) -> Job:
     )
 
 
+def locked_by_any() -> Exists:
+    """Condition true when a job is still locked by at least one other job."""
+    return (
+        select(JobLockDB.id)
+        .where(
+            JobLockDB.next_id == JobDB.id,
+            JobLockDB.locked.is_(True),
+        )
+        .exists()
+    )
+
+
+def write_descriptors(descriptors: dict[Path, str], directories: Sequence[Path] = ()) -> None:
+    for d in directories:
+        os.makedirs(d, exist_ok=True)
+
+    for path, content in descriptors.items():
+        if path.exists():
+            # content-addressed: same name, same content
+            continue
+
+        os.makedirs(path.parent, exist_ok=True)
+
+        with open(path, "w") as f:
+            f.write(content)
+
+
+def step_descriptor(artifact_id: str, job: SchedulerJob) -> tuple[Path, str]:
+    """Serializes the step of a job and creates the path, named after the hash
+    of the content, where it will be stored. Jobs that execute the same step
+    share the same descriptor.
+
+    Args:
+        artifact_id (str):
+            Id of the artifact the job belongs to.
+        job (SchedulerJob):
+            Job with the step to serialize.
+
+    Returns:
+        tuple[Path, str]:
+            The path of the descriptor and its content.
+    """
+    content = json.dumps(job.model_dump()["step"], sort_keys=True)
+    step_hash = hashlib.sha256(content.encode("utf8")).hexdigest()
+
+    return config_manager.get().storage_steps(artifact_id) / f"{step_hash}.json", content
+
+
 def view_lock(lock: JobLockDB):
     return JobLock(
         id=lock.id,
@@ -84,7 +155,10 @@ class JobRepository(Repository):
         if job_id is None:
             job_id = str(uuid4())
 
-        path = await self.store(artifact_id, job, job_id)
+        # working directory of the job
+        config_manager.get().storage_job(artifact_id, job_id, job.iteration)
+
+        path = await self.store(artifact_id, job)
 
         job_db = JobDB(
             id=job_id,
@@ -107,19 +181,209 @@ class JobRepository(Repository):
 
         return view(job_db)
 
-    async def store(self, artifact_id: str, job: SchedulerJob, job_id: str) -> Path:
-        path = config_manager.get().storage_job(artifact_id, job_id, job.iteration) / "job.json"
+    async def create_jobs(
+        self,
+        artifact_id: str,
+        jobs: Sequence[SchedulerJob],
+        status=JobStatus.WAITING,
+        predecessors: Sequence[str] = (),
+    ) -> list[Job]:
+        """Inserts a whole graph of jobs into the database. The jobs, the
+        resources they will produce, and the locks between them are inserted
+        with bulk statements in a single transaction; all the job descriptors
+        are written to disk in one batch.
+
+        Args:
+            artifact_id (str):
+                Id of the artifact the jobs belongs to.
+            jobs (Sequence[SchedulerJob]):
+                Jobs to create, with the locks between them.
+            status (JobStatus, optional):
+                Initial status of the created jobs.
+                Defaults to JobStatus.WAITING.
+            predecessors (Sequence[str], optional):
+                Ids of existing, already completed, jobs that precede all the
+                new jobs. Their locks are created as already released, so that
+                the new jobs can collect their resources.
+                Defaults to an empty list.
+
+        Raises:
+            ValueError:
+                If a job locks a job that is not in the given list.
+
+        Returns:
+            list[Job]:
+                The handlers to the created jobs, in the same order of the input.
+        """
+        LOGGER.info(f"artifact={artifact_id}: scheduling {len(jobs)} new job(s)")
+
+        config = config_manager.get()
+
+        ids: dict[int, str] = {job.id: str(uuid4()) for job in jobs}
+
+        resources: list[dict[str, Any]] = list()
+        rows: list[dict[str, Any]] = list()
+        locks: list[dict[str, Any]] = list()
+        descriptors: dict[Path, str] = dict()
+        directories: list[Path] = list()
+
+        # jobs often share the same step object: serialize it only once
+        paths: dict[int, Path] = dict()
+
+        for job in jobs:
+            job_id = ids[job.id]
+            resource_id = str(uuid4())
+
+            job_dir = config.storage_artifact(artifact_id, job.iteration) / job_id
+            directories.append(job_dir)
+
+            if id(job.step) not in paths:
+                path, content = step_descriptor(artifact_id, job)
+                paths[id(job.step)] = path
+                descriptors[path] = content
+
+            path = paths[id(job.step)]
+
+            resources.append(
+                {
+                    "id": resource_id,
+                    "path": str(job_dir / f"{resource_id}{SUFFIX}"),
+                    "component_id": job.worker.id,
+                }
+            )
+            rows.append(
+                {
+                    "id": job_id,
+                    "step_id": job.id,
+                    "artifact_id": artifact_id,
+                    "component_id": job.worker.id,
+                    "path": str(path),
+                    "status": status.name,
+                    "iteration": job.iteration,
+                    "resource_id": resource_id,
+                }
+            )
+
+            for prev_id in predecessors:
+                locks.append(
+                    {
+                        "artifact_id": artifact_id,
+                        "job_id": prev_id,
+                        "next_id": job_id,
+                        "locked": False,
+                    }
+                )
+
+            for next_id in job.locks:
+                if next_id not in ids:
+                    raise ValueError(f"artifact={artifact_id}: job={job.id} locks unknown job={next_id}")
+
+                locks.append(
+                    {
+                        "artifact_id": artifact_id,
+                        "job_id": job_id,
+                        "next_id": ids[next_id],
+                        "locked": True,
+                    }
+                )
+
+        await asyncio.to_thread(write_descriptors, descriptors, directories)
+
+        if rows:
+            await self.session.execute(insert(ResourceDB), resources)
+            await self.session.execute(insert(JobDB), rows)
+        if locks:
+            await self.session.execute(insert(JobLockDB), locks)
+
+        await self.session.commit()
+
+        # only the new jobs are loaded: the older ones of the artifact grow with each lazy iteration
+        res = await self.session.scalars(select(JobDB).where(JobDB.id.in_(list(ids.values()))))
+        created = {j.id: view(j) for j in res.all()}
+
+        LOGGER.info(f"artifact={artifact_id}: scheduled {len(rows)} job(s) with {len(locks)} lock(s)")
+
+        return [created[ids[job.id]] for job in jobs]
+
+    async def store(self, artifact_id: str, job: SchedulerJob) -> Path:
+        """Stores the step of a job on disk. Steps are stored once per content,
+        so jobs executing the same step share the same descriptor.
+
+        Args:
+            artifact_id (str):
+                Id of the artifact the job belongs to.
+            job (SchedulerJob):
+                Job with the step to store.
+
+        Returns:
+            Path:
+                Path to the descriptor of the step.
+        """
+        path, content = step_descriptor(artifact_id, job)
 
-        async with aiofiles.open(path, "w") as f:
-            content = json.dumps(job.model_dump(), indent=True)
-            await f.write(content)
+        await asyncio.to_thread(write_descriptors, {path: content})
 
         return path
 
-    async def load(self, job: Job) -> SchedulerJob:
+    async def load_step(self, job: Job) -> BaseStep | Iterate:
+        """Loads the step executed by a job. Loaded steps are cached and shared,
+        they must not be modified.
+
+        Args:
+            job (Job):
+                Handler of the job.
+
+        Returns:
+            BaseStep | Iterate:
+                The step to execute.
+        """
+        step = STEPS.get(job.path)
+
+        if step is not None:
+            return step
+
         async with aiofiles.open(job.path, "r") as f:
             content = await f.read()
-            return SchedulerJob(**json.loads(content))
+            step = create_entities({"step": json.loads(content)})["step"]
+
+        STEPS.put(job.path, step)
+
+        return step
+
+    async def load(self, job: Job) -> SchedulerJob:
+        """Rebuilds the full descriptor of a job from its step and the database.
+        When only the step is needed, use `load_step()`.
+
+        Args:
+            job (Job):
+                Handler of the job.
+
+        Raises:
+            NoResultsFound:
+                If the job does not exists.
+
+        Returns:
+            SchedulerJob:
+                The descriptor of the job.
+        """
+        res = await self.session.execute(
+            select(JobDB.step_id, ComponentDB)
+            .join(ComponentDB, ComponentDB.id == JobDB.component_id)
+            .where(JobDB.id == job.id)
+        )
+        step_id, worker = res.one()
+
+        locks = await self.session.scalars(
+            select(JobDB.step_id).join(JobLockDB, JobLockDB.next_id == JobDB.id).where(JobLockDB.job_id == job.id)
+        )
+
+        return SchedulerJob(
+            id=step_id,
+            worker=viewComponent(worker),
+            iteration=job.iteration,
+            step=await self.load_step(job),
+            locks=list(locks.all()),
+        )
 
     async def add_locks(self, job: Job, locked_jobs: list[Job]) -> None:
         """Adds constraint between the current job and the jobs that depends on
@@ -301,6 +565,32 @@ class JobRepository(Repository):
         res = await self.session.scalars(select(JobDB).where(JobDB.id == job_id))
         return view(res.one())
 
+    async def get_last_job(self, artifact_id: str) -> tuple[Job, int]:
+        """Gets the last job created for an artifact: the one of the highest
+        iteration with the highest step id.
+
+        Args:
+            artifact_id (str):
+                Id of the artifact.
+
+        Raises:
+            NoResultsFound:
+                If the artifact has no jobs.
+
+        Returns:
+            tuple[Job, int]:
+                The handler of the last job and its step id.
+        """
+        res = await self.session.scalars(
+            select(JobDB)
+            .where(JobDB.artifact_id == artifact_id)
+            .order_by(JobDB.iteration.desc(), JobDB.step_id.desc())
+            .limit(1)
+        )
+        job = res.one()
+
+        return view(job), job.step_id
+
     async def get_by_artifact(self, artifact_id: str, component_id: str, iteration: int) -> Job:
         """Gets an handler to the job associated with the given job_id.
 
@@ -377,6 +667,29 @@ class JobRepository(Repository):
 
         return [view_lock(lock) for lock in locks.all()]
 
+    async def list_locks_by_artifact_id(self, artifact_id: str, only_locked: bool = False) -> list[JobLock]:
+        """Lists the locks between the jobs of the given artifact.
+
+        Args:
+            artifact_id (str):
+                Id of the artifact to get the locks for.
+            only_locked (bool, optional):
+                If True, the locks already released are excluded.
+                Defaults to False.
+
+        Returns:
+            list[JobLock]:
+                A list of the locks of the artifact.
+        """
+        conditions = [JobLockDB.artifact_id == artifact_id]
+
+        if only_locked:
+            conditions.append(JobLockDB.locked.is_(True))
+
+        locks = await self.session.scalars(select(JobLockDB).where(*conditions))
+
+        return [view_lock(lock) for lock in locks.all()]
+
     async def list_unlocked_jobs_by_artifact_id(self, artifact_id: str) -> list[Job]:
         """Lists all jobs that are not locked by any constraint for the given
         artifact_id. Jobs can be in different states.
@@ -392,15 +705,8 @@ class JobRepository(Repository):
         jobs = await self.session.scalars(
             select(JobDB).where(
                 JobDB.artifact_id == artifact_id,
-                # This is NOT IN...
-                JobDB.id.not_in(
-                    select(JobLockDB.next_id)
-                    .where(
-                        JobLockDB.locked.is_(True),
-                        JobLockDB.artifact_id == artifact_id,
-                    )
-                    .distinct()
-                ),
+                # This is NOT EXISTS...
+                ~locked_by_any(),
             )
         )
 
@@ -421,15 +727,8 @@ class JobRepository(Repository):
         jobs = await self.session.scalars(
             select(JobDB).where(
                 JobDB.artifact_id == artifact_id,
-                # ...and this is IN! Do not mix them
-                JobDB.id.in_(
-                    select(JobLockDB.next_id)
-                    .where(
-                        JobLockDB.locked.is_(True),
-                        JobLockDB.artifact_id == artifact_id,
-                    )
-                    .distinct()
-                ),
+                # ...and this is EXISTS! Do not mix them
+                locked_by_any(),
             )
         )
 
@@ -438,11 +737,12 @@ class JobRepository(Repository):
     async def list_previous_jobs(self, job_id: str) -> list[Job]:
         jobs = await self.session.scalars(
             select(JobDB).where(
-                JobDB.id.in_(
-                    select(JobLockDB.job_id).where(
-                        JobLockDB.next_id == job_id,
-                    )
+                select(JobLockDB.id)
+                .where(
+                    JobLockDB.job_id == JobDB.id,
+                    JobLockDB.next_id == job_id,
                 )
+                .exists()
             )
         )
 
@@ -451,16 +751,87 @@ class JobRepository(Repository):
     async def list_next_jobs(self, job_id: str) -> list[Job]:
         jobs = await self.session.scalars(
             select(JobDB).where(
-                JobDB.id.in_(
-                    select(JobLockDB.next_id).where(
-                        JobLockDB.job_id == job_id,
-                    )
+                select(JobLockDB.id)
+                .where(
+                    JobLockDB.next_id == JobDB.id,
+                    JobLockDB.job_id == job_id,
                 )
+                .exists()
             )
         )
 
         return [view(j) for j in jobs.all()]
 
+    async def get_with_resource(self, job_id: str) -> tuple[Job, Resource, Component]:
+        """Gets a job together with the resource it produces and the component
+        that executes it, in a single query.
+
+        Args:
+            job_id (str):
+                Id of the job to retrieve.
+
+        Raises:
+            NoResultsFound:
+                If the job does not exists.
+
+        Returns:
+            tuple[Job, Resource, Component]:
+                The handlers of the job, of its resource, and of its worker.
+        """
+        res = await self.session.execute(
+            select(JobDB, ResourceDB, ComponentDB)
+            .join(ResourceDB, ResourceDB.id == JobDB.resource_id)
+            .join(ComponentDB, ComponentDB.id == JobDB.component_id)
+            .where(JobDB.id == job_id)
+        )
+        job, resource, component = res.one()
+
+        return view(job), viewResource(resource), viewComponent(component)
+
+    async def list_previous_jobs_with_resources(self, job_id: str) -> list[tuple[Job, Resource, Component]]:
+        """Lists all the jobs that lock the given job, together with the resources
+        they produce and the components that execute them, in a single query.
+
+        Args:
+            job_id (str):
+                Id of the locked job.
+
+        Returns:
+            list[tuple[Job, Resource, Component]]:
+                The handlers of the previous jobs, of their resources, and of
+                their workers.
+        """
+        res = await self.session.execute(
+            select(JobDB, ResourceDB, ComponentDB)
+            .join(JobLockDB, JobLockDB.job_id == JobDB.id)
+            .join(ResourceDB, ResourceDB.id == JobDB.resource_id)
+            .join(ComponentDB, ComponentDB.id == JobDB.component_id)
+            .where(JobLockDB.next_id == job_id)
+        )
+
+        return [(view(j), viewResource(r), viewComponent(c)) for j, r, c in res.all()]
+
+    async def list_next_jobs_with_components(self, job_id: str) -> list[tuple[Job, Component]]:
+        """Lists all the jobs locked by the given job, together with the
+        components that execute them, in a single query.
+
+        Args:
+            job_id (str):
+                Id of the locking job.
+
+        Returns:
+            list[tuple[Job, Component]]:
+                The handlers of the next jobs and of their workers.
+        """
+        res = await self.session.execute(
+            select(JobDB, ComponentDB)
+            .join(JobLockDB, JobLockDB.next_id == JobDB.id)
+            .join(ComponentDB, ComponentDB.id == JobDB.component_id)
+            .where(JobLockDB.job_id == job_id)
+        )
+
+        return [(view(j), viewComponent(c)) for j, c in res.all()]
+
     async def list_jobs_by_component_id(self, component_id: str) -> list[Job]:
         """Returns a list of jobs assigned to the given component_id.
 
@@ -535,6 +906,27 @@ class JobRepository(Repository):
         res = await self.session.scalars(select(JobDB).where(JobDB.artifact_id == artifact_id))
         return [view(j) for j in res.all()]
 
+    async def list_pending_jobs_by_artifact_id(self, artifact_id: str) -> list[Job]:
+        """Returns a list of the jobs of the given artifact that have not been
+        completed yet.
+
+        Args:
+            artifact_id (str):
+                Id of the artifact to list for.
+
+        Returns:
+            list[Job]:
+                A list of job handlers not in the COMPLETED state. Note that this
+                list can be an empty list.
+        """
+        res = await self.session.scalars(
+            select(JobDB).where(
+                JobDB.artifact_id == artifact_id,
+                JobDB.status != JobStatus.COMPLETED.name,
+            )
+        )
+        return [view(j) for j in res.all()]
+
     async def count_jobs_by_artifact_id(self, artifact_id: str, iteration: int = -1) -> int:
         """Counts the number of jobs created for the given artifact_id.
 
@@ -576,6 +968,49 @@ class JobRepository(Repository):
         res = await self.session.scalars(select(func.count()).select_from(JobDB).where(*conditions))
         return res.one()
 
+    async def dispatch_job(self, job: Job) -> None:
+        """Records that the job has been sent to its worker, that has still to
+        fetch it.
+
+        Args:
+            job (Job):
+                The job sent to the worker.
+        """
+        await self.session.execute(
+            update(JobDB).where(JobDB.id == job.id).values(dispatch_time=datetime.now().astimezone())
+        )
+        await self.session.commit()
+
+    async def count_busy_jobs_for_component(self, component_id: str, window: float) -> int:
+        """Counts the jobs that the given component is running, and the ones sent
+        to it in the given time window that it has not fetched yet.
+
+        Args:
+            component_id (str):
+                Id of the component to count for.
+            window (float):
+                Seconds in the past to consider for the jobs sent but not fetched.
+
+        Returns:
+            int:
+                The number of jobs that occupy the component.
+        """
+        # local time, as used when the jobs are updated
+        since = datetime.now().astimezone() - timedelta(seconds=window)
+
+        res = await self.session.scalars(
+            select(func.count())
+            .select_from(JobDB)
+            .where(
+                JobDB.component_id == component_id,
+                or_(
+                    JobDB.status == JobStatus.RUNNING.name,
+                    (JobDB.status == JobStatus.SCHEDULED.name) & (JobDB.dispatch_time >= since),
+                ),
+            )
+        )
+        return res.one()
+
     async def next_job_for_component(self, component_id: str) -> Job:
         """Check the database for the next job for the given component. The
         next job is the oldest job in the SCHEDULED state.
@@ -599,3 +1034,100 @@ class JobRepository(Repository):
             .limit(1)
         )
         return view(ret.one())
+
+    async def next_job_for_component_by_priority(
+        self,
+        component_id: str,
+        by_project: bool = False,
+        project_id: str | None = None,
+    ) -> Job:
+        """Check the database for the next job for the given component. The
+        next job is the oldest job in the SCHEDULED state of the artifact with
+        the highest priority.
+
+        Args:
+            component_id (str):
+                Id of the component to search for.
+            by_project (bool, optional):
+                If True, consider only the artifacts of the given project.
+                Defaults to False.
+            project_id (str | None, optional):
+                Id of the project to consider, None for the artifacts without
+                a project.
+                Defaults to None.
+
+        Raises:
+            NoResultFound:
+                If there are no more jobs for the component.
+
+        Returns:
+            Job:
+                The next available job.
+        """
+        conditions = [JobDB.component_id == component_id, JobDB.status == JobStatus.SCHEDULED.name]
+
+        if by_project and project_id is None:
+            conditions.append(ArtifactDB.project_id.is_(None))
+        elif by_project:
+            conditions.append(ArtifactDB.project_id == project_id)
+
+        ret = await self.session.scalars(
+            select(JobDB)
+            .join(ArtifactDB, ArtifactDB.id == JobDB.artifact_id)
+            .where(*conditions)
+            .order_by(ArtifactDB.priority.desc(), JobDB.creation_time.asc())
+            .limit(1)
+        )
+        return view(ret.one())
+
+    async def list_projects_waiting_component(self, component_id: str) -> dict[str | None, tuple[str | None, datetime]]:
+        """Lists the projects with jobs in the SCHEDULED state for the given
+        component.
+
+        Args:
+            component_id (str):
+                Id of the component to search for.
+
+        Returns:
+            dict[str | None, tuple[str | None, datetime]]:
+                For each project id, the token of the project and the creation
+                time of its oldest scheduled job for the component.
+        """
+        res = await self.session.execute(
+            select(ArtifactDB.project_id, ProjectDB.token, func.min(JobDB.creation_time))
+            .select_from(JobDB)
+            .join(ArtifactDB, ArtifactDB.id == JobDB.artifact_id)
+            .outerjoin(ProjectDB, ProjectDB.id == ArtifactDB.project_id)
+            .where(JobDB.component_id == component_id, JobDB.status == JobStatus.SCHEDULED.name)
+            .group_by(ArtifactDB.project_id, ProjectDB.token)
+        )
+        return {project_id: (token, oldest) for project_id, token, oldest in res.all()}
+
+    async def count_started_jobs_by_project(self, window: float) -> dict[str | None, int]:
+        """Counts, for each project, the jobs that are running or that have
+        started in the given time window.
+
+        Args:
+            window (float):
+                Seconds in the past to consider.
+
+        Returns:
+            dict[str | None, int]:
+                The number of jobs for each project id with activity.
+        """
+        # local time, as used when the jobs are updated
+        since = datetime.now().astimezone() - timedelta(seconds=window)
+
+        res = await self.session.execute(
+            select(ArtifactDB.project_id, func.count())
+            .select_from(JobDB)
+            .join(ArtifactDB, ArtifactDB.id == JobDB.artifact_id)
+            .where(
+                or_(
+                    JobDB.status == JobStatus.RUNNING.name,
+                    JobDB.execution_time >= since,
+                )
+            )
+            .group_by(ArtifactDB.project_id)
+        )
+        return {project_id: count for project_id, count in res.all()}
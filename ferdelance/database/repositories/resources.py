@@ -1,4 +1,5 @@
 from ferdelance.config import config_manager
+from ferdelance.core.containers import SUFFIX
 from ferdelance.database.tables import Job as JobDB, Resource as ResourceDB
 from ferdelance.database.repositories.core import AsyncSession, Repository
 from ferdelance.schemas.database import Resource
@@ -79,7 +80,7 @@ class ResourceRepository(Repository):
 
         resource_id: str = str(uuid4())
 
-        out_path = config_manager.get().storage_job(artifact_id, job_id, iteration) / f"{resource_id}.pkl"
+        out_path = config_manager.get().storage_job(artifact_id, job_id, iteration) / f"{resource_id}{SUFFIX}"
 
         resource_db = ResourceDB(
             id=resource_id,
@@ -8,6 +8,7 @@ from sqlalchemy import (
     Table,
     Column,
     Boolean,
+    Index,
 )
 from sqlalchemy.sql.functions import now
 from sqlalchemy.orm import relationship, mapped_column, Mapped, DeclarativeBase
@@ -95,6 +96,12 @@ class Artifact(Base):
     # Zero-based index, same as relative Job.iteration
     iteration: Mapped[int] = mapped_column(default=0)
 
+    # Project the artifact works on, used to share the workers between projects
+    project_id: Mapped[str | None] = mapped_column(String(36), ForeignKey("projects.id"), nullable=True)
+
+    # Artifacts with higher priority are executed first by the priority scheduling policy
+    priority: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+
 
 class Job(Base):
     """Table that keeps track of which artifact has been submitted and the state of the request.
@@ -105,6 +112,16 @@ class Job(Base):
     """
 
     __tablename__ = "jobs"
+    __table_args__ = (
+        # next job for a component (heartbeat)
+        Index("ix_jobs_component_status_creation", "component_id", "status", "creation_time"),
+        # scheduled jobs for an artifact
+        Index("ix_jobs_artifact_status", "artifact_id", "status"),
+        # resource to job lookups
+        Index("ix_jobs_resource", "resource_id"),
+        # recently started jobs, for fair-share scheduling
+        Index("ix_jobs_execution", "execution_time"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
     step_id: Mapped[int] = mapped_column(Integer)
@@ -115,7 +132,7 @@ class Job(Base):
     # Zero-based counter for iterations
     iteration: Mapped[int] = mapped_column(default=0)
 
-    # Path to the local descriptor of this job, sent to the worker
+    # Path to the local descriptor of the step executed by this job, shared between jobs with the same step
     path: Mapped[str] = mapped_column(String)
 
     # Id of the component executing the job
@@ -129,6 +146,8 @@ class Job(Base):
     creation_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=now())
     # When the job has been scheduled
     scheduling_time: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    # When the job has been sent to its worker, that has still to fetch it
+    dispatch_time: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     # When the job started
     execution_time: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     # When the job terminated
@@ -147,6 +166,14 @@ class JobLock(Base):
     """
 
     __tablename__ = "job_locks"
+    __table_args__ = (
+        # jobs unlocked by a job
+        Index("ix_job_locks_job", "job_id"),
+        # jobs that lock a job
+        Index("ix_job_locks_next_locked", "next_id", "locked"),
+        # locks of an artifact, used to rebuild the job graph
+        Index("ix_job_locks_artifact", "artifact_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     artifact_id: Mapped[str] = mapped_column(String(36), ForeignKey("artifacts.id"))
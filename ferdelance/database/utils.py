@@ -1,5 +1,11 @@
 from ferdelance.config import DatabaseConfiguration, config_manager
-from sqlalchemy.engine import URL
+from ferdelance.database.tables import Base
+from ferdelance.logging import get_logger
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import URL, Connection
+
+LOGGER = get_logger(__name__)
 
 
 def db_connection_url(sync: bool = False) -> URL | str:
@@ -42,3 +48,35 @@ def db_connection_url(sync: bool = False) -> URL | str:
         )
 
     raise ValueError(f"dialect {dialect} is not supported")
+
+
+def create_or_migrate(conn: Connection) -> None:
+    """Creates the missing tables and adds the columns and the indexes that are
+    missing in the existing tables. These are not created by `create_all()` for
+    tables that already exist, so databases created by older versions need this
+    step. New columns must be nullable or have a server default.
+
+    Args:
+        conn (Connection):
+            Synchronous connection to the database, as in `AsyncConnection.run_sync()`.
+    """
+    Base.metadata.create_all(conn, checkfirst=True)
+
+    inspector = inspect(conn)
+    compiler = conn.dialect.ddl_compiler(conn.dialect, None)
+
+    for table in Base.metadata.sorted_tables:
+        columns = {c["name"] for c in inspector.get_columns(table.name)}
+
+        for column in table.columns:
+            if column.name not in columns:
+                LOGGER.info(f"adding missing column={column.name} to table={table.name}")
+                spec = compiler.get_column_specification(column)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {spec}"))
+
+        existing = {ix["name"] for ix in inspector.get_indexes(table.name)}
+
+        for index in table.indexes:
+            if index.name not in existing:
+                LOGGER.info(f"creating missing index={index.name} on table={table.name}")
+                index.create(conn)
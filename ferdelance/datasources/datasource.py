@@ -1,5 +1,6 @@
-from typing import Any
+from typing import Any, Iterator
 
+from ferdelance.core.transformers import FederatedFilter
 from ferdelance.schemas.metadata import MetaDataSource
 
 import pandas as pd
@@ -7,15 +8,64 @@ import hashlib
 
 
 class DataSource:
-    def __init__(self, name: str, type: str, extra: str, tokens: list[str] = list(), encoding: str = "utf8") -> None:
+    def __init__(
+        self,
+        name: str,
+        type: str,
+        extra: str,
+        tokens: list[str] = list(),
+        encoding: str = "utf8",
+        batch_size: int | None = None,
+    ) -> None:
         self.hash: str = hashlib.sha256(f"{name}{type}{extra}{tokens}".encode(encoding)).hexdigest()
         self.name: str = name
         self.type: str = type
         self.tokens: list[str] = tokens
+        # when set, the content is read in batches of this many rows
+        self.batch_size: int | None = batch_size
 
     def get(self) -> pd.DataFrame:
         raise NotImplementedError()
 
+    def is_chunked(self) -> bool:
+        return self.batch_size is not None and self.batch_size > 0
+
+    def batches(self) -> Iterator[pd.DataFrame]:
+        """Iterates over the content of the datasource in batches of `batch_size`
+        rows. If the datasource cannot be read in chunks, the whole content is
+        returned as a single batch.
+
+        Returns:
+            Iterator[pd.DataFrame]:
+                The content of the datasource, one batch at time.
+        """
+        yield self.get()
+
+    def supports_pushdown(self) -> bool:
+        """True when aggregates can be computed where the data are stored, without
+        loading the content of the datasource in memory."""
+        return False
+
+    def count(self, filters: list[FederatedFilter]) -> int:
+        """Counts the number of records that satisfy all the given filters."""
+        raise NotImplementedError()
+
+    def sum(self, filters: list[FederatedFilter]) -> pd.Series:
+        """Sums the numeric features of the records that satisfy all the given filters."""
+        raise NotImplementedError()
+
+    def group_count(self, by: list[str], filters: list[FederatedFilter]) -> pd.DataFrame:
+        """Counts the non-null values of each feature, grouped by the given features,
+        for the records that satisfy all the given filters. The result has the same
+        format of `DataFrame.groupby(by).count()`."""
+        raise NotImplementedError()
+
+    def group_sum(self, by: list[str], filters: list[FederatedFilter]) -> pd.DataFrame:
+        """Sums the numeric features grouped by the given features for the records
+        that satisfy all the given filters. The result has the same format of
+        `DataFrame.groupby(by).sum()`."""
+        raise NotImplementedError()
+
     def dump(self) -> dict[str, Any]:
         return {
             "name": self.name,
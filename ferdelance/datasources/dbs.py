@@ -1,25 +1,263 @@
+from typing import Any, Iterator
+
+from ferdelance.core.queries import FilterOperation
+from ferdelance.core.transformers import FederatedFilter
 from ferdelance.datasources.datasource import DataSource
+from ferdelance.schemas.metadata import MetaDataSource, MetaFeature
+
+from sqlalchemy import Column, Engine, MetaData, Numeric, Table, and_, create_engine, func, or_, select
+from sqlalchemy.sql.expression import ColumnElement, Select
 
+import math
 import pandas as pd
 
 
+def filter_clause(table: Table, filter: FederatedFilter) -> ColumnElement[bool] | None:
+    """Translates a FederatedFilter in a SQL condition on the given table. The
+    condition has the same semantic of `FederatedFilter.apply()`.
+
+    Args:
+        table (Table):
+            Table the filter will be applied to.
+        filter (FederatedFilter):
+            Filter to translate.
+
+    Raises:
+        ValueError:
+            If the filter operation is not supported.
+
+    Returns:
+        ColumnElement[bool] | None:
+            The condition to use in a WHERE clause, or None when the filtered
+            feature is not in the table (no change applied).
+    """
+    feature: str = filter.feature if isinstance(filter.feature, str) else filter.feature.name
+    op: FilterOperation = filter.operation
+    parameter: str = filter.value
+
+    if feature not in table.c:
+        return None
+
+    c: Column = table.c[feature]
+
+    if op == FilterOperation.NUM_LESS_THAN:
+        return c < float(parameter)
+    if op == FilterOperation.NUM_LESS_EQUAL:
+        return c <= float(parameter)
+    if op == FilterOperation.NUM_GREATER_THAN:
+        return c > float(parameter)
+    if op == FilterOperation.NUM_GREATER_EQUAL:
+        return c >= float(parameter)
+    if op == FilterOperation.NUM_EQUALS:
+        return c == float(parameter)
+    if op == FilterOperation.NUM_NOT_EQUALS:
+        # in pandas missing values are always different
+        return or_(c != float(parameter), c.is_(None))
+
+    if op == FilterOperation.OBJ_LIKE:
+        return c == parameter
+    if op == FilterOperation.OBJ_NOT_LIKE:
+        return or_(c != parameter, c.is_(None))
+
+    if op == FilterOperation.TIME_BEFORE:
+        return c < pd.to_datetime(parameter).to_pydatetime()
+    if op == FilterOperation.TIME_AFTER:
+        return c > pd.to_datetime(parameter).to_pydatetime()
+    if op == FilterOperation.TIME_EQUALS:
+        return c == pd.to_datetime(parameter).to_pydatetime()
+    if op == FilterOperation.TIME_NOT_EQUALS:
+        return or_(c != pd.to_datetime(parameter).to_pydatetime(), c.is_(None))
+
+    raise ValueError(f'Unsupported operation "{filter.operation}" ')
+
+
+def is_numeric(column: Column) -> bool:
+    try:
+        return column.type.python_type in (int, float) or isinstance(column.type, Numeric)
+    except NotImplementedError:
+        return False
+
+
 class DataSourceDB(DataSource):
+    """A datasource stored in a table of a relational database. The connection
+    is managed through SQLAlchemy, so any database with a synchronous driver
+    supported by SQLAlchemy can be used (i.e. SQLite, PostgreSQL).
+
+    Simple aggregates (count, sums, and group counts) are computed by the
+    database itself, without loading the table in memory.
+    """
+
     def __init__(
         self,
         name: str,
         type: str,
         connection_string: str,
+        table: str,
         tokens: list[str] = list(),
         encoding: str = "utf8",
+        batch_size: int | None = None,
     ) -> None:
-        super().__init__(name, type, connection_string, tokens, encoding)
+        super().__init__(name, type, f"{connection_string}/{table}", tokens, encoding, batch_size)
         self.connection_string: str = connection_string
+        self.table_name: str = table
+
+        self._engine: Engine | None = None
+        self._table: Table | None = None
+
+    def engine(self) -> Engine:
+        if self._engine is None:
+            self._engine = create_engine(self.connection_string)
+        return self._engine
+
+    def table(self) -> Table:
+        if self._table is None:
+            self._table = Table(self.table_name, MetaData(), autoload_with=self.engine())
+        return self._table
+
+    def _where(self, stmt: Select, filters: list[FederatedFilter]) -> Select:
+        table = self.table()
+
+        conditions = [filter_clause(table, f) for f in filters]
+        conditions = [c for c in conditions if c is not None]
+
+        if conditions:
+            stmt = stmt.where(and_(*conditions))
+
+        return stmt
 
     def get(self) -> pd.DataFrame:
-        # TODO open connection, filter content, pack as pandas DF
-        raise NotImplementedError()
+        with self.engine().connect() as conn:
+            return pd.read_sql(select(self.table()), conn)
+
+    def batches(self) -> Iterator[pd.DataFrame]:
+        if not self.is_chunked():
+            yield self.get()
+            return
+
+        with self.engine().connect() as conn:
+            conn = conn.execution_options(stream_results=True)
+
+            yield from pd.read_sql(select(self.table()), conn, chunksize=self.batch_size)
+
+    def supports_pushdown(self) -> bool:
+        return True
+
+    def count(self, filters: list[FederatedFilter]) -> int:
+        stmt = self._where(select(func.count()).select_from(self.table()), filters)
+
+        with self.engine().connect() as conn:
+            return conn.execute(stmt).scalar_one()
+
+    def sum(self, filters: list[FederatedFilter]) -> pd.Series:
+        columns = [c for c in self.table().columns if is_numeric(c)]
+
+        stmt = self._where(select(*[func.coalesce(func.sum(c), 0).label(c.name) for c in columns]), filters)
+
+        with self.engine().connect() as conn:
+            row = conn.execute(stmt).one()
+
+        return pd.Series(row._asdict())
+
+    def _group(self, by: list[str], filters: list[FederatedFilter], aggregate: Any, numeric: bool) -> pd.DataFrame:
+        table = self.table()
+
+        keys = [table.c[b] for b in by]
+        columns = [c for c in table.columns if c.name not in by and (not numeric or is_numeric(c))]
+
+        stmt = select(*keys, *[aggregate(c).label(c.name) for c in columns])
+        # as in pandas, rows with missing group keys are dropped
+        stmt = self._where(stmt, filters).where(*[k.is_not(None) for k in keys]).group_by(*keys)
+
+        with self.engine().connect() as conn:
+            df = pd.read_sql(stmt, conn)
+
+        return df.set_index(by)
+
+    def group_count(self, by: list[str], filters: list[FederatedFilter]) -> pd.DataFrame:
+        return self._group(by, filters, func.count, False)
+
+    def group_sum(self, by: list[str], filters: list[FederatedFilter]) -> pd.DataFrame:
+        return self._group(by, filters, lambda c: func.coalesce(func.sum(c), 0), True)
 
     def dump(self) -> dict[str, str]:
         return super().dump() | {
             "conn": self.connection_string,
+            "table": self.table_name,
         }
+
+    def metadata(self) -> MetaDataSource:
+        table = self.table()
+        numerics = set(c.name for c in table.columns if is_numeric(c))
+
+        aggregates = [func.count().label("n_records")]
+        for i, c in enumerate(table.columns):
+            aggregates.append((func.count() - func.count(c)).label(f"miss_{i}"))
+
+            if c.name in numerics:
+                aggregates += [
+                    func.avg(c).label(f"mean_{i}"),
+                    func.avg(c * c).label(f"sq_{i}"),
+                    func.min(c).label(f"min_{i}"),
+                    func.max(c).label(f"max_{i}"),
+                    func.count(c).label(f"n_{i}"),
+                ]
+
+        with self.engine().connect() as conn:
+            row = conn.execute(select(*aggregates).select_from(table)).one()._asdict()
+
+        features: list[MetaFeature] = []
+        for i, c in enumerate(table.columns):
+            if c.name in numerics:
+                dtype = "int64" if c.type.python_type is int else "float64"
+
+                n = row[f"n_{i}"]
+                mean = row[f"mean_{i}"]
+                std = None
+
+                if n > 1 and mean is not None:
+                    # sample standard deviation, as in pandas
+                    var = (row[f"sq_{i}"] - mean * mean) * n / (n - 1)
+                    std = math.sqrt(max(var, 0.0))
+
+                f = MetaFeature(
+                    datasource_hash=self.hash,
+                    name=c.name,
+                    dtype=dtype,
+                    v_mean=mean,
+                    v_std=std,
+                    v_min=row[f"min_{i}"],
+                    v_p25=None,
+                    v_p50=None,
+                    v_p75=None,
+                    v_max=row[f"max_{i}"],
+                    v_miss=row[f"miss_{i}"],
+                    n_cats=0,  # TODO
+                    n_values=n,
+                )
+            else:
+                f = MetaFeature(
+                    datasource_hash=self.hash,
+                    name=c.name,
+                    dtype="object",
+                    v_mean=None,
+                    v_std=None,
+                    v_min=None,
+                    v_p25=None,
+                    v_p50=None,
+                    v_p75=None,
+                    v_max=None,
+                    v_miss=None,
+                    n_cats=0,  # TODO
+                )
+            features.append(f)
+
+        return MetaDataSource(
+            id=None,
+            hash=self.hash,
+            name=self.name,
+            removed=False,
+            n_records=row["n_records"],
+            n_features=len(table.columns),
+            features=features,
+            tokens=self.tokens,
+        )
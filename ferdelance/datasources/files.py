@@ -1,11 +1,33 @@
+from typing import Iterator
+
+from ferdelance.core.moments import batch_moments, derive_moments, empty_moments, merge_moments
+from ferdelance.core.sketches import QuantileSketch
 from ferdelance.datasources.datasource import DataSource
 from ferdelance.schemas.metadata import MetaDataSource, MetaFeature
 
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 
+def _is_numeric(dtype: np.dtype) -> bool:
+    # same features described by DataFrame.describe()
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+def _common_dtype(a: np.dtype, b: np.dtype) -> np.dtype:
+    """Type of a feature read in batches: batches can differ, i.e. when only some
+    of them have missing values."""
+    if a == b:
+        return a
+
+    if _is_numeric(a) and _is_numeric(b):
+        return np.result_type(a, b)
+
+    return np.dtype(object)
+
+
 class DataSourceFile(DataSource):
     def __init__(
         self,
@@ -14,8 +36,9 @@ class DataSourceFile(DataSource):
         path: Path | str,
         tokens: list[str] = list(),
         encoding: str = "utf8",
+        batch_size: int | None = None,
     ) -> None:
-        super().__init__(name, type, str(path), tokens, encoding)
+        super().__init__(name, type, str(path), tokens, encoding, batch_size)
 
         if isinstance(path, str):
             path = Path(path)
@@ -31,43 +54,95 @@ class DataSourceFile(DataSource):
 
         raise ValueError(f"Don't know how to load {extension} format")
 
+    def batches(self) -> Iterator[pd.DataFrame]:
+        if not self.is_chunked():
+            yield self.get()
+            return
+
+        extension = self.path.suffix
+
+        if extension == ".csv":
+            sep = ","
+        elif extension == ".tsv":
+            sep = "\t"
+        else:
+            raise ValueError(f"Don't know how to load {extension} format")
+
+        with pd.read_csv(self.path, sep=sep, chunksize=self.batch_size) as reader:
+            yield from reader
+
     def dump(self) -> dict[str, str]:
         return super().dump() | {
             "conn": str(self.path),
         }
 
     def metadata(self) -> MetaDataSource:
-        sep = "\t" if self.type == "tsv" else ","
+        """Describes the content of the file with a single pass over its batches.
+        Moments and quantile sketches of the numeric features are built in
+        streaming fashion, so the memory used does not depend on the size of the
+        file; the quantiles are estimated from the sketches. The sketches hold
+        values of the data, so they are not part of the description.
+
+        Returns:
+            MetaDataSource:
+                Description of the datasource and of its features.
+        """
+        n_records: int = 0
+
+        dtypes: dict[str, np.dtype] = dict()
+        missing: dict[str, int] = dict()
+        moments: dict[str, np.ndarray] = dict()
+        sketches: dict[str, QuantileSketch] = dict()
+
+        for df in self.batches():
+            n_records += len(df)
+
+            for feature in df.columns:
+                values = df[feature]
+
+                if feature in dtypes:
+                    dtypes[feature] = _common_dtype(dtypes[feature], values.dtype)
+                else:
+                    dtypes[feature] = values.dtype
+                    missing[feature] = 0
+                    moments[feature] = empty_moments(1)
+                    sketches[feature] = QuantileSketch()
+
+                missing[feature] += int(values.isna().sum())
 
-        df = pd.read_csv(self.path, sep=sep)
-        df_desc = df.describe()
+                if _is_numeric(dtypes[feature]):
+                    x = values.to_numpy(dtype=np.float64, na_value=np.nan)
 
-        n_records, n_features = df.shape
+                    moments[feature] = merge_moments(moments[feature], batch_moments(x[:, None]))
+                    sketches[feature].update(x)
 
         features: list[MetaFeature] = []
-        for feature in df.columns:
-            dtype = str(df[feature].dtype)
+        for feature, dtype in dtypes.items():
+            if _is_numeric(dtype):
+                stats = derive_moments(moments[feature])
+                sketch = sketches[feature]
+                p25, p50, p75 = sketch.quantile([0.25, 0.5, 0.75])
 
-            if feature in df_desc:
                 f = MetaFeature(
                     datasource_hash=self.hash,
                     name=str(feature),
-                    dtype=dtype,
-                    v_mean=df_desc[feature]["mean"],
-                    v_std=df_desc[feature]["std"],
-                    v_min=df_desc[feature]["min"],
-                    v_p25=df_desc[feature]["25%"],
-                    v_p50=df_desc[feature]["50%"],
-                    v_p75=df_desc[feature]["75%"],
-                    v_max=df_desc[feature]["max"],
-                    v_miss=df[feature].isna().sum(),
+                    dtype=str(dtype),
+                    v_mean=stats["mean"][0],
+                    v_std=stats["std"][0],
+                    v_min=stats["min"][0],
+                    v_p25=p25,
+                    v_p50=p50,
+                    v_p75=p75,
+                    v_max=stats["max"][0],
+                    v_miss=missing[feature],
                     n_cats=0,  # TODO
+                    n_values=int(stats["count"][0]),
                 )
             else:
                 f = MetaFeature(
                     datasource_hash=self.hash,
                     name=str(feature),
-                    dtype=dtype,
+                    dtype=str(dtype),
                     v_mean=None,
                     v_std=None,
                     v_min=None,
@@ -86,7 +161,7 @@ class DataSourceFile(DataSource):
             name=self.name,
             removed=False,
             n_records=n_records,
-            n_features=n_features,
+            n_features=len(features),
             features=features,
             tokens=self.tokens,
         )
@@ -1,5 +1,5 @@
 from contextlib import asynccontextmanager
-from ferdelance.database import DataBase, Base
+from ferdelance.database import DataBase, create_or_migrate
 from ferdelance.logging import get_logger
 from ferdelance.node.middlewares import SignedAPIRoute
 from ferdelance.node.routes import (
@@ -9,6 +9,7 @@ from ferdelance.node.routes import (
     task_router,
     workbench_router,
 )
+from ferdelance.node.services.dispatcher import dispatcher
 from ferdelance.node.startup import NodeStartup
 
 from fastapi import FastAPI, Request, status
@@ -55,19 +56,24 @@ async def startup() -> None:
 
         async with inst.engine.begin() as conn:
             LOGGER.info("database creation started")
-            await conn.run_sync(Base.metadata.create_all, checkfirst=True)
+            await conn.run_sync(create_or_migrate)
             LOGGER.info("database creation completed")
 
         async with inst.async_session() as session:
             ns = NodeStartup(session)
             await ns.startup()
 
+        await dispatcher.start()
+
     except Exception as e:
         LOGGER.exception(e)
 
 
 async def shutdown() -> None:
     LOGGER.info("server shutdown procedure started")
+
+    await dispatcher.stop()
+
     inst = DataBase()
     if inst.engine:
         await inst.engine.dispose()
@@ -36,7 +36,7 @@ async def client_home():
 
 @client_router.get("/update", response_model=UpdateData)
 async def client_update(
-    _: ClientUpdate,
+    content: ClientUpdate,
     args: ValidSessionArgs = Depends(allow_access),
 ) -> UpdateData:
     """API used by the client to get the updates. Updates can be one of the following:
@@ -52,6 +52,6 @@ async def client_update(
         args.self_component,
     )
 
-    next_action = await jms.update(args.source)
+    next_action = await jms.update(args.source, content)
 
     return next_action
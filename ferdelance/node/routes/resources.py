@@ -47,6 +47,17 @@ async def get_task(
     try:
         resource = await rm.load_resource(res_id)
 
+        relayed_path = rm.relayed_path(resource, args.source.id)
+
+        if os.path.exists(relayed_path):
+            # copy relayed for this component, already encrypted for it: this is for the middleware
+            return FileResponse(path=relayed_path, headers={"Encrypted_for": args.source.id})
+
+        if rm.is_relayed(resource):
+            LOGGER.warn(f"component={args.source.id}: tried to fetch resource relayed for other components")
+            raise HTTPException(403, "Access Denied")
+
+        # resources relayed by previous versions have a single target
         if resource.encrypted_for is not None and resource.encrypted_for != args.source.id:
             LOGGER.warn(
                 f"component={args.source.id}: tried to fetch resource for another component={resource.encrypted_for}"
@@ -86,6 +97,7 @@ async def post_resource(
         if args.source.type_name == TYPE_USER:
             LOGGER.info(f"component={component.id}: adding external resource")
             resource = await rm.create_resource_external(component.id)
+            path = resource.path
 
         else:
             if "job_id" not in args.extra_headers:
@@ -97,23 +109,24 @@ async def post_resource(
             LOGGER.info(f"component={component.id}: adding resource as product of job={job_id} for {args.target.id}")
 
             resource = await rm.store_resource(job_id, args.source.id)
+            path = resource.path
 
             if args.target.id != args.self_component.id:
-                # proxy
+                # proxy: each target has its own copy, since the content is encrypted for it
                 LOGGER.info(f"component={component.id}: proxy resource from {args.source.id} to {args.target.id}")
-                resource = await rm.set_encrypted_for(resource, args.target.id)
+                path = rm.relayed_path(resource, args.target.id)
 
         # use resource's path
         if "file" in args.extra_headers and args.extra_headers["file"] == "attached":
-            LOGGER.info(f"component={component.id}: decrypting resource file to path={resource.path}")
-            await args.exc.stream_decrypt_file(request.stream(), resource.path)
+            LOGGER.info(f"component={component.id}: decrypting resource file to path={path}")
+            await args.exc.stream_decrypt_file(request.stream(), path)
 
-        elif os.path.exists(resource.path):
-            LOGGER.info(f"component={component.id}: found local resource file at path={resource.path}")
+        elif os.path.exists(path):
+            LOGGER.info(f"component={component.id}: found local resource file at path={path}")
             # TODO: allow overwrite?
 
         else:
-            LOGGER.error(f"component={component.id}: expected file at path={resource.path} not found")
+            LOGGER.error(f"component={component.id}: expected file at path={path} not found")
             raise HTTPException(404)
 
         return ResourceIdentifier(
@@ -3,6 +3,7 @@ from ferdelance.core.metrics import Metrics
 from ferdelance.logging import get_logger
 from ferdelance.node.middlewares import SignedAPIRoute, ValidSessionArgs, valid_session_args
 from ferdelance.node.services import JobManagementService, TaskManagementService
+from ferdelance.node.services.dispatcher import dispatcher
 from ferdelance.tasks.tasks import Task, TaskDone, TaskError, TaskRequest
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -90,30 +91,9 @@ async def post_done(
     args: ValidSessionArgs = Depends(allow_access),
 ):
     LOGGER.info(f"component={args.source.id}: job={done.job_id} completed")
-    jms: JobManagementService = JobManagementService(
-        args.session,
-        args.self_component,
-    )
-    tms: TaskManagementService = TaskManagementService(
-        args.session,
-        args.self_component,
-        args.exc.transfer_private_key(),
-        args.exc.transfer_public_key(),
-    )
-
-    try:
-        async with args.lock:
-            await jms.task_completed(done.job_id)
-            await jms.check(done.artifact_id)
-            await tms.check(done.artifact_id)
 
-    except Exception as e:
-        LOGGER.error(
-            f"component={args.self_component.id}: something went wrong with completion of job={done.job_id} "
-            f"from component={args.source.id}"
-        )
-        LOGGER.exception(e)
-        return HTTPException(500)
+    # the next jobs are scheduled and launched in background
+    await dispatcher.put(done)
 
 
 @task_router.post("/error")
@@ -122,15 +102,5 @@ async def post_error(
     args: ValidSessionArgs = Depends(allow_access),
 ):
     LOGGER.warning(f"component={args.source.id}: job={error.job_id} in error={error.message}")
-    jms: JobManagementService = JobManagementService(
-        args.session,
-        args.self_component,
-    )
-
-    try:
-        await jms.task_failed(error)
 
-    except Exception as e:
-        LOGGER.error(f"component={args.source.id}: could not save error for job={error.job_id}")
-        LOGGER.exception(e)
-        return HTTPException(500)
+    await dispatcher.put(error)
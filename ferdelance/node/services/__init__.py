@@ -5,7 +5,9 @@ __all__ = [
     "WorkbenchService",
     "JobManagementService",
     "ResourceManagementService",
+    "LocalRouteService",
     "TaskManagementService",
+    "Dispatcher",
 ]
 
 from .node import NodeService
@@ -13,4 +15,6 @@ from .actions import ActionService
 from .tasks import TaskManagementService
 from .jobs import JobManagementService
 from .resource import ResourceManagementService
+from .local import LocalRouteService
 from .workbench import WorkbenchConnectService, WorkbenchService
+from .dispatcher import Dispatcher
@@ -4,6 +4,7 @@ from ferdelance.database.repositories import (
     JobRepository,
 )
 from ferdelance.logging import get_logger
+from ferdelance.node.services.scheduling import SchedulingPolicy, get_scheduling_policy
 from ferdelance.schemas.components import Component
 from ferdelance.schemas.jobs import Job
 from ferdelance.schemas.updates import UpdateData
@@ -13,6 +14,9 @@ from sqlalchemy.exc import NoResultFound
 
 LOGGER = get_logger(__name__)
 
+# seconds a job sent to a worker counts as taken, while waiting for the worker to fetch it
+DISPATCH_TIMEOUT: float = 60.0
+
 
 class ActionService:
     def __init__(self, session: AsyncSession) -> None:
@@ -21,20 +25,38 @@ class ActionService:
         self.jr: JobRepository = JobRepository(session)
         self.cr: ComponentRepository = ComponentRepository(session)
 
+        self.policy: SchedulingPolicy = get_scheduling_policy()
+
     async def _check_scheduled_job(self, component: Component) -> Job:
-        return await self.jr.next_job_for_component(component.id)
+        return await self.policy.next_job(self.jr, component.id)
 
     async def _action_schedule_job(self, job: Job) -> UpdateData:
+        await self.jr.dispatch_job(job)
+
         return UpdateData(action=Action.EXECUTE.name, job_id=job.id, artifact_id=job.artifact_id)
 
     async def _action_nothing(self) -> UpdateData:
         """Do nothing and waits for the next update request."""
         return UpdateData(action=Action.DO_NOTHING.name)
 
-    async def next(self, component: Component) -> UpdateData:
-        # TODO: consume component payload
+    async def _is_busy(self, component: Component, max_jobs: int | None) -> bool:
+        if max_jobs is None:
+            return False
+
+        # jobs sent but not fetched yet are still scheduled, but they will run soon
+        busy = await self.jr.count_busy_jobs_for_component(component.id, DISPATCH_TIMEOUT)
 
+        if busy >= max_jobs:
+            LOGGER.debug(f"component={component.id}: running or starting {busy} job(s) out of {max_jobs}")
+            return True
+
+        return False
+
+    async def next(self, component: Component, max_jobs: int | None = None) -> UpdateData:
         try:
+            if await self._is_busy(component, max_jobs):
+                return await self._action_nothing()
+
             task = await self._check_scheduled_job(component)
             return await self._action_schedule_job(task)
 
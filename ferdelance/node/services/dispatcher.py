@@ -0,0 +1,163 @@
+from ferdelance.config import config_manager
+from ferdelance.database import AsyncSession, DataBase
+from ferdelance.database.repositories import ComponentRepository
+from ferdelance.logging import get_logger
+from ferdelance.node.services.jobs import JobManagementService
+from ferdelance.node.services.tasks import TaskManagementService
+from ferdelance.schemas.components import Component
+from ferdelance.security.exchange import Exchange
+from ferdelance.tasks.tasks import TaskDone, TaskError
+
+import asyncio
+
+LOGGER = get_logger(__name__)
+
+
+class Dispatcher:
+    """Background service that advances the scheduling of the node.
+
+    The routes only enqueue the completion and error events received from the
+    workers and return. The dispatcher consumes the events in batches: first all
+    the state transitions of the jobs are applied, then each artifact touched by
+    the batch is checked once, and the jobs that became ready are launched.
+
+    Since a single task consumes the queue, the events are processed one batch at
+    a time and in order of arrival. When the dispatcher is not running, the events
+    are processed as they arrive, one at a time.
+    """
+
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue[TaskDone | TaskError] | None = None
+        self.task: asyncio.Task | None = None
+
+        # serializes the processing of the events, also when they are not queued
+        self.lock: asyncio.Lock = asyncio.Lock()
+
+    def is_running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    async def start(self) -> None:
+        """Starts the consumer task in the current event loop."""
+        if self.is_running():
+            return
+
+        self.queue = asyncio.Queue()
+        self.task = asyncio.create_task(self.run())
+
+        LOGGER.info("dispatcher started")
+
+    async def stop(self) -> None:
+        """Processes the events still in the queue, then stops the consumer task."""
+        if self.queue is None or self.task is None:
+            return
+
+        await self.queue.join()
+
+        self.task.cancel()
+
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+
+        self.queue = None
+        self.task = None
+
+        LOGGER.info("dispatcher stopped")
+
+    async def put(self, event: TaskDone | TaskError) -> None:
+        """Adds an event to the queue. If the dispatcher is not running, the event
+        is processed immediately, after the events already being processed.
+
+        Args:
+            event (TaskDone | TaskError):
+                Completion or error notified by a worker.
+        """
+        if self.queue is None or not self.is_running():
+            async with self.lock:
+                await self.process([event])
+            return
+
+        self.queue.put_nowait(event)
+
+    async def join(self) -> None:
+        """Waits until all the events in the queue have been processed."""
+        if self.queue is not None:
+            await self.queue.join()
+
+    async def run(self) -> None:
+        assert self.queue is not None
+
+        while True:
+            events = [await self.queue.get()]
+
+            # batch all the events that arrived in the meantime
+            while not self.queue.empty():
+                events.append(self.queue.get_nowait())
+
+            try:
+                async with self.lock:
+                    await self.process(events)
+
+            except Exception as e:
+                LOGGER.error(f"dispatcher: could not process {len(events)} event(s)")
+                LOGGER.exception(e)
+
+            finally:
+                for _ in events:
+                    self.queue.task_done()
+
+    async def process(self, events: list[TaskDone | TaskError]) -> None:
+        """Applies the state transitions of a batch of events, then checks once
+        each artifact involved and launches the jobs that can start.
+
+        Args:
+            events (list[TaskDone | TaskError]):
+                The events to process, in order of arrival.
+        """
+        async with DataBase().session() as session:
+            self_component = await ComponentRepository(session).get_self_component()
+
+            jms = JobManagementService(session, self_component)
+
+            artifacts: dict[str, None] = dict()
+
+            for event in events:
+                try:
+                    if isinstance(event, TaskDone):
+                        await jms.task_completed(event.job_id)
+                        artifacts[event.artifact_id] = None
+
+                    else:
+                        await jms.task_failed(event)
+
+                except Exception as e:
+                    LOGGER.error(f"component={self_component.id}: could not process event for job={event.job_id}")
+                    LOGGER.exception(e)
+
+            if not artifacts:
+                return
+
+            tms = self.task_management_service(session, self_component)
+
+            for artifact_id in artifacts:
+                try:
+                    await jms.check(artifact_id)
+                    await tms.check(artifact_id)
+
+                except Exception as e:
+                    LOGGER.error(f"component={self_component.id}: could not dispatch jobs for artifact={artifact_id}")
+                    LOGGER.exception(e)
+
+    def task_management_service(self, session: AsyncSession, self_component: Component) -> TaskManagementService:
+        exc = Exchange(self_component.id, private_key_path=config_manager.get().private_key_location())
+
+        return TaskManagementService(
+            session,
+            self_component,
+            exc.transfer_private_key(),
+            exc.transfer_public_key(),
+        )
+
+
+dispatcher = Dispatcher()
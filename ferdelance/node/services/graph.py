@@ -0,0 +1,164 @@
+from ferdelance.logging import get_logger
+from ferdelance.schemas.jobs import Job, JobLock
+from ferdelance.shared.status import JobStatus
+
+from collections import defaultdict
+
+LOGGER = get_logger(__name__)
+
+
+class JobGraph:
+    """In-memory view of the dependency graph of the jobs of an artifact.
+
+    Each job keeps a counter of the predecessors that are still locking it. When
+    a job completes, only its successors are visited: the ones whose counter
+    drops to zero become ready to be scheduled. The completion of the artifact is
+    detected through the counter of the jobs not yet completed.
+    """
+
+    def __init__(self, artifact_id: str) -> None:
+        self.artifact_id: str = artifact_id
+
+        self.jobs: dict[str, Job] = dict()
+        self.successors: dict[str, list[str]] = defaultdict(list)
+        self.in_degree: dict[str, int] = dict()
+
+        self.ready: set[str] = set()
+        self.completed: set[str] = set()
+
+    @property
+    def remaining(self) -> int:
+        """Number of jobs that have not been completed yet."""
+        return len(self.jobs) - len(self.completed)
+
+    def add(self, jobs: list[Job], locks: list[JobLock]) -> None:
+        """Adds jobs, and the locks between them, to the graph.
+
+        Args:
+            jobs (list[Job]):
+                Handlers of the jobs to add.
+            locks (list[JobLock]):
+                Locks between the jobs. Locks already released do not count
+                toward the in-degree of the locked job.
+        """
+        for job in jobs:
+            self.jobs[job.id] = job
+            self.in_degree.setdefault(job.id, 0)
+
+            if job.status == JobStatus.COMPLETED:
+                self.completed.add(job.id)
+
+        for lock in locks:
+            self.successors[lock.job_id].append(lock.next_id)
+
+            if lock.locked:
+                self.in_degree[lock.next_id] = self.in_degree.get(lock.next_id, 0) + 1
+
+        for job in jobs:
+            if job.status == JobStatus.WAITING and self.in_degree[job.id] == 0:
+                self.ready.add(job.id)
+
+    def complete(self, job_id: str) -> list[str]:
+        """Marks a job as completed and releases the locks on its successors.
+
+        Args:
+            job_id (str):
+                Id of the completed job.
+
+        Raises:
+            ValueError:
+                If the job is not part of this graph.
+
+        Returns:
+            list[str]:
+                The ids of the jobs that became ready after this completion.
+        """
+        if job_id not in self.jobs:
+            raise ValueError(f"artifact={self.artifact_id}: job={job_id} not in graph")
+
+        if job_id in self.completed:
+            return list()
+
+        self.completed.add(job_id)
+        self.ready.discard(job_id)
+
+        unlocked: list[str] = list()
+
+        for next_id in self.successors.get(job_id, list()):
+            self.in_degree[next_id] -= 1
+
+            if self.in_degree[next_id] == 0 and self.jobs[next_id].status == JobStatus.WAITING:
+                self.ready.add(next_id)
+                unlocked.append(next_id)
+
+        return unlocked
+
+    def pop_ready(self) -> list[Job]:
+        """Returns the jobs ready to be scheduled and removes them from the ready set.
+
+        Returns:
+            list[Job]:
+                Handlers of the jobs that can be scheduled.
+        """
+        jobs = [self.jobs[job_id] for job_id in sorted(self.ready, key=lambda j: self.jobs[j].creation_time)]
+        self.ready.clear()
+        return jobs
+
+    def update(self, job: Job) -> None:
+        """Replaces the handler of a job with an updated one.
+
+        Args:
+            job (Job):
+                Updated handler.
+        """
+        self.jobs[job.id] = job
+
+
+class JobGraphRegistry:
+    """Keeps the graphs of the artifacts that are running in this process.
+
+    The registry is only a cache: the database is always the source of truth and
+    a missing graph is rebuilt from the jobs and the locks stored there.
+    """
+
+    def __init__(self) -> None:
+        self.graphs: dict[str, JobGraph] = dict()
+
+    def __contains__(self, artifact_id: str) -> bool:
+        return artifact_id in self.graphs
+
+    def get(self, artifact_id: str) -> JobGraph | None:
+        return self.graphs.get(artifact_id, None)
+
+    def create(self, artifact_id: str, jobs: list[Job], locks: list[JobLock]) -> JobGraph:
+        """Builds a new graph for an artifact, replacing the existing one.
+
+        Args:
+            artifact_id (str):
+                Id of the artifact.
+            jobs (list[Job]):
+                All the jobs of the artifact.
+            locks (list[JobLock]):
+                All the locks between the jobs of the artifact.
+
+        Returns:
+            JobGraph:
+                The new graph.
+        """
+        graph = JobGraph(artifact_id)
+        graph.add(jobs, locks)
+
+        self.graphs[artifact_id] = graph
+
+        LOGGER.debug(f"artifact={artifact_id}: graph built with {len(jobs)} job(s) and {len(locks)} lock(s)")
+
+        return graph
+
+    def remove(self, artifact_id: str) -> None:
+        self.graphs.pop(artifact_id, None)
+
+    def clear(self) -> None:
+        self.graphs.clear()
+
+
+job_graphs = JobGraphRegistry()
@@ -2,7 +2,7 @@ from typing import Sequence
 from ferdelance.config.config import Configuration, config_manager
 from ferdelance.const import TYPE_CLIENT
 from ferdelance.core.artifacts import Artifact, ArtifactStatus
-from ferdelance.core.interfaces import SchedulerContext, SchedulerJob
+from ferdelance.core.interfaces import Iterate, SchedulerContext, SchedulerJob
 from ferdelance.core.metrics import Metrics
 from ferdelance.database.repositories import (
     AsyncSession,
@@ -16,6 +16,9 @@ from ferdelance.database.repositories import (
 )
 from ferdelance.logging import get_logger
 from ferdelance.node.services import ActionService
+from ferdelance.node.services.graph import JobGraph, job_graphs
+from ferdelance.node.services.scheduling import get_scheduling_policy
+from ferdelance.schemas.client import ClientUpdate
 from ferdelance.schemas.components import Component
 from ferdelance.schemas.database import ServerArtifact, Resource
 from ferdelance.schemas.jobs import Job
@@ -24,7 +27,6 @@ from ferdelance.shared.status import JobStatus, ArtifactJobStatus
 from ferdelance.tasks.tasks import Task, TaskError, TaskNode, TaskResource
 
 from sqlalchemy.exc import NoResultFound
-from uuid import uuid4
 
 import aiofiles
 import aiofiles.ospath
@@ -53,19 +55,25 @@ class JobManagementService(Repository):
 
         self.config: Configuration = config_manager.get()
 
-    async def update(self, component: Component) -> UpdateData:
+    async def update(self, component: Component, content: ClientUpdate | None = None) -> UpdateData:
         """This method is used to get an update for a client. Such update consists in the next action to execute and
         the parameters required to execute it. After this call, a client can request a task.
 
         Args:
             component (Component):
                 The client component requesting an update.
+            content (ClientUpdate | None, optional):
+                The update request sent by the client. When it reports the number of jobs the client can run at the
+                same time, no new job is dispatched while the client is running that many jobs.
+                Defaults to None.
 
         Returns:
             UpdateData:
                 Container object with the next action to execute.
         """
-        next_action = await self.ax.next(component)
+        max_jobs = None if content is None else content.max_jobs
+
+        next_action = await self.ax.next(component, max_jobs)
 
         LOGGER.debug(f"component={component.id}: update action={next_action.action}")
 
@@ -105,15 +113,24 @@ class JobManagementService(Repository):
         except ValueError as e:
             raise e
 
-    async def schedule_tasks(self, artifact: Artifact) -> None:
-        """Schedules all the jobs for the given artifact in the current iteration.
+    async def scheduler_context(self, artifact: Artifact, iteration: int = 0, current_id: int = 0) -> SchedulerContext:
+        """Creates the context used to plan the jobs of an artifact, with all
+        the workers that have data for the project of the artifact.
 
         Args:
             artifact (Artifact):
-                Artifact to schedule jobs for.
-        """
-        LOGGER.info(f"artifact={artifact.id}: collecting jobs to be scheduled")
+                Artifact to plan jobs for.
+            iteration (int, optional):
+                First iteration to plan.
+                Defaults to 0.
+            current_id (int, optional):
+                First step id to assign to the planned jobs.
+                Defaults to 0.
 
+        Returns:
+            SchedulerContext:
+                The context for the planning.
+        """
         project = await self.pr.get_by_id(artifact.project_id)
         datasources_ids = await self.pr.list_datasources_ids(project.token)
 
@@ -124,72 +141,141 @@ class JobManagementService(Repository):
 
         LOGGER.info(f"artifact={artifact.id}: creating jobs with {len(workers)} worker(s)")
 
-        context = SchedulerContext(
+        return SchedulerContext(
             artifact_id=artifact.id,
             initiator=self.self_component,
             workers=workers,
+            iteration=iteration,
+            current_id=current_id,
+            lazy=self.config.node.lazy_iterations,
         )
 
+    async def schedule_tasks(self, artifact: Artifact) -> None:
+        """Schedules all the jobs for the given artifact in the current iteration.
+
+        Args:
+            artifact (Artifact):
+                Artifact to schedule jobs for.
+        """
+        LOGGER.info(f"artifact={artifact.id}: collecting jobs to be scheduled")
+
+        context = await self.scheduler_context(artifact)
+
         jobs: Sequence[SchedulerJob] = artifact.jobs(context)
 
         LOGGER.info(f"artifact={artifact.id}: planned to schedule {len(jobs)} job(s)")
 
-        job_map: dict[int, Job] = dict()
+        # insert jobs, resources, and locks in database
+        await self.jr.create_jobs(artifact.id, jobs)
 
-        # insert jobs in database
-        for job in jobs:
-            job_id = str(uuid4())
+        # the graph will be rebuilt with the new jobs at the next check
+        job_graphs.remove(artifact.id)
 
-            resource = await self.rr.create_resource(
-                job_id,
-                artifact.id,
-                job.worker.id,
-                job.iteration,
-            )
+    async def schedule_next_iteration(self, artifact_id: str) -> bool:
+        """When iterations are planned lazily, creates the jobs of the next
+        iteration of the artifact. The new jobs are preceded by the last job of
+        the previous iteration, as they would be if planned upfront.
 
-            job_db = await self.jr.create_job(
-                artifact.id,
-                job,
-                resource.id,
-                job_id=job_id,
-            )
-            job_map[job.id] = job_db
+        Args:
+            artifact_id (str):
+                Id of the artifact whose current iteration has completed.
 
-        # insert locks in database
-        for job in jobs:
-            job_db = job_map[job.id]
-            unlocks = [job_map[i] for i in job.locks]
+        Returns:
+            bool:
+                True if new jobs have been created, False if there are no more
+                iterations to plan.
+        """
+        if not self.config.node.lazy_iterations:
+            return False
 
-            await self.jr.add_locks(job_db, unlocks)
+        artifact = await self.ar.load(artifact_id)
 
-    async def next_task_for_component(self, component_id: str) -> str | None:
-        jobs = await self.jr.list_scheduled_jobs_for_component(component_id)
+        iterates = [step for step in artifact.steps if isinstance(step, Iterate)]
+
+        if not iterates:
+            return False
+
+        last_job, last_step_id = await self.jr.get_last_job(artifact_id)
+
+        it = last_job.iteration + 1
+
+        if it >= iterates[-1].iterations:
+            return False
+
+        context = await self.scheduler_context(artifact, it, last_step_id + 1)
+
+        jobs: Sequence[SchedulerJob] = iterates[-1].jobs(context)
+
+        LOGGER.info(f"artifact={artifact_id}: planned to schedule {len(jobs)} job(s) for iteration={it}")
+
+        await self.jr.create_jobs(artifact_id, jobs, predecessors=[last_job.id])
 
-        LOGGER.info(f"component={self.self_component.id}: found {len(jobs)} job(s) for component={component_id}")
+        job_graphs.remove(artifact_id)
 
-        if len(jobs) < 1:
+        return True
+
+    async def next_task_for_component(self, component_id: str) -> str | None:
+        try:
+            job = await get_scheduling_policy().next_job(self.jr, component_id)
+
+        except NoResultFound:
+            LOGGER.info(f"component={self.self_component.id}: no jobs for component={component_id}")
             return None
 
-        return jobs[0].id
+        return job.id
 
     async def get_scheduled_jobs(self, artifact_id: str) -> list[Job]:
         return await self.jr.list_jobs_by_artifact_id(artifact_id)
 
+    async def graph(self, artifact_id: str) -> JobGraph:
+        """Returns the in-memory graph of the jobs of an artifact. If the graph
+        is not available (i.e. after a restart), it is rebuilt from the jobs and
+        the locks stored in the database. Completed jobs and released locks do
+        not change the graph, so only the pending ones are loaded.
+
+        Args:
+            artifact_id (str):
+                Id of the artifact.
+
+        Returns:
+            JobGraph:
+                The graph of the jobs of the artifact.
+        """
+        graph = job_graphs.get(artifact_id)
+
+        if graph is None:
+            jobs = await self.jr.list_pending_jobs_by_artifact_id(artifact_id)
+            locks = await self.jr.list_locks_by_artifact_id(artifact_id, only_locked=True)
+
+            graph = job_graphs.create(artifact_id, jobs, locks)
+
+        return graph
+
     async def check(self, artifact_id: str) -> None:
         LOGGER.info(f"component={self.self_component.id}: checking changes for artifact={artifact_id}")
 
-        jobs_ready = await self.jr.list_unlocked_jobs_by_artifact_id(artifact_id)
+        graph = await self.graph(artifact_id)
+
+        if graph.remaining == 0 and await self.schedule_next_iteration(artifact_id):
+            graph = await self.graph(artifact_id)
 
         artifact = await self.ar.get_artifact(artifact_id)
         it = artifact.iteration
 
         jobs_to_start = 0
 
-        for job in jobs_ready:
-            if job.status == JobStatus.WAITING:
-                it = job.iteration
-                await self.jr.schedule_job(job)
-                jobs_to_start += 1
+        for job in graph.pop_ready():
+            it = job.iteration
+
+            try:
+                job = await self.jr.schedule_job(job)
+            except ValueError as e:
+                # the database changed under the graph: drop it and rebuild it next time
+                job_graphs.remove(artifact_id)
+                raise e
+
+            graph.update(job)
+            jobs_to_start += 1
 
         if jobs_to_start > 0:
             await self.ar.update_status(artifact_id, ArtifactJobStatus.RUNNING, it)
@@ -198,17 +284,9 @@ class JobManagementService(Repository):
                 f"to status={ArtifactJobStatus.RUNNING} it={it} with {jobs_to_start} job(s) to start"
             )
 
-        jobs_ready = await self.jr.list_jobs_by_artifact_id(artifact_id)
-
-        all_jobs_completed = True
-
-        for job in jobs_ready:
-            if job.status != JobStatus.COMPLETED:
-                all_jobs_completed = False
-                break
-
-        if all_jobs_completed:
+        if graph.remaining == 0:
             await self.ar.update_status(artifact_id, ArtifactJobStatus.COMPLETED, it)
+            job_graphs.remove(artifact_id)
             LOGGER.info(
                 f"component={self.self_component.id}: updated artifact={artifact_id} to status={ArtifactJobStatus.COMPLETED} it={it}"
             )
@@ -216,38 +294,41 @@ class JobManagementService(Repository):
         LOGGER.info(f"component={self.self_component.id}: checking done for artifact={artifact_id}")
 
     async def get_task_by_job_id(self, job_id: str) -> Task:
+        """Assembles the task to execute for the given job. The previous jobs,
+        with their resources and workers, and the next jobs, with their workers,
+        are fetched with one joined query each, so the number of queries does not
+        depend on the fan-in or fan-out of the job.
+
+        Args:
+            job_id (str):
+                Id of the job to get the task for.
+
+        Raises:
+            NoResultFound:
+                If the job does not exists.
+
+        Returns:
+            Task:
+                The task to be executed by the worker of the job.
+        """
         LOGGER.info(f"component={self.self_component.id}: getting task for job={job_id}")
 
         # TODO: add checks if who is downloading the job is allowed to do so
-        # FIXME: this is bad written: multiple queries can be aggregate together
 
-        job = await self.jr.get_by_id(job_id)
+        job, resource, worker = await self.jr.get_with_resource(job_id)
         artifact_id: str = job.artifact_id
-        it = job.iteration
 
-        worker = await self.cr.get_by_id(job.component_id)
-
-        scheduler_job = await self.jr.load(job)
+        step = await self.jr.load_step(job)
         artifact = await self.ar.load(artifact_id)
 
-        art_db = await self.ar.get_status(artifact_id)
-        if art_db == ArtifactJobStatus.SCHEDULED:
-            await self.ar.update_status(artifact_id, ArtifactJobStatus.RUNNING, it)
-            LOGGER.info(
-                f"component={self.self_component.id}: updated artifact={artifact_id} "
-                f"to status={ArtifactJobStatus.RUNNING} it={it}"
-            )
-
         project = await self.pr.get_by_id(artifact.project_id)
 
         # collect required resources
-        prev_jobs = await self.jr.list_previous_jobs(job.id)
+        prev_jobs = await self.jr.list_previous_jobs_with_resources(job.id)
 
         task_resources = []
 
-        for p_job in prev_jobs:
-            r = await self.rr.get_by_job_id(p_job.id)
-
+        for p_job, r, c in prev_jobs:
             if worker.id == self.self_component.id:
                 # job for scheduler
                 available_locally = True
@@ -266,8 +347,6 @@ class JobManagementService(Repository):
 
             else:
                 # job for nodes
-                c = await self.cr.get_by_id(p_job.component_id)
-
                 # TODO: This depends if resources need to be collected or not...
                 available_locally = True
                 component_id = c.id
@@ -293,12 +372,11 @@ class JobManagementService(Repository):
             )
 
         # collect next resources
-        next_jobs = await self.jr.list_next_jobs(job.id)
+        next_jobs = await self.jr.list_next_jobs_with_components(job.id)
 
         next_nodes = []
 
-        for n_job in next_jobs:
-            c = await self.cr.get_by_id(n_job.component_id)
+        for _, c in next_jobs:
             next_nodes.append(
                 TaskNode(
                     # target_data
@@ -310,22 +388,19 @@ class JobManagementService(Repository):
                 )
             )
 
-        # resource id produced
-        resource = await self.rr.get_by_job_id(job.id)
-
         # task to execute
         task = Task(
             project_token=project.token,
             artifact_id=artifact.id,
             job_id=job.id,
             iteration=job.iteration,
-            step=scheduler_job.step,
+            step=step,
             required_resources=task_resources,
             next_nodes=next_nodes,
             produced_resource_id=resource.id,
         )
 
-        await self.task_started(job_id)
+        await self.start(job)
 
         return task
 
@@ -335,20 +410,37 @@ class JobManagementService(Repository):
         try:
             job = await self.jr.get_by_id(job_id)
 
-            if job.status != JobStatus.SCHEDULED:
-                LOGGER.warning(
-                    f"component={self.self_component.id}: job={job_id} in status={job.status} "
-                    f"while expected status={JobStatus.SCHEDULED}"
-                )
-                return
+        except NoResultFound:
+            raise ValueError(f"component={self.self_component.id}: job={job_id} does not exists")
+
+        await self.start(job)
+
+    async def start(self, job: Job) -> None:
+        """Moves a scheduled job, and its artifact, to the running state.
+
+        Args:
+            job (Job):
+                Handler of the job that is starting.
 
+        Raises:
+            ValueError:
+                If the job could not be started.
+        """
+        if job.status != JobStatus.SCHEDULED:
+            LOGGER.warning(
+                f"component={self.self_component.id}: job={job.id} in status={job.status} "
+                f"while expected status={JobStatus.SCHEDULED}"
+            )
+            return
+
+        try:
             job = await self.jr.start_execution(job)
 
-            await self.ar.update_status(job.artifact_id, ArtifactJobStatus.RUNNING)
+            await self.ar.update_status(job.artifact_id, ArtifactJobStatus.RUNNING, job.iteration)
 
         except Exception as e:
             LOGGER.exception(e)
-            raise ValueError(f"component={self.self_component.id}: job={job_id} does not exists")
+            raise ValueError(f"component={self.self_component.id}: job={job.id} does not exists")
 
     async def task_completed(self, job_id: str) -> None:
         LOGGER.info(f"job={job_id}: task completed")
@@ -360,6 +452,15 @@ class JobManagementService(Repository):
             await self.rr.mark_as_done(job.id)
             await self.jr.unlock_job(job)
 
+            graph = job_graphs.get(job.artifact_id)
+
+            if graph is not None and job.id in graph.jobs:
+                graph.update(job)
+                graph.complete(job.id)
+            else:
+                # stale graph: it will be rebuilt at the next check
+                job_graphs.remove(job.artifact_id)
+
         except NoResultFound:
             raise ValueError(f"component={self.self_component.id}: job={job_id} does not exists")
 
@@ -379,6 +480,7 @@ class JobManagementService(Repository):
             # mark artifact as error
             LOGGER.error(f"job={error.job_id}: aggregation failed for artifact={job.artifact_id}")
             await self.ar.update_status(job.artifact_id, ArtifactJobStatus.ERROR)
+            job_graphs.remove(job.artifact_id)
 
             async with aiofiles.open(resource.path, "w") as out_file:
                 content = json.dumps(error.model_dump(), indent=True)
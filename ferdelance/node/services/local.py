@@ -0,0 +1,138 @@
+from typing import Any, Awaitable, Callable, TypeVar
+
+from ferdelance.core.metrics import Metrics
+from ferdelance.database import AsyncSession, DataBase
+from ferdelance.logging import get_logger
+from ferdelance.node.services.jobs import JobManagementService
+from ferdelance.node.services.resource import ResourceManagementService
+from ferdelance.schemas.components import Component
+from ferdelance.schemas.resources import ResourceIdentifier
+from ferdelance.tasks.services.routes import RouteService
+from ferdelance.tasks.tasks import Task
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import asyncio
+import os
+import shutil
+
+LOGGER = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class LocalRouteService(RouteService):
+    """A RouteService for tasks executed on the same node of the scheduler.
+
+    When the route points to the node itself, the requests are served by calling
+    the node services directly on the node's database, skipping the signing,
+    encryption, and serialization of the payloads. Routes to other nodes are
+    managed as in the RouteService.
+
+    The completion or the failure of a job is always notified through the node's
+    API, since it has to be serialized with the events coming from the other nodes
+    by the dispatcher of the node, that also keeps the job graphs of the node.
+    """
+
+    def __init__(
+        self,
+        component_id: str,
+        private_key: str,
+        self_component: Component,
+    ) -> None:
+        """
+        Args:
+            component_id (str):
+                Identifier of the component running the task.
+            private_key (str):
+                Private key in string format for the component running the task.
+            self_component (Component):
+                The component of the node running the task.
+        """
+        super().__init__(component_id, private_key)
+
+        self.private_key: str = private_key
+        self.self_component: Component = self_component
+        self.is_local: bool = False
+
+    def __reduce__(self):
+        # keys are not serializable: the service is rebuilt when sent to a worker
+        return (self.__class__, (self.component_id, self.private_key, self.self_component))
+
+    def change_route(
+        self,
+        target_id: str,
+        target_public_key: str,
+        remote_url: str,
+        remote_public_key: str | None = None,
+    ) -> None:
+        super().change_route(target_id, target_public_key, remote_url, remote_public_key)
+
+        # a proxy is never needed to reach ourselves
+        self.is_local = target_id == self.component_id and remote_public_key is None
+
+    def _run(self, call: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        async def wrapper() -> T:
+            # each call runs in a new event loop: pooled connections cannot be reused
+            async with DataBase().session_unpooled() as session:
+                return await call(session)
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(wrapper())
+
+        # an event loop is already running in this thread (i.e. inside the node itself)
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, wrapper()).result()
+
+    def get_task_data(self, artifact_id: str, job_id: str) -> Task:
+        if not self.is_local:
+            return super().get_task_data(artifact_id, job_id)
+
+        LOGGER.info(f"JOB job={job_id}: getting task data locally")
+
+        return self._run(lambda session: JobManagementService(session, self.self_component).get_task_by_job_id(job_id))
+
+    def post_resource(
+        self,
+        artifact_id: str,
+        job_id: str,
+        resource_id: str,
+        path_in: Path | None = None,
+        content: Any = None,
+    ) -> ResourceIdentifier:
+        if not self.is_local:
+            return super().post_resource(artifact_id, job_id, resource_id, path_in, content)
+
+        LOGGER.info(f"JOB job={job_id}: storing resource locally")
+
+        resource = self._run(
+            lambda session: ResourceManagementService(session).store_resource(job_id, self.component_id)
+        )
+
+        if path_in is not None and Path(path_in).resolve() != Path(resource.path).resolve():
+            shutil.copy(path_in, resource.path)
+
+        elif content is not None:
+            with open(resource.path, "wb") as f:
+                f.write(content if isinstance(content, bytes) else str(content).encode(self.exc.encoding))
+
+        if not os.path.exists(resource.path):
+            raise ValueError(f"Expected resource file at path={resource.path} not found")
+
+        LOGGER.info(f"JOB job={job_id}: resource={resource_id} stored locally")
+
+        return ResourceIdentifier(
+            producer_id=self.component_id,
+            resource_id=resource.id,
+        )
+
+    def post_metrics(self, job_id: str, metrics: Metrics) -> None:
+        if not self.is_local:
+            return super().post_metrics(job_id, metrics)
+
+        LOGGER.info(f"JOB job={job_id}: storing metrics locally")
+
+        self._run(lambda session: JobManagementService(session, self.self_component).metrics(metrics))
@@ -5,6 +5,8 @@ from ferdelance.schemas.resources import ResourceIdentifier
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import NoResultFound
 
+from pathlib import Path
+
 
 class ResourceManagementService(Repository):
     def __init__(self, session: AsyncSession) -> None:
@@ -46,5 +48,12 @@ class ResourceManagementService(Repository):
 
         raise NoResultFound()
 
-    async def set_encrypted_for(self, resource: Resource, component_id: str) -> Resource:
-        return await self.rr.set_encrypted_for(resource.id, component_id)
+    def relayed_path(self, resource: Resource, component_id: str) -> Path:
+        """Path of the copy of a resource relayed to the given component. A relayed
+        copy is encrypted by the producer for its target, so each target of the
+        resource has its own copy."""
+        return resource.path.with_name(f"{resource.path.stem}.{component_id}{resource.path.suffix}")
+
+    def is_relayed(self, resource: Resource) -> bool:
+        """True when the resource has been relayed to at least one target."""
+        return any(resource.path.parent.glob(f"{resource.path.stem}.*{resource.path.suffix}"))
@@ -0,0 +1,118 @@
+from ferdelance.config import config_manager
+from ferdelance.database.repositories import JobRepository
+from ferdelance.logging import get_logger
+from ferdelance.schemas.jobs import Job
+
+from sqlalchemy.exc import NoResultFound
+
+LOGGER = get_logger(__name__)
+
+
+class SchedulingPolicy:
+    """Decides which one of the scheduled jobs of a worker is executed next."""
+
+    async def next_job(self, jr: JobRepository, component_id: str) -> Job:
+        """Selects the next job for a worker.
+
+        Args:
+            jr (JobRepository):
+                Repository used to query the jobs.
+            component_id (str):
+                Id of the worker asking for a job.
+
+        Raises:
+            NoResultFound:
+                If there are no scheduled jobs for the worker.
+
+        Returns:
+            Job:
+                The job to execute.
+        """
+        raise NotImplementedError()
+
+
+class FIFOPolicy(SchedulingPolicy):
+    """The oldest scheduled job is executed first."""
+
+    async def next_job(self, jr: JobRepository, component_id: str) -> Job:
+        return await jr.next_job_for_component(component_id)
+
+
+class PriorityPolicy(SchedulingPolicy):
+    """Jobs of the artifacts with higher priority are executed first, the oldest
+    first between jobs with the same priority."""
+
+    async def next_job(self, jr: JobRepository, component_id: str) -> Job:
+        return await jr.next_job_for_component_by_priority(component_id)
+
+
+class FairSharePolicy(SchedulingPolicy):
+    """Weighted fair share between projects.
+
+    The worker receives a job of the project with waiting jobs that used the
+    least share of the node, relative to its weight. The usage of a project is
+    the number of its jobs running or started in the recent time window. Inside
+    a project, jobs are selected by priority.
+
+    Shares are per project only: artifacts do not record the user that
+    submitted them, so users of the same project share its weight.
+    """
+
+    def __init__(self, weights: dict[str, float], window: float) -> None:
+        """
+        Args:
+            weights (dict[str, float]):
+                Weight of each project, by token. Projects not listed have weight 1.
+            window (float):
+                Seconds of past activity to consider.
+        """
+        self.weights: dict[str, float] = weights
+        self.window: float = window
+
+    def weight(self, token: str | None) -> float:
+        if token is None:
+            return 1.0
+        return max(self.weights.get(token, 1.0), 1e-6)
+
+    async def next_job(self, jr: JobRepository, component_id: str) -> Job:
+        waiting = await jr.list_projects_waiting_component(component_id)
+
+        if not waiting:
+            raise NoResultFound()
+
+        usage = await jr.count_started_jobs_by_project(self.window)
+
+        project_id = min(
+            waiting.keys(),
+            key=lambda p: (usage.get(p, 0) / self.weight(waiting[p][0]), waiting[p][1]),
+        )
+
+        LOGGER.debug(f"component={component_id}: fair share selected project={project_id}")
+
+        return await jr.next_job_for_component_by_priority(component_id, by_project=True, project_id=project_id)
+
+
+def get_scheduling_policy() -> SchedulingPolicy:
+    """Creates the scheduling policy set in the configuration of the node.
+
+    Raises:
+        ValueError:
+            If the policy is not supported.
+
+    Returns:
+        SchedulingPolicy:
+            The policy to use.
+    """
+    node = config_manager.get().node
+    policy = node.scheduling_policy.lower()
+
+    if policy == "fifo":
+        return FIFOPolicy()
+
+    if policy == "priority":
+        return PriorityPolicy()
+
+    if policy == "fair":
+        return FairSharePolicy(node.scheduling_weights, node.scheduling_window)
+
+    raise ValueError(f"scheduling policy {policy} is not supported")
@@ -11,6 +11,7 @@ from ferdelance.database.repositories import (
 )
 from ferdelance.logging import get_logger
 from ferdelance.node.services.jobs import JobManagementService
+from ferdelance.node.services.local import LocalRouteService
 from ferdelance.schemas.components import Component
 from ferdelance.security.exchange import Exchange
 from ferdelance.shared.status import ArtifactJobStatus, JobStatus
@@ -118,6 +119,12 @@ class TaskManagementService(Repository):
         """
         LOGGER.info(f"component={self.self_component.id}: job={job_id} will start in local")
 
+        route_service: LocalRouteService | None = None
+
+        if not self.config.database.memory:
+            # an in-memory database is not shared with the workers: they need to use the API
+            route_service = LocalRouteService(component_id, private_key, self.self_component)
+
         get_jobs_backend().start_exec(
             artifact_id,
             job_id,
@@ -127,6 +134,7 @@ class TaskManagementService(Repository):
             self.config.url_localhost(),
             public_key,
             self.local_datasources,
+            route_service,
         )
 
     async def start_task(self, task: Task, scheduler_id: str) -> None:
@@ -169,10 +177,11 @@ class TaskManagementService(Repository):
 
         headers, payload = exc.create(task.model_dump_json())
 
-        res = httpx.post(
-            f"{remote.url.rstrip('/')}/task/",
-            headers=headers,
-            content=payload,
-        )
+        async with httpx.AsyncClient() as client:
+            res = await client.post(
+                f"{remote.url.rstrip('/')}/task/",
+                headers=headers,
+                content=payload,
+            )
 
         res.raise_for_status()
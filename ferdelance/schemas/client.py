@@ -9,3 +9,7 @@ class ClientDetails(BaseModel):
 
 class ClientUpdate(BaseModel):
     action: str
+
+    # compute budget of the client, used to size the jobs dispatched to it
+    cpus: int | None = None
+    max_jobs: int | None = None
@@ -10,6 +10,7 @@ from ferdelance.core.queries import (
 from hashlib import sha256
 from pydantic import BaseModel
 
+import numpy as np
 import pandas as pd
 
 
@@ -30,6 +31,21 @@ class DataType(Enum):
     STRING = auto()
 
 
+def is_numeric(dtype: str | None) -> bool:
+    """True for the NUMERIC data type and for the names of numeric numpy types, as
+    reported by the clients in the metadata."""
+    if dtype is None:
+        return False
+
+    if dtype == DataType.NUMERIC.name:
+        return True
+
+    try:
+        return np.dtype(dtype).kind in "iuf"
+    except TypeError:
+        return False
+
+
 class BaseFeature(BaseModel):
     name: str
 
@@ -46,6 +62,9 @@ class BaseFeature(BaseModel):
 
     n_cats: int | None = None
 
+    # number of values of numeric features, used to weight their statistics
+    n_values: int | None = None
+
 
 class Feature(BaseFeature):
     """Common information to all features."""
@@ -80,35 +99,89 @@ class Feature(BaseFeature):
 class AggregatedFeature(Feature):
     n_datasources: int = 1
 
-    # TODO: aggregated features should have distributions, not punctual values!
-
     @staticmethod
     def aggregate(features: list[Feature]) -> AggregatedFeature:
+        """Combines the descriptions of the same feature in multiple datasources.
+
+        Min and max are the global ones. When all the numeric features report
+        their number of values, mean and standard deviation are pooled exactly,
+        while the quartiles are averaged weighting each datasource by its number
+        of values: this is only an approximation of the global quartiles, which
+        cannot be computed from the summaries alone. Otherwise, all the values
+        are averaged.
+
+        Args:
+            features (list[Feature]):
+                Descriptions of the same feature, one for each datasource.
+
+        Returns:
+            AggregatedFeature:
+                The description of the feature across all the datasources.
+        """
         name = features[0].name
         dtype = features[0].dtype
 
         df = pd.DataFrame([f.model_dump() for f in features])
 
-        if dtype == DataType.NUMERIC.name:
+        if not is_numeric(dtype):
+            return AggregatedFeature(
+                name=name,
+                dtype=dtype,
+                n_datasources=len(features),
+                v_miss=df["v_miss"].mean(),
+            )
+
+        if any(f.n_values is None for f in features):
             return AggregatedFeature(
                 name=name,
                 dtype=dtype,
                 n_datasources=len(features),
                 v_mean=df["v_mean"].mean(),
                 v_std=df["v_std"].mean(),
-                v_min=df["v_min"].mean(),
+                v_min=df["v_min"].min(),
                 v_p25=df["v_p25"].mean(),
                 v_p50=df["v_p50"].mean(),
                 v_p75=df["v_p75"].mean(),
-                v_max=df["v_max"].mean(),
+                v_max=df["v_max"].max(),
                 v_miss=df["v_miss"].mean(),
             )
 
+        n = df["n_values"].to_numpy(dtype=np.float64)
+        means = df["v_mean"].to_numpy(dtype=np.float64, na_value=np.nan)
+        stds = df["v_std"].to_numpy(dtype=np.float64, na_value=np.nan)
+
+        # datasources without values have no statistics
+        valid = n > 0
+        n, means, stds = n[valid], means[valid], np.nan_to_num(stds[valid])
+
+        mean = std = None
+        quartiles: dict[str, float | None] = {q: None for q in ("v_p25", "v_p50", "v_p75")}
+
+        if n.sum() > 0:
+            mean = float(np.average(means, weights=n))
+
+            for q in quartiles:
+                values = df[q].to_numpy(dtype=np.float64, na_value=np.nan)[valid]
+                known = ~np.isnan(values)
+
+                if known.any():
+                    quartiles[q] = float(np.average(values[known], weights=n[known]))
+
+        if n.sum() > 1:
+            ss = ((n - 1) * stds**2 + n * (means - mean) ** 2).sum()
+            std = float(np.sqrt(ss / (n.sum() - 1)))
+
         return AggregatedFeature(
             name=name,
             dtype=dtype,
             n_datasources=len(features),
+            v_mean=mean,
+            v_std=std,
+            v_min=df["v_min"].min(),
+            v_max=df["v_max"].max(),
             v_miss=df["v_miss"].mean(),
+            n_values=int(n.sum()),
+            **quartiles,
         )
 
 
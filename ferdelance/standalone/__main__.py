@@ -1,6 +1,7 @@
 from ferdelance.config import config_manager
 from ferdelance.logging import get_logger
 from ferdelance.node.deployment import start_node, wait_node
+from ferdelance.tasks.jobs.execution import ray_options
 
 import ray
 
@@ -43,7 +44,7 @@ if __name__ == "__main__":
     # signal.signal(signal.SIGINT, handler("SIGINT"))
     # signal.signal(signal.SIGTERM, handler("SIGTERM"))
 
-    ray.init()
+    ray.init(**ray_options(config.node))
 
     c = start_node(config)
 
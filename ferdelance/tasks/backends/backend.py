@@ -1,7 +1,10 @@
 from typing import Any
 
+from ferdelance.config import config_manager
 from ferdelance.logging import get_logger
 from ferdelance.tasks.jobs import Heartbeat, Execution
+from ferdelance.tasks.jobs.execution import execution_options
+from ferdelance.tasks.services import RouteService
 
 LOGGER = get_logger(__name__)
 
@@ -31,10 +34,13 @@ class Backend:
         scheduler_url: str,
         scheduler_public_key: str,
         datasources: list[dict[str, Any]],
+        route_service: RouteService | None = None,
     ) -> None:
         LOGGER.info(f"artifact={artifact_id}: scheduling job={job_id}")
 
-        actor_handler = Execution.remote(
+        options = execution_options(config_manager.get().node)
+
+        actor_handler = Execution.options(**options).remote(  # type: ignore
             component_id,
             artifact_id,
             job_id,
@@ -43,6 +49,7 @@ class Backend:
             scheduler_public_key,
             private_key,
             datasources,
+            route_service,
         )
 
         task_handler = actor_handler.run.remote()  # type: ignore
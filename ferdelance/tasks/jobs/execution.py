@@ -1,6 +1,7 @@
 from typing import Any
 
-from ferdelance.config import config_manager
+from ferdelance.config import config_manager, NodeConfiguration
+from ferdelance.core.budget import set_cpu_budget
 from ferdelance.logging import get_logger
 from ferdelance.tasks.services import RouteService
 from ferdelance.tasks.services.execution import TaskExecutionService
@@ -9,6 +10,57 @@ import ray
 
 LOGGER = get_logger(__name__)
 
+# custom Ray resource with the CPUs of the node that can be assigned to the jobs
+JOB_CPUS = "ferdelance_job_cpus"
+
+# CPUs reserved in Ray by the replica that serves the API
+API_CPUS = 1
+
+
+def ray_options(node: NodeConfiguration) -> dict[str, Any]:
+    """Options for the initialization of Ray. Ray has the CPU budget of the node
+    for the jobs, plus the CPUs used by the API, and the budget is also registered
+    as a custom resource that only the Execution actors use."""
+    budget = node.cpu_budget()
+
+    return {
+        "num_cpus": budget + API_CPUS,
+        "resources": {JOB_CPUS: budget},
+    }
+
+
+def execution_options(node: NodeConfiguration) -> dict[str, Any]:
+    """Options for a new Execution actor. When the node has a CPU budget, the
+    actor reserves the CPUs of a job: Ray starts new actors only while the
+    budget of the node has room for them.
+
+    The budget is reserved through the custom resource only when Ray has been
+    initialized with `ray_options`: otherwise the actor would wait forever for a
+    resource that does not exist, so it reserves at most the CPUs of Ray."""
+    job_cpus = node.job_cpus()
+
+    if job_cpus is None:
+        return dict()
+
+    resources = ray.cluster_resources() if ray.is_initialized() else dict()
+
+    if JOB_CPUS in resources:
+        return {
+            "num_cpus": job_cpus,
+            "resources": {JOB_CPUS: job_cpus},
+        }
+
+    LOGGER.warning(f"Ray has no {JOB_CPUS} resource: jobs are not limited by the CPU budget of the node")
+
+    cpus = int(resources.get("CPU", 0))
+
+    if 0 < cpus < job_cpus:
+        job_cpus = cpus
+
+    return {
+        "num_cpus": job_cpus,
+    }
+
 
 @ray.remote
 class Execution:
@@ -22,6 +74,7 @@ class Execution:
         scheduler_public_key: str,
         private_key: str,
         datasources: list[dict[str, Any]],
+        route_service: RouteService | None = None,
     ) -> None:
         """Task that is capable of executing jobs.
 
@@ -44,13 +97,18 @@ class Execution:
                 The private key in string format for this node.
             datasources (list[dict[str, Any]]):
                 List of maps to available datasources. Can be obtained from node configuration.
-            scheduler_is_local (bool):
-                Set to True when we don't have to send data to a remote server.
+            route_service (RouteService | None):
+                Service to use to communicate with the other nodes. If None, a
+                RouteService that connects through the API will be used.
+                Defaults to None.
         """
-        route_service = RouteService(component_id, private_key)
+        if route_service is None:
+            route_service = RouteService(component_id, private_key)
 
         config = config_manager.get()
 
+        set_cpu_budget(config.node.job_cpus())
+
         self.task_executor = TaskExecutionService(
             route_service,
             component_id,
@@ -5,7 +5,7 @@ from ferdelance.schemas.client import ClientUpdate
 from ferdelance.schemas.updates import UpdateData
 from ferdelance.security.exchange import Exchange
 from ferdelance.shared.actions import Action
-from ferdelance.tasks.jobs.execution import Execution
+from ferdelance.tasks.jobs.execution import Execution, execution_options
 
 from pathlib import Path
 from time import sleep
@@ -93,7 +93,7 @@ class Heartbeat:
         job_id: str,
     ) -> Action:
         dsc: list[DataSourceConfiguration] = self.config.datasources
-        actor_handler = Execution.remote(
+        actor_handler = Execution.options(**execution_options(self.config.node)).remote(  # type: ignore
             self.client_id,
             artifact_id,
             job_id,
@@ -125,7 +125,13 @@ class Heartbeat:
                 try:
                     LOGGER.debug("requesting update")
 
-                    update_data = self._update(ClientUpdate(action=self.status.name))
+                    update_data = self._update(
+                        ClientUpdate(
+                            action=self.status.name,
+                            cpus=self.config.node.cpu_budget(),
+                            max_jobs=self.config.node.max_jobs(),
+                        )
+                    )
 
                     action = Action[update_data.action]
 
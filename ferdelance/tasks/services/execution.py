@@ -3,10 +3,13 @@ from typing import Any
 from ferdelance.commons import storage_job
 from ferdelance.config import DataSourceConfiguration, DataSourceStorage
 from ferdelance.core import Environment
+from ferdelance.core.containers import SUFFIX
+from ferdelance.datasources import DataSource
 from ferdelance.logging import get_logger
 from ferdelance.tasks.services.routes import RouteService
 from ferdelance.tasks.tasks import Task, TaskError
 
+from itertools import chain
 from pathlib import Path
 
 import json
@@ -28,7 +31,7 @@ def load_environment(data: DataSourceStorage | None, task: Task, work_directory:
     # resource is available and use it.
     # PRO TIP: load on demand from disk what is needed when it is needed!
 
-    dfs: list[pd.DataFrame] = []
+    datasources: list[DataSource] = []
 
     LOGGER.debug(f"artifact={task.artifact_id}: number of datasources={len(data)}")
 
@@ -45,12 +48,22 @@ def load_environment(data: DataSourceStorage | None, task: Task, work_directory:
 
         LOGGER.info(f"artifact={task.artifact_id}: considering datasource_hash={hs}")
 
-        datasource: pd.DataFrame = ds.get()  # TODO: implemented only for files!
+        datasources.append(ds)
 
-        dfs.append(datasource)
+    if not datasources:
+        return env
+
+    env.datasources = datasources
+
+    if any(ds.is_chunked() for ds in datasources):
+        # out-of-core mode: data will be read in batches only when an operation iterates over them
+        LOGGER.info(f"artifact={task.artifact_id}: reading datasources in batches")
+
+        env.batch_loader = lambda: chain.from_iterable(ds.batches() for ds in datasources)
 
-    if dfs:
-        env.df = pd.concat(dfs)
+    else:
+        # data are loaded only if an operation access them
+        env.df_loader = lambda: pd.concat([ds.get() for ds in datasources])
 
     return env
 
@@ -191,7 +204,7 @@ class TaskExecutionService:
 
                     res_path = (
                         storage_job(artifact_id, job_id, resource.iteration, self.work_directory)
-                        / f"{resource.resource_id}.pkl"
+                        / f"{resource.resource_id}{SUFFIX}"
                     )
 
                     self.resource(
@@ -245,7 +258,8 @@ class TaskExecutionService:
                     remote_url = next_node.target_url
                     remote_key = None
 
-                path = None if is_local else env.product_path()
+                # a client cannot reach itself: what it sends to itself is relayed by the scheduler too
+                path = None if is_local and not next_node.use_scheduler_as_proxy else env.product_path()
 
                 self.product(
                     next_node.target_id,
@@ -1,6 +1,7 @@
 from typing import Any, Sequence
 
 from ferdelance import __version__
+from ferdelance.core import containers
 from ferdelance.core.interfaces import Step
 from ferdelance.logging import get_logger
 from ferdelance.schemas.node import NodePublicKey
@@ -31,7 +32,6 @@ from uuid import uuid4
 import httpx
 import json
 import os
-import pickle
 import time
 
 LOGGER = get_logger(__name__)
@@ -415,7 +415,10 @@ class Context:
 
             data, _ = self.exc.stream_response(res.iter_bytes())
 
-            obj = pickle.loads(data)
+            obj = containers.loads(data)
+
+            if isinstance(obj, containers.ResourceContainer):
+                obj = obj.to_dict()
 
             return obj
 
@@ -442,6 +445,9 @@ class Context:
 
             data, _ = self.exc.stream_response(res.iter_bytes())
 
-            obj = pickle.loads(data)
+            obj = containers.loads(data)
+
+            if isinstance(obj, containers.ResourceContainer):
+                obj = obj.to_dict()
 
             return obj
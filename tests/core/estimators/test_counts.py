@@ -1,14 +1,16 @@
 from ferdelance.core.artifacts import Artifact
 from ferdelance.core.environment import EnvResource, Environment
 from ferdelance.core.estimators import CountEstimator
+from ferdelance.core.queries import Query, QueryFeature, QueryStage
+from ferdelance.datasources import DataSourceFile
 
 from pathlib import Path
 
 import pandas as pd
 import os
 
-from ferdelance.core.steps import Sequential
-from tests.utils import get_scheduler_context
+from ferdelance.core.steps import SecureParallel, Sequential
+from tests.utils import execute_jobs, get_scheduler_context
 
 PATH_DIR = Path(os.path.abspath(os.path.dirname(__file__)))
 PATH_CALIFORNIA = PATH_DIR / ".." / "data" / "california.csv"
@@ -107,3 +109,75 @@ def test_count_estimator_in_simulated_env():
     df_counts = data.shape[0]
 
     assert fed_counts == df_counts
+
+
+def test_count_estimator_with_batches():
+    data = pd.read_csv(PATH_CALIFORNIA)
+
+    ds = DataSourceFile("california", "csv", PATH_CALIFORNIA, batch_size=5000)
+
+    q = Query(stages=[QueryStage(features=[QueryFeature("HouseAge", "float")])])
+    q = q.add(q["HouseAge"] > 20)
+
+    ce = CountEstimator(query=q)
+
+    seq = ce.get_steps()[0]
+
+    assert isinstance(seq, Sequential)
+
+    env = Environment("", "", "", Path("."))
+
+    env = seq.init_operation.exec(env)
+
+    env.batch_loader = ds.batches
+    env.resources = {"1": EnvResource("1", data=env.products)}
+
+    assert env.is_chunked()
+    assert env.df is None
+
+    env = seq.operation.exec(env)
+
+    env.batch_loader = None
+    env.resources = {"1": EnvResource("1", data=env.products)}
+
+    env = seq.final_operation.exec(env)
+
+    assert env["count"] == data[data["HouseAge"] > 20].shape[0]
+
+
+def test_count_estimator_parallel(tmp_path: Path):
+    data = pd.read_csv(PATH_CALIFORNIA)
+
+    ce = CountEstimator(parallel=True)
+
+    steps = ce.get_steps()
+
+    assert len(steps) == 1
+    assert isinstance(steps[0], SecureParallel)
+
+    artifact = Artifact(
+        id="artifact_id",
+        project_id="project_id",
+        steps=steps,
+    )
+
+    sc = get_scheduler_context(3)
+    jobs = artifact.jobs(sc)
+
+    # mask and send on each worker, sum of the masks, and unmask on initiator
+    assert len(jobs) == 3 + 3 + 1 + 1
+    assert jobs[-1].worker == sc.initiator
+
+    dfs = {
+        sc.workers[0].id: data.iloc[:7000, :],
+        sc.workers[1].id: data.iloc[7000:14000, :],
+        sc.workers[2].id: data.iloc[14000:, :],
+    }
+
+    envs = execute_jobs(list(jobs), tmp_path, dfs)
+
+    # the initiator receives only masked values
+    for job in jobs[3:6]:
+        assert envs[job.id].products["masked"]["count"] != dfs[job.worker.id].shape[0]
+
+    assert envs[jobs[-1].id]["count"] == data.shape[0]
@@ -0,0 +1,50 @@
+from ferdelance.core.artifacts import Artifact
+from ferdelance.core.estimators import CovarianceEstimator
+
+from tests.utils import execute_jobs, get_scheduler_context
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import os
+import pytest
+
+PATH_DIR = Path(os.path.abspath(os.path.dirname(__file__)))
+PATH_CALIFORNIA = PATH_DIR / ".." / "data" / "california.csv"
+
+
+@pytest.mark.parametrize("masked", [False, True])
+def test_covariance_estimator(tmp_path: Path, masked: bool):
+    data = pd.read_csv(PATH_CALIFORNIA)
+    data.loc[:100, "HouseAge"] = np.nan
+    data.loc[50:200, "AveRooms"] = np.nan
+
+    features = ["MedInc", "HouseAge", "AveRooms", "AveBedrms", "Population"]
+
+    artifact = Artifact(
+        id="artifact_id",
+        project_id="project_id",
+        # blocks smaller than the number of features
+        steps=CovarianceEstimator(features=features, block_size=2, masked=masked).get_steps(),
+    )
+
+    sc = get_scheduler_context(3)
+    jobs = artifact.jobs(sc)
+
+    dfs = {
+        sc.workers[0].id: data.iloc[:7000, :],
+        sc.workers[1].id: data.iloc[7000:14000, :],
+        sc.workers[2].id: data.iloc[14000:, :],
+    }
+
+    envs = execute_jobs(list(jobs), tmp_path, dfs)
+
+    env = envs[jobs[-1].id]
+
+    assert env["features"] == features
+
+    expected = data[features]
+
+    assert np.allclose(env["covariance"], expected.cov().to_numpy())
+    assert np.allclose(env["correlation"], expected.corr().to_numpy())
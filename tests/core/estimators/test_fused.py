@@ -0,0 +1,188 @@
+from ferdelance.core.artifacts import Artifact
+from ferdelance.core.environment import Environment
+from ferdelance.core.estimators import (
+    CountEstimator,
+    CovarianceEstimator,
+    FusedEstimator,
+    GroupCountEstimator,
+    MeanEstimator,
+    MomentsEstimator,
+)
+from ferdelance.core.estimators.counters import Count
+from ferdelance.core.estimators.moments import Moments
+from ferdelance.core.operations import Fused
+from ferdelance.core.queries import Query, QueryFeature, QueryStage
+from ferdelance.datasources import DataSourceFile
+
+from tests.utils import execute_jobs, get_scheduler_context
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import os
+import pytest
+
+PATH_DIR = Path(os.path.abspath(os.path.dirname(__file__)))
+PATH_CALIFORNIA = PATH_DIR / ".." / "data" / "california.csv"
+
+
+def split(data: pd.DataFrame, sc) -> dict[str, pd.DataFrame]:
+    return {
+        sc.workers[0].id: data.iloc[:7000, :],
+        sc.workers[1].id: data.iloc[7000:14000, :],
+        sc.workers[2].id: data.iloc[14000:, :],
+    }
+
+
+def test_fused_estimator_sequential(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    data = pd.read_csv(PATH_CALIFORNIA)
+    data["Old"] = data["HouseAge"] > 30
+
+    q = Query(stages=[QueryStage(features=[QueryFeature(c, "float") for c in data.columns])])
+    q = q.add(q["MedInc"] > 3)
+
+    fe = FusedEstimator(
+        query=q,
+        estimators={
+            "count": CountEstimator(),
+            "mean": MeanEstimator(),
+            "groups": GroupCountEstimator(by=["Old"], features=["MedInc"]),
+        },
+    )
+
+    # the artifact survives serialization
+    artifact = Artifact(
+        id="artifact_id",
+        project_id="project_id",
+        steps=fe.get_steps(),
+    )
+    artifact = Artifact.model_validate_json(artifact.model_dump_json())
+
+    sc = get_scheduler_context(3)
+    jobs = artifact.jobs(sc)
+
+    # a single chain for all the estimators
+    assert len(jobs) == 5
+
+    applied: list[int] = list()
+    apply_batch = Query.apply_batch
+
+    def counted(self, env, df):
+        applied.append(len(df))
+        return apply_batch(self, env, df)
+
+    monkeypatch.setattr(Query, "apply_batch", counted)
+
+    envs = execute_jobs(list(jobs), tmp_path, split(data, sc))
+
+    # the query is applied once on each worker
+    assert len(applied) == 3
+
+    env = envs[jobs[-1].id]
+    expected = data[data["MedInc"] > 3]
+
+    assert env["count"]["count"] == expected.shape[0]
+    assert np.allclose(env["mean"]["mean"], expected.select_dtypes(include="number").mean())
+    assert env["groups"]["counts"]["MedInc"] == expected.groupby("Old")["MedInc"].count().to_dict()
+
+
+def test_fused_estimator_parallel(tmp_path: Path):
+    data = pd.read_csv(PATH_CALIFORNIA)
+
+    features = ["MedInc", "HouseAge", "AveRooms"]
+
+    fe = FusedEstimator(
+        estimators={
+            "moments": MomentsEstimator(features=features),
+            "covariance": CovarianceEstimator(features=features),
+        },
+    )
+
+    artifact = Artifact(id="artifact_id", project_id="project_id", steps=fe.get_steps())
+
+    sc = get_scheduler_context(3)
+    jobs = artifact.jobs(sc)
+
+    assert len(jobs) == 4
+
+    envs = execute_jobs(list(jobs), tmp_path, split(data, sc))
+
+    env = envs[jobs[-1].id]
+
+    assert np.allclose(env["moments"]["mean"], data[features].mean().to_numpy())
+    assert np.allclose(env["covariance"]["covariance"], data[features].cov().to_numpy())
+
+
+def test_fused_estimator_secure_parallel(tmp_path: Path):
+    data = pd.read_csv(PATH_CALIFORNIA)
+
+    fe = FusedEstimator(
+        estimators={
+            "count": CountEstimator(parallel=True),
+            "mean": MeanEstimator(parallel=True),
+        },
+    )
+
+    artifact = Artifact(id="artifact_id", project_id="project_id", steps=fe.get_steps())
+
+    sc = get_scheduler_context(3)
+    jobs = artifact.jobs(sc)
+
+    assert len(jobs) == 3 + 3 + 1 + 1
+
+    envs = execute_jobs(list(jobs), tmp_path, split(data, sc))
+
+    env = envs[jobs[-1].id]
+
+    assert env["count"]["count"] == data.shape[0]
+    assert np.allclose(env["mean"]["mean"], data.mean())
+
+
+def test_fused_estimator_incompatible():
+    fe = FusedEstimator(
+        estimators={
+            "count": CountEstimator(),
+            "moments": MomentsEstimator(features=["MedInc"]),
+        },
+    )
+
+    with pytest.raises(ValueError):
+        fe.get_steps()
+
+    with pytest.raises(ValueError):
+        Fused(operations={".count": Count()})
+
+
+def test_fused_single_pass_on_batches(tmp_path: Path):
+    data = pd.read_csv(PATH_CALIFORNIA)
+
+    ds = DataSourceFile("california", "csv", PATH_CALIFORNIA, batch_size=5000)
+
+    reads: list[int] = list()
+
+    def batches():
+        reads.append(1)
+        yield from ds.batches()
+
+    work_dir = tmp_path / "job"
+    work_dir.mkdir()
+
+    env = Environment("", "", "product", work_dir)
+    env.batch_loader = batches
+
+    op = Fused(
+        operations={
+            "count": Count(),
+            "moments": Moments(features=["MedInc"]),
+        },
+    )
+
+    env = op.exec(env)
+
+    assert len(reads) == 1
+    assert env["count"]["count"] == data.shape[0]
+    assert env["moments"]["moments"][0, 0] == data.shape[0]
+
+    # spilled batches are removed
+    assert not (work_dir / "fused").exists()
@@ -1,6 +1,8 @@
 from ferdelance.core.environment import EnvResource, Environment
 from ferdelance.core.estimators import GroupCountEstimator, GroupMeanEstimator
-from ferdelance.core.steps import Sequential
+from ferdelance.core.steps import SecureParallel, Sequential
+
+from tests.utils import execute_jobs, get_scheduler_context
 
 from pathlib import Path
 
@@ -49,6 +51,10 @@ def test_group_count_estimator():
 
         assert env["noise"] == 0
 
+        # partial counts are exchanged as series sorted by group key
+        assert isinstance(env["counts"]["AveBedrms"], pd.Series)
+        assert env["counts"]["AveBedrms"].index.is_monotonic_increasing
+
     env.resources = {"1": EnvResource("1", data=env.products)}
 
     env = op_final.exec(env)
@@ -66,6 +72,29 @@ def test_group_count_estimator():
         assert fed_counts[k] == df_counts[k]
 
 
+def test_group_count_estimator_disjoint_groups(tmp_path: Path):
+    data = pd.read_csv(PATH_CALIFORNIA)
+
+    # each worker has different groups
+    dfs = [
+        data[data["HouseAge"] < 20],
+        data[(data["HouseAge"] >= 20) & (data["HouseAge"] < 35)],
+        data[data["HouseAge"] >= 35],
+    ]
+
+    gce = GroupCountEstimator(by=["HouseAge"], features=["AveBedrms"], random_state=42)
+
+    sc = get_scheduler_context(3)
+    jobs = gce.get_steps()[0].jobs(sc)
+
+    envs = execute_jobs(jobs, tmp_path, {w.id: df for w, df in zip(sc.workers, dfs)})
+
+    fed_counts = envs[jobs[-1].id]["counts"]["AveBedrms"]
+    df_counts = data.groupby("HouseAge").count()["AveBedrms"].to_dict()
+
+    assert fed_counts == df_counts
+
+
 def test_group_mean_estimator():
     data = pd.read_csv(PATH_CALIFORNIA)
 
@@ -121,3 +150,65 @@ def test_group_mean_estimator():
         assert abs(fed_means[k] - df_means[k]) < 1e6
 
     assert abs(sum(fed_means.values()) - sum(df_means.values())) < 1e6
+
+
+def test_group_count_estimator_with_batches():
+    data = pd.read_csv(PATH_CALIFORNIA)
+
+    gce = GroupCountEstimator(by=["HouseAge"], features=["AveBedrms"], random_state=42)
+
+    seq = gce.get_steps()[0]
+
+    assert isinstance(seq, Sequential)
+
+    env = Environment("", "", "", Path("."))
+
+    env = seq.init_operation.exec(env)
+
+    env.batch_loader = lambda: (data.iloc[i : i + 3000, :] for i in range(0, data.shape[0], 3000))
+    env.resources = {"1": EnvResource("1", data=env.products)}
+
+    env = seq.operation.exec(env)
+
+    env.batch_loader = None
+    env.resources = {"1": EnvResource("1", data=env.products)}
+
+    env = seq.final_operation.exec(env)
+
+    fed_counts = env["counts"]["AveBedrms"]
+    df_counts = data.groupby("HouseAge").count()[["AveBedrms"]].to_dict()["AveBedrms"]
+
+    assert len(fed_counts) == len(df_counts)
+
+    for k in df_counts.keys():
+        assert fed_counts[k] == df_counts[k]
+
+
+def test_group_count_estimator_parallel(tmp_path: Path):
+    # sorted data: each worker has only some of the groups
+    data = pd.read_csv(PATH_CALIFORNIA).sort_values("HouseAge")
+
+    steps = GroupCountEstimator(by=["HouseAge"], features=["AveBedrms"], parallel=True).get_steps()
+
+    assert isinstance(steps[0], SecureParallel)
+
+    sc = get_scheduler_context(3)
+    jobs = steps[0].jobs(sc)
+
+    dfs = {
+        sc.workers[0].id: data.iloc[:7000, :],
+        sc.workers[1].id: data.iloc[7000:14000, :],
+        sc.workers[2].id: data.iloc[14000:, :],
+    }
+
+    envs = execute_jobs(jobs, tmp_path, dfs)
+
+    fed_counts = envs[jobs[-1].id]["counts"]["AveBedrms"]
+    df_counts = data.groupby("HouseAge").count()[["AveBedrms"]].to_dict()["AveBedrms"]
+
+    assert isinstance(fed_counts, dict)
+    assert all(isinstance(v, int) for v in fed_counts.values())
+    assert len(fed_counts) == len(df_counts)
+
+    for k in df_counts.keys():
+        assert fed_counts[k] == df_counts[k]
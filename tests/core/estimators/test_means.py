@@ -7,8 +7,8 @@ from pathlib import Path
 import pandas as pd
 import os
 
-from ferdelance.core.steps import Sequential
-from tests.utils import get_scheduler_context
+from ferdelance.core.steps import SecureParallel, Sequential
+from tests.utils import execute_jobs, get_scheduler_context
 
 PATH_DIR = Path(os.path.abspath(os.path.dirname(__file__)))
 PATH_CALIFORNIA = PATH_DIR / ".." / "data" / "california.csv"
@@ -130,3 +130,59 @@ def test_mean_estimator_in_simulated_env():
         assert abs(fed_means_dict[k] - df_means_dict[k]) < 1e6
 
     assert abs(fed_means.sum() - df_means.sum()) < 1e6
+
+
+def test_mean_estimator_with_batches():
+    data = pd.read_csv(PATH_CALIFORNIA)
+
+    ce = MeanEstimator()
+
+    seq = ce.get_steps()[0]
+
+    assert isinstance(seq, Sequential)
+
+    env = Environment("", "", "", Path("."))
+
+    env = seq.init_operation.exec(env)
+
+    env.batch_loader = lambda: (data.iloc[i : i + 3000, :] for i in range(0, data.shape[0], 3000))
+    env.resources = {"1": EnvResource("1", data=env.products)}
+
+    env = seq.operation.exec(env)
+
+    env.batch_loader = None
+    env.resources = {"1": EnvResource("1", data=env.products)}
+
+    env = seq.final_operation.exec(env)
+
+    fed_means = env["mean"]
+    df_means = data.mean()
+
+    assert fed_means.shape == df_means.shape
+    assert ((fed_means - df_means).abs() < 1e-6).all()
+
+
+def test_mean_estimator_parallel(tmp_path: Path):
+    data = pd.read_csv(PATH_CALIFORNIA)
+
+    steps = MeanEstimator(parallel=True).get_steps()
+
+    assert isinstance(steps[0], SecureParallel)
+
+    sc = get_scheduler_context(3)
+    jobs = steps[0].jobs(sc)
+
+    dfs = {
+        sc.workers[0].id: data.iloc[:7000, :],
+        sc.workers[1].id: data.iloc[7000:14000, :],
+        sc.workers[2].id: data.iloc[14000:, :],
+    }
+
+    envs = execute_jobs(jobs, tmp_path, dfs)
+
+    fed_means = envs[jobs[-1].id]["mean"]
+    df_means = data.mean()
+
+    assert isinstance(fed_means, pd.Series)
+    assert fed_means.shape == df_means.shape
+    assert ((fed_means - df_means).abs() < 1e-6).all()
@@ -0,0 +1,54 @@
+from ferdelance.core.artifacts import Artifact
+from ferdelance.core.estimators import MomentsEstimator
+
+from tests.utils import execute_jobs, get_scheduler_context
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import os
+
+PATH_DIR = Path(os.path.abspath(os.path.dirname(__file__)))
+PATH_CALIFORNIA = PATH_DIR / ".." / "data" / "california.csv"
+
+
+def test_moments_estimator(tmp_path: Path):
+    data = pd.read_csv(PATH_CALIFORNIA)
+    data.loc[:100, "HouseAge"] = np.nan
+
+    features = ["MedInc", "HouseAge", "AveRooms"]
+
+    artifact = Artifact(
+        id="artifact_id",
+        project_id="project_id",
+        steps=MomentsEstimator(features=features).get_steps(),
+    )
+
+    sc = get_scheduler_context(3)
+    jobs = artifact.jobs(sc)
+
+    # one round: a job for each worker and the final combination
+    assert len(jobs) == 4
+
+    dfs = {
+        sc.workers[0].id: data.iloc[:7000, :],
+        sc.workers[1].id: data.iloc[7000:14000, :],
+        sc.workers[2].id: data.iloc[14000:, :],
+    }
+
+    envs = execute_jobs(list(jobs), tmp_path, dfs)
+
+    env = envs[jobs[-1].id]
+
+    assert env["features"] == features
+    assert env["moments"].shape == (5, 3)
+
+    expected = data[features]
+
+    assert np.array_equal(env["count"], expected.count().to_numpy())
+    assert np.allclose(env["mean"], expected.mean().to_numpy())
+    assert np.allclose(env["variance"], expected.var().to_numpy())
+    assert np.allclose(env["std"], expected.std().to_numpy())
+    assert np.array_equal(env["min"], expected.min().to_numpy())
+    assert np.array_equal(env["max"], expected.max().to_numpy())
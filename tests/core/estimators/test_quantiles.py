@@ -0,0 +1,60 @@
+from ferdelance.core.artifacts import Artifact
+from ferdelance.core.estimators import QuantileEstimator
+
+from tests.utils import execute_jobs, get_scheduler_context
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import os
+
+PATH_DIR = Path(os.path.abspath(os.path.dirname(__file__)))
+PATH_CALIFORNIA = PATH_DIR / ".." / "data" / "california.csv"
+
+
+def test_quantile_estimator(tmp_path: Path):
+    data = pd.read_csv(PATH_CALIFORNIA)
+    data.loc[:100, "HouseAge"] = np.nan
+
+    features = ["MedInc", "HouseAge", "AveRooms"]
+    quantiles = [0.1, 0.5, 0.9]
+    bins = [0.0, 2.0, 4.0, 6.0, 8.0, 10.0]
+
+    artifact = Artifact(
+        id="artifact_id",
+        project_id="project_id",
+        steps=QuantileEstimator(features=features, quantiles=quantiles, bins=bins).get_steps(),
+    )
+
+    sc = get_scheduler_context(3)
+    jobs = artifact.jobs(sc)
+
+    assert len(jobs) == 4
+
+    dfs = {
+        sc.workers[0].id: data.iloc[:7000, :],
+        sc.workers[1].id: data.iloc[7000:14000, :],
+        sc.workers[2].id: data.iloc[14000:, :],
+    }
+
+    envs = execute_jobs(list(jobs), tmp_path, dfs)
+
+    env = envs[jobs[-1].id]
+
+    assert env["features"] == features
+    assert env["quantiles"].shape == (3, 3)
+
+    for j, f in enumerate(features):
+        x = data[f].dropna().to_numpy()
+
+        assert env["sketches"][f].n == len(x)
+
+        # the error is on the rank of the estimated values
+        ranks = np.array([(x <= v).mean() for v in env["quantiles"][:, j]])
+        assert np.all(np.abs(ranks - quantiles) < 0.02)
+
+        counts, _ = np.histogram(x, bins=bins)
+        assert np.array_equal(env["histograms"][j], counts)
+
+    assert np.array_equal(env["edges"], bins)
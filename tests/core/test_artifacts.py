@@ -1,13 +1,14 @@
 from ferdelance.core.artifacts import Artifact
-from ferdelance.core.distributions import Collect, Distribute
+from ferdelance.core.distributions import Collect, Distribute, Tree
 from ferdelance.core.estimators.counters import CountEstimator
 from ferdelance.core.models import FederatedRandomForestClassifier
 from ferdelance.core.operations import SubtractMatrix, SumMatrix, UniformMatrix
-from ferdelance.core.steps import Finalize, Initialize, Parallel
+from ferdelance.core.steps import Finalize, Initialize, Parallel, SecureParallel, TreeAggregation
 
 from tests.utils import get_scheduler_context
 
 import json
+import pytest
 
 
 def test_simple_artifact():
@@ -130,6 +131,110 @@ def test_plan_sequence():
     assert jobs[3].locks == []
 
 
+def test_tree_aggregation():
+    artifact = Artifact(
+        id="artifact_id",
+        project_id="project_id",
+        steps=[
+            Parallel(
+                SumMatrix(),
+                Tree(arity=2),
+            ),
+            TreeAggregation(
+                SumMatrix(),
+                arity=2,
+                distribution=Distribute(),
+            ),
+            Parallel(
+                SumMatrix(),
+            ),
+        ],
+    )
+
+    rebuilt = Artifact(**json.loads(artifact.model_dump_json()))
+
+    assert rebuilt == artifact
+    assert isinstance(rebuilt.steps[0].distribution, Tree)
+    assert isinstance(rebuilt.steps[1], TreeAggregation)
+
+    sc = get_scheduler_context(5)
+    jobs = rebuilt.jobs(sc)
+
+    # 5 workers, then 3 + 2 intermediate aggregations, 1 root, and 5 workers again
+    assert len(jobs) == 16
+
+    assert [j.locks for j in jobs[:5]] == [[5], [5], [6], [6], [7]]
+    assert [j.worker for j in jobs[:5]] == sc.workers
+
+    # first level on workers 0, 2, 4
+    assert [j.locks for j in jobs[5:8]] == [[8], [8], [9]]
+    assert [j.worker for j in jobs[5:8]] == [sc.workers[0], sc.workers[2], sc.workers[4]]
+
+    # second level on workers 0, 4
+    assert [j.locks for j in jobs[8:10]] == [[10], [10]]
+    assert [j.worker for j in jobs[8:10]] == [sc.workers[0], sc.workers[4]]
+
+    # the initiator receives only two partial results
+    assert jobs[10].worker == sc.initiator
+    assert jobs[10].locks == [11, 12, 13, 14, 15]
+    assert len([j for j in jobs if 10 in j.locks]) == 2
+
+    # without intermediate levels all workers lock the root
+    sc = get_scheduler_context(2)
+    jobs = rebuilt.jobs(sc)
+
+    assert len(jobs) == 5
+    assert jobs[0].locks == [2]
+    assert jobs[1].locks == [2]
+    assert jobs[2].worker == sc.initiator
+
+
+def test_tree_aggregation_previous_step():
+    def artifact(distribution) -> Artifact:
+        return Artifact(
+            project_id="project_id",
+            steps=[
+                Parallel(SumMatrix(), distribution),
+                TreeAggregation(SumMatrix(), arity=2),
+            ],
+        )
+
+    sc = get_scheduler_context(5)
+
+    # without a distribution, the previous step is bound as a tree
+    jobs = artifact(None).jobs(sc)
+    assert [j.locks for j in jobs[:5]] == [[5], [5], [6], [6], [7]]
+
+    jobs = artifact(Tree(arity=2)).jobs(get_scheduler_context(5))
+    assert [j.locks for j in jobs[:5]] == [[5], [5], [6], [6], [7]]
+
+    with pytest.raises(ValueError):
+        artifact(Collect()).jobs(sc)
+
+    with pytest.raises(ValueError):
+        artifact(Tree(arity=3)).jobs(sc)
+
+    # more than one job for each worker
+    with pytest.raises(ValueError):
+        Artifact(
+            project_id="project_id",
+            steps=[
+                SecureParallel(SumMatrix(), SumMatrix()),
+                TreeAggregation(SumMatrix(), arity=2),
+            ],
+        ).jobs(sc)
+
+
+def test_tree_distribution():
+    assert Tree(arity=3).bind_locks([0, 1, 2, 3], [4, 5, 6]) == [[4], [4], [4], [5]]
+
+    with pytest.raises(ValueError):
+        Tree(arity=3).bind_locks([0, 1, 2, 3], [4])
+
+    with pytest.raises(ValueError):
+        Tree(arity=1).bind_locks([0, 1], [2, 3])
+
+
 def test_steps_conversion():
     artifact = Artifact(
         id="artifact_id",
@@ -0,0 +1,55 @@
+from ferdelance.core.budget import cap_n_jobs, get_cpu_budget, set_cpu_budget
+from ferdelance.core.models import FederatedRandomForestClassifier
+
+from threadpoolctl import threadpool_info
+
+import numpy as np
+import os
+import pytest
+
+
+def test_cap_n_jobs():
+    assert get_cpu_budget() is None
+    assert cap_n_jobs(8) == 8
+    assert cap_n_jobs(-1) == -1
+    assert cap_n_jobs(None) is None
+
+    try:
+        set_cpu_budget(4)
+
+        assert get_cpu_budget() == 4
+        assert cap_n_jobs(None) is None
+        assert cap_n_jobs(2) == 2
+        assert cap_n_jobs(8) == 4
+        assert cap_n_jobs(-1) == 4
+        assert cap_n_jobs(-2) == 3
+        assert cap_n_jobs(-10) == 1
+
+    finally:
+        set_cpu_budget(None)
+
+    assert get_cpu_budget() is None
+
+
+def test_cpu_budget_limits_threads():
+    original = os.environ.get("OMP_NUM_THREADS")
+
+    try:
+        set_cpu_budget(1)
+
+        assert os.environ["OMP_NUM_THREADS"] == "1"
+        assert all(pool["num_threads"] == 1 for pool in threadpool_info())
+
+        # models with n_jobs use at most the budget
+        model = FederatedRandomForestClassifier(n_estimators=4, n_jobs=-1, random_state=42)
+        rf = model.train(np.random.rand(20, 3), np.arange(20) % 2)
+
+        assert rf.n_jobs == 1
+
+    finally:
+        set_cpu_budget(None)
+
+    assert os.environ.get("OMP_NUM_THREADS") == original
+
+    with pytest.raises(ValueError):
+        set_cpu_budget(0)
@@ -0,0 +1,189 @@
+from ferdelance.core import containers
+from ferdelance.core.environment import EnvResource, Environment
+
+from pathlib import Path
+
+import numpy as np
+import os
+import pandas as pd
+import pickle
+import pytest
+
+
+def sample() -> dict:
+    return {
+        "count": 42,
+        "matrix": np.arange(12, dtype=np.float64).reshape(3, 4),
+        "fortran": np.asfortranarray(np.arange(6, dtype=np.int32).reshape(2, 3)),
+        "dates": np.array(["2024-01-01", "2024-02-01"], dtype="datetime64[ns]"),
+        "empty": np.zeros((0, 3)),
+        "objects": np.array(["a", None], dtype=object),
+        "frame": pd.DataFrame({"a": [1, 2, 3], "b": [0.5, 1.5, None]}, index=[10, 20, 30]),
+        "int_columns": pd.DataFrame({0: [1, 2], 1: [3, 4]}),
+        "series": pd.Series([1.0, 2.0], index=["x", "y"], name="mean"),
+        "counts": {"a": {1: 2}},
+    }
+
+
+def check(data: dict, loaded) -> None:
+    assert set(loaded.keys()) == set(data.keys())
+
+    assert loaded["count"] == 42
+    assert loaded["counts"] == data["counts"]
+
+    for k in ("matrix", "fortran", "dates", "empty"):
+        assert loaded[k].dtype == data[k].dtype
+        assert np.array_equal(loaded[k], data[k])
+
+    assert list(loaded["objects"]) == list(data["objects"])
+
+    pd.testing.assert_frame_equal(loaded["frame"], data["frame"])
+    pd.testing.assert_frame_equal(loaded["int_columns"], data["int_columns"])
+    pd.testing.assert_series_equal(loaded["series"], data["series"])
+
+
+def test_container_roundtrip(tmp_path: Path):
+    data = sample()
+    path = tmp_path / "resource.pkl"
+
+    containers.dump(data, path)
+
+    loaded = containers.load(path)
+
+    assert isinstance(loaded, containers.ResourceContainer)
+    check(data, loaded)
+
+    check(data, containers.loads(containers.dumps(data)))
+
+
+def test_container_lazy_and_copy_on_write(tmp_path: Path):
+    path = tmp_path / "resource.pkl"
+
+    containers.dump({"count": 1, "matrix": np.ones(1000)}, path)
+
+    loaded = containers.load(path)
+
+    assert loaded["count"] == 1
+    assert "matrix" not in loaded._cache
+
+    matrix = loaded["matrix"]
+    matrix += 1
+
+    assert np.all(containers.load(path)["matrix"] == 1)
+
+
+def test_container_pickle_fallback(tmp_path: Path):
+    path = tmp_path / "resource.pkl"
+
+    with open(path, "wb") as f:
+        pickle.dump({"count": 3}, f)
+
+    assert containers.load(path) == {"count": 3}
+
+    containers.dump([1, 2, 3], path)
+
+    assert containers.load(path) == [1, 2, 3]
+
+
+def test_environment_store_and_get(tmp_path: Path):
+    work_dir = tmp_path / "job"
+    work_dir.mkdir()
+
+    env = Environment("", "", "product", work_dir)
+    env["mean"] = pd.Series([1.0, 2.0], index=["a", "b"])
+    env["count"] = 2
+    env.store()
+
+    res = EnvResource("product", env.product_path())
+
+    assert res.get()["count"] == 2
+    assert list(res.get()["mean"]) == [1.0, 2.0]
+
+
+def test_environment_lazy_locals(tmp_path: Path):
+    work_dir = tmp_path / "job"
+    work_dir.mkdir()
+
+    env = Environment("", "", "product", work_dir)
+    env[".small"] = 1
+    env[".large"] = np.arange(1000)
+    env.store()
+
+    locals_dir = tmp_path / "locals"
+    files = sorted(os.listdir(locals_dir))
+
+    assert len(files) == 2
+
+    # nothing is loaded until accessed
+    env = Environment("", "", "product", work_dir)
+
+    assert env.locals == dict()
+    assert env[".small"] == 1
+    assert ".large" not in env.locals
+
+    # only changed locals are written
+    env[".small"] = 2
+    for f in files:
+        os.utime(locals_dir / f, (0, 0))
+
+    env.store()
+
+    assert len([f for f in files if os.path.getmtime(locals_dir / f) != 0]) == 1
+
+    env = Environment("", "", "product", work_dir)
+
+    assert env[".small"] == 2
+    assert np.array_equal(env[".large"], np.arange(1000))
+
+    with pytest.raises(KeyError):
+        env[".missing"]
+
+
+def test_environment_local_set_again(tmp_path: Path):
+    work_dir = tmp_path / "job"
+    work_dir.mkdir()
+
+    env = Environment("", "", "product", work_dir)
+    env[".w"] = np.arange(1_000_000, dtype=np.float64)
+    env.store()
+
+    # the loaded value is memory-mapped from the file that is written again
+    env = Environment("", "", "product", work_dir)
+    env[".w"] = env[".w"]
+    env.store()
+
+    env = Environment("", "", "product", work_dir)
+
+    assert np.array_equal(env[".w"], np.arange(1_000_000, dtype=np.float64))
+    assert os.listdir(tmp_path / "locals") == [".w.bin"]
+
+
+def test_environment_legacy_locals(tmp_path: Path):
+    work_dir = tmp_path / "job"
+    work_dir.mkdir()
+
+    with open(tmp_path / "local.pkl", "wb") as f:
+        pickle.dump({".old": 3}, f)
+
+    # a single local stored with the pickle extension
+    (tmp_path / "locals").mkdir()
+
+    with open(tmp_path / "locals" / ".w.pkl", "wb") as f:
+        pickle.dump({".w": 5}, f)
+
+    env = Environment("", "", "product", work_dir)
+
+    assert env.product_path().suffix == ".bin"
+    assert env[".old"] == 3
+    assert env[".w"] == 5
+
+    with pytest.raises(KeyError):
+        env[".missing"]
+
+    # a product stored with pickle by previous versions
+    with open(work_dir / "old.pkl", "wb") as f:
+        pickle.dump({"x": 7}, f)
+
+    env.add_resource("old", work_dir / "old.pkl")
+
+    assert env["old"]["x"] == 7
@@ -1,6 +1,15 @@
+from ferdelance.datasources import DataSourceFile
 from ferdelance.schemas.datasources import AggregatedDataSource, Feature, DataSource, DataType
 
+from pathlib import Path
+
 import json
+import numpy as np
+import os
+import pandas as pd
+
+PATH_DIR = Path(os.path.abspath(os.path.dirname(__file__)))
+PATH_CALIFORNIA = PATH_DIR / "data" / "california.csv"
 
 
 def test_datasources():
@@ -66,3 +75,41 @@ def test_datasources():
     assert ads.n_records == 40
 
     print(json.dumps(ads.model_dump(), indent=True))
+
+
+def test_datasources_aggregate_statistics(tmp_path: Path):
+    data = pd.read_csv(PATH_CALIFORNIA)
+    data.loc[:100, "HouseAge"] = np.nan
+
+    datasources: list[DataSource] = list()
+
+    for i, (start, end) in enumerate([(0, 3000), (3000, 12000), (12000, len(data))]):
+        path = tmp_path / f"part{i}.csv"
+        data.iloc[start:end].to_csv(path, index=False)
+
+        meta = DataSourceFile(f"part{i}", "csv", path, batch_size=1000).metadata()
+
+        assert meta.n_records == end - start
+        assert meta.n_features == data.shape[1]
+
+        meta.id = f"ds{i}"
+        # raw values of the data are not part of the metadata
+        assert "sketch" not in meta.model_dump_json()
+
+        datasources.append(DataSource(**meta.model_dump(), component_id=f"client{i}"))
+
+    ads = AggregatedDataSource.aggregate(datasources)
+
+    for name in ("MedInc", "HouseAge"):
+        f = ads[name]
+        x = data[name].dropna()
+
+        assert f.n_values == len(x)
+
+        assert f.v_min == x.min()
+        assert f.v_max == x.max()
+        assert np.isclose(f.v_mean, x.mean())
+        assert np.isclose(f.v_std, x.std())
+
+        for q, v in ((0.25, f.v_p25), (0.5, f.v_p50), (0.75, f.v_p75)):
+            assert abs((x <= v).mean() - q) < 0.02
@@ -0,0 +1,157 @@
+from ferdelance.core.environment import EnvResource, Environment
+from ferdelance.core.estimators import CountEstimator, GroupCountEstimator, GroupMeanEstimator, MeanEstimator
+from ferdelance.core.queries import Query, QueryFeature, QueryStage
+from ferdelance.core.steps import Sequential
+from ferdelance.datasources import DataSourceDB
+
+from pathlib import Path
+
+import pandas as pd
+import os
+import pytest
+
+
+PATH_DIR = Path(os.path.abspath(os.path.dirname(__file__)))
+PATH_CALIFORNIA = PATH_DIR / "data" / "california.csv"
+
+
+@pytest.fixture()
+def data() -> pd.DataFrame:
+    return pd.read_csv(PATH_CALIFORNIA)
+
+
+@pytest.fixture()
+def datasource(tmp_path: Path, data: pd.DataFrame) -> DataSourceDB:
+    conn = f"sqlite:///{tmp_path / 'california.db'}"
+
+    data.to_sql("california", conn, index=False)
+
+    return DataSourceDB("california", "db", conn, "california", batch_size=5000)
+
+
+def query_house_age() -> Query:
+    q = Query(stages=[QueryStage(features=[QueryFeature("HouseAge", "float")])])
+    return q.add(q["HouseAge"] > 20)
+
+
+def execute(seq: Sequential, env: Environment) -> Environment:
+    env = seq.init_operation.exec(env)
+
+    env.resources = {"1": EnvResource("1", data=env.products)}
+    env = seq.operation.exec(env)
+
+    env.resources = {"1": EnvResource("1", data=env.products)}
+    env = seq.final_operation.exec(env)
+
+    return env
+
+
+def pushdown_env(ds: DataSourceDB) -> Environment:
+    def fail():
+        raise AssertionError("data should not be loaded")
+
+    env = Environment("", "", "", Path("."))
+    env.datasources = [ds]
+    env.df_loader = fail
+
+    return env
+
+
+def test_db_datasource_get_and_batches(datasource: DataSourceDB, data: pd.DataFrame):
+    df = datasource.get()
+
+    assert df.shape == data.shape
+
+    batches = list(datasource.batches())
+
+    assert len(batches) == 5
+    assert all(b.shape[0] <= 5000 for b in batches)
+    assert sum(b.shape[0] for b in batches) == data.shape[0]
+
+
+def test_db_datasource_metadata(datasource: DataSourceDB, data: pd.DataFrame):
+    md = datasource.metadata()
+
+    assert md.n_records == data.shape[0]
+    assert md.n_features == data.shape[1]
+
+    for f in md.features:
+        assert f.v_mean is not None
+        assert f.v_std is not None
+        assert abs(f.v_mean - data[f.name].mean()) < 1e-6
+        assert abs(f.v_std - data[f.name].std()) < 1e-6
+        assert f.v_min == data[f.name].min()
+        assert f.v_max == data[f.name].max()
+
+
+def test_db_count_pushdown(datasource: DataSourceDB, data: pd.DataFrame):
+    seq = CountEstimator(query=query_house_age(), random_state=42).get_steps()[0]
+
+    assert isinstance(seq, Sequential)
+
+    env = execute(seq, pushdown_env(datasource))
+
+    assert env["count"] == (data["HouseAge"] > 20).sum()
+
+
+def test_db_mean_pushdown(datasource: DataSourceDB, data: pd.DataFrame):
+    seq = MeanEstimator(query=query_house_age(), random_state=42).get_steps()[0]
+
+    assert isinstance(seq, Sequential)
+
+    env = execute(seq, pushdown_env(datasource))
+
+    expected = data[data["HouseAge"] > 20].mean()
+
+    for c in data.columns:
+        assert abs(env["mean"][c] - expected[c]) < 1e-6
+
+
+def test_db_mean_same_features_as_pandas(tmp_path: Path, data: pd.DataFrame):
+    data = data.assign(label=data["HouseAge"].astype(str), flag=data["HouseAge"] > 20)
+
+    conn = f"sqlite:///{tmp_path / 'features.db'}"
+    data.to_sql("california", conn, index=False)
+
+    ds = DataSourceDB("california", "db", conn, "california")
+
+    seq = MeanEstimator(random_state=42).get_steps()[0]
+
+    assert isinstance(seq, Sequential)
+
+    pushdown = execute(seq, pushdown_env(ds))["mean"]
+    in_memory = execute(seq, Environment("", "", "", Path("."), df=data))["mean"]
+
+    # text and boolean features are not summed by either path
+    assert list(pushdown.index) == list(in_memory.index)
+    assert "label" not in in_memory and "flag" not in in_memory
+
+    for c in in_memory.index:
+        assert abs(pushdown[c] - in_memory[c]) < 1e-6
+
+
+def test_db_group_pushdown(datasource: DataSourceDB, data: pd.DataFrame):
+    seq = GroupCountEstimator(by=["HouseAge"], features=["AveBedrms"], random_state=42).get_steps()[0]
+
+    assert isinstance(seq, Sequential)
+
+    env = execute(seq, pushdown_env(datasource))
+
+    fed_counts = env["counts"]["AveBedrms"]
+    df_counts = data.groupby("HouseAge").count()["AveBedrms"].to_dict()
+
+    assert fed_counts == df_counts
+
+    seq = GroupMeanEstimator(by=["HouseAge"], features=["AveBedrms"], random_state=42).get_steps()[0]
+
+    assert isinstance(seq, Sequential)
+
+    env = execute(seq, pushdown_env(datasource))
+
+    fed_means = env["means"]["AveBedrms"]
+    df_means = data.groupby("HouseAge").mean()["AveBedrms"].to_dict()
+
+    assert len(fed_means) == len(df_means)
+
+    for k in df_means.keys():
+        assert abs(fed_means[k] - df_means[k]) < 1e-6
@@ -0,0 +1,201 @@
+from ferdelance.core import containers
+from ferdelance.core.environment import Environment
+from ferdelance.core.model_operations import Aggregation, LocalCrossValidation, Train
+from ferdelance.core.models import (
+    FederatedLinearRegression,
+    FederatedLogisticRegression,
+    FederatedRandomForestClassifier,
+    StrategyRandomForestClassifier,
+)
+
+from sklearn.datasets import make_classification, make_regression
+from sklearn.ensemble import RandomForestClassifier, VotingClassifier
+from sklearn.linear_model import SGDRegressor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def train_models(model: FederatedRandomForestClassifier, n: int) -> tuple[list[RandomForestClassifier], np.ndarray]:
+    X, y = make_classification(n_samples=300, n_features=5, random_state=42)
+
+    models = [model.train(X[i::n], y[i::n]) for i in range(n)]
+
+    return models, X
+
+
+def test_rf_aggregate_many_merge():
+    model = FederatedRandomForestClassifier(n_estimators=5, random_state=42)
+
+    models, X = train_models(model, 4)
+
+    aggregated = model.aggregate_many(iter(models))
+
+    assert isinstance(aggregated, RandomForestClassifier)
+    assert aggregated.n_estimators == 20
+    assert aggregated.predict_proba(X).shape == (300, 2)
+
+    with pytest.raises(ValueError):
+        model.aggregate_many([])
+
+
+def test_rf_aggregate_many_vote():
+    model = FederatedRandomForestClassifier(
+        n_estimators=5,
+        random_state=42,
+        strategy=StrategyRandomForestClassifier.MAJORITY_VOTE,
+    )
+
+    models, X = train_models(model, 4)
+
+    aggregated = model.aggregate_many(models)
+
+    assert isinstance(aggregated, VotingClassifier)
+    assert aggregated.estimators_ == models
+    assert aggregated.predict_proba(X).shape == (300, 2)
+
+    # partial aggregates, as from a tree, are flattened
+    partial = model.aggregate_many([model.aggregate_many(models[:2]), model.aggregate_many(models[2:])])
+
+    assert partial.estimators_ == models
+    assert np.array_equal(partial.predict(X), aggregated.predict(X))
+
+    # pairwise aggregation produces the same ensemble
+    pairwise = model.aggregate(model.aggregate(model.aggregate(models[0], models[1]), models[2]), models[3])
+
+    assert np.array_equal(pairwise.predict(X), aggregated.predict(X))
+
+
+def test_aggregation_streams_resources(tmp_path: Path):
+    model = FederatedRandomForestClassifier(n_estimators=5, random_state=42)
+
+    models, _ = train_models(model, 3)
+
+    env = Environment("", "", "product", tmp_path)
+
+    for i, m in enumerate(models):
+        containers.dump({"model": m}, tmp_path / f"{i}.pkl")
+        env.add_resource(f"{i}", tmp_path / f"{i}.pkl")
+
+    env = Aggregation(model=model).exec(env)
+
+    assert env["model"].n_estimators == 15
+
+    # resources are not kept in memory after the aggregation
+    assert all(res.data is None for res in env.resources.values())
+
+
+def test_linear_aggregate_many_weighted():
+    model = FederatedLinearRegression(random_state=42)
+
+    X, y = make_regression(n_samples=400, n_features=4, noise=0.1, random_state=42)
+
+    models = [model.train(X[:100], y[:100]), model.train(X[100:], y[100:])]
+
+    coef = (100 * models[0].coef_ + 300 * models[1].coef_) / 400
+    intercept = (100 * models[0].intercept_ + 300 * models[1].intercept_) / 400
+
+    aggregated = model.aggregate_many(iter(models))
+
+    assert isinstance(aggregated, SGDRegressor)
+    assert aggregated.n_samples_ == 400
+    assert np.allclose(aggregated.coef_, coef)
+    assert np.allclose(aggregated.intercept_, intercept)
+
+
+def test_linear_warm_start_per_instance(tmp_path: Path):
+    X, y = make_regression(n_samples=200, n_features=4, noise=0.1, random_state=42)
+
+    previous = FederatedLinearRegression(random_state=42).train(X[:100], y[:100])
+    containers.dump({"model": previous}, tmp_path / "previous.pkl")
+
+    def train(model: FederatedLinearRegression) -> SGDRegressor:
+        env = Environment("", "", "product", tmp_path)
+        env.X_tr = pd.DataFrame(X[100:])
+        env.Y_tr = pd.DataFrame(y[100:])
+        env.add_resource("previous", tmp_path / "previous.pkl")
+
+        return Train(model=model).exec(env)["model"]
+
+    scratch = FederatedLinearRegression(random_state=42).train(X[100:], y[100:])
+
+    model = FederatedLinearRegression(random_state=42, warm_start=False)
+    assert not FederatedLinearRegression(**model.model_dump()).warm_start
+
+    assert np.allclose(train(model).coef_, scratch.coef_)
+    assert not np.allclose(train(FederatedLinearRegression(random_state=42)).coef_, scratch.coef_)
+
+
+def test_logistic_iterations_keep_size(tmp_path: Path):
+    model = FederatedLogisticRegression(random_state=42)
+
+    X, y = make_classification(n_samples=600, n_features=5, random_state=42)
+    parts = [(X[i::3], y[i::3]) for i in range(3)]
+
+    aggregated = None
+
+    for it in range(3):
+        models = []
+
+        for i, (x_part, y_part) in enumerate(parts):
+            env = Environment("", "", f"{it}-{i}", tmp_path)
+            env.X_tr = pd.DataFrame(x_part)
+            env.Y_tr = pd.DataFrame(y_part)
+
+            if aggregated is not None:
+                containers.dump({"model": aggregated}, tmp_path / "previous.pkl")
+                env.add_resource("previous", tmp_path / "previous.pkl")
+
+            env = Train(model=FederatedLogisticRegression(random_state=42)).exec(env)
+
+            models.append(env["model"])
+
+        aggregated = model.aggregate_many(models)
+
+        # parameters have always the same size
+        assert aggregated.coef_.shape == (1, 5)
+        assert aggregated.n_samples_ == 600
+
+    model.set_model(aggregated)
+
+    assert model.predict(X).shape == (600, 2)
+    assert (model.classify(X) == y).mean() > 0.8
+
+
+def test_local_cross_validation(tmp_path: Path):
+    X, y = make_classification(n_samples=300, n_features=5, random_state=42)
+
+    def run(parallel: bool) -> list:
+        work_dir = tmp_path / f"parallel_{parallel}"
+        work_dir.mkdir()
+
+        env = Environment("artifact", "", "product", work_dir)
+        env.X_tr = pd.DataFrame(X)
+        env.Y_tr = pd.DataFrame(y)
+
+        op = LocalCrossValidation(
+            model=FederatedRandomForestClassifier(n_estimators=10, random_state=42),
+            folds=4,
+            random_state=42,
+            parallel=parallel,
+            n_jobs=2,
+        )
+
+        env = op.exec(env)
+
+        # the shared training data are removed
+        assert list(work_dir.iterdir()) == []
+
+        return env["metrics_list"]
+
+    sequential = run(False)
+    parallel = run(True)
+
+    assert [m.source for m in sequential] == [f"test_{i}" for i in range(4)]
+    assert all(m.artifact_id == "artifact" for m in parallel)
+
+    # same folds and same seeds give the same results
+    assert [m.accuracy_score for m in sequential] == [m.accuracy_score for m in parallel]
+    assert all(m.accuracy_score > 0.7 for m in parallel)
@@ -0,0 +1,29 @@
+from ferdelance.core.moments import batch_moments, derive_moments, empty_moments, merge_moments
+
+import numpy as np
+
+
+def test_merge_moments():
+    x = np.array([[1.0, 5.0], [np.nan, 2.0], [3.0, 4.0], [4.0, np.nan], [2.0, 8.0]])
+
+    moments = empty_moments(2)
+    for chunk in np.array_split(x, 3):
+        moments = merge_moments(moments, batch_moments(chunk))
+
+    assert np.array_equal(moments, batch_moments(x))
+
+    stats = derive_moments(moments)
+
+    assert np.array_equal(stats["count"], [4, 4])
+    assert np.allclose(stats["mean"], np.nanmean(x, axis=0))
+    assert np.allclose(stats["variance"], np.nanvar(x, axis=0, ddof=1))
+    assert np.array_equal(stats["min"], [1.0, 2.0])
+    assert np.array_equal(stats["max"], [4.0, 8.0])
+
+
+def test_derive_empty_moments():
+    stats = derive_moments(empty_moments(1))
+
+    assert stats["count"][0] == 0
+    assert np.isnan(stats["mean"][0])
+    assert np.isnan(stats["min"][0])
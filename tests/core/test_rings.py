@@ -0,0 +1,108 @@
+from ferdelance.core.artifacts import Artifact
+from ferdelance.core.distributions import Collect, RoundRobin
+from ferdelance.core.environment import Environment
+from ferdelance.core.operations import Operation, RingReduce
+from ferdelance.core import steps
+from ferdelance.core.steps import Finalize, Ring
+
+from tests.utils import execute_jobs, get_scheduler_context
+
+from pathlib import Path
+
+import json
+import numpy as np
+import pytest
+
+
+class WorkerArrays(Operation):
+    """Arrays that depend on the id of the job producing them."""
+
+    def exec(self, env: Environment) -> Environment:
+        r = np.random.default_rng(int(env.product_id))
+
+        env["weights"] = r.uniform(size=(3, 4))
+        env["bias"] = r.integers(10, size=5)
+
+        return env
+
+
+def test_ring_jobs():
+    sc = get_scheduler_context(3)
+
+    artifact = Artifact(
+        id="artifact_id",
+        project_id="project_id",
+        steps=[
+            Ring(WorkerArrays(), ["weights", "bias"], Collect()),
+            Finalize(WorkerArrays()),
+        ],
+    )
+
+    rebuilt = Artifact(**json.loads(artifact.model_dump_json()))
+
+    assert rebuilt == artifact
+    assert isinstance(rebuilt.steps[0], Ring)
+
+    jobs = rebuilt.jobs(sc)
+
+    # 5 stages of 3 workers, and the final job
+    assert len(jobs) == 16
+
+    for job in jobs[:12]:
+        i = job.id % 3
+        assert job.worker == sc.workers[i]
+        assert job.locks == [job.id + 3, job.id - i + (i + 1) % 3 + 3]
+
+    assert [j.locks for j in jobs[12:15]] == [[15], [15], [15]]
+    assert jobs[15].worker == sc.initiator
+
+
+def test_ring_all_reduce(tmp_path: Path):
+    sc = get_scheduler_context(4)
+
+    jobs = list(Ring(WorkerArrays(), ["weights", "bias"]).jobs(sc))
+
+    assert len(jobs) == 4 * 7
+
+    envs = execute_jobs(jobs, tmp_path)
+
+    # the first stage is executed by jobs with ids from 0 to 3
+    arrays = [WorkerArrays().exec(Environment("artifact", "", f"{i}", tmp_path)) for i in range(4)]
+    weights = sum(env["weights"] for env in arrays)
+    bias = sum(env["bias"] for env in arrays)
+
+    # each worker has the sum of the arrays of all workers
+    for job in jobs[-4:]:
+        env = envs[job.id]
+
+        assert set(env.products.keys()) == {"weights", "bias"}
+        assert np.allclose(env["weights"], weights)
+        assert np.array_equal(env["bias"], bias)
+
+    # intermediate stages send only one chunk, 1/n of the data
+    for job in jobs[:-4]:
+        assert isinstance(job.step.operation, RingReduce)
+        assert set(envs[job.id].products.keys()) == {"chunk", "data"}
+        assert len(envs[job.id].products["data"]) <= 5
+
+
+def test_ring_single_worker(tmp_path: Path):
+    jobs = list(Ring(WorkerArrays(), ["bias"]).jobs(get_scheduler_context(1)))
+
+    assert len(jobs) == 1
+    assert jobs[0].locks == []
+
+    envs = execute_jobs(jobs, tmp_path)
+
+    expected = WorkerArrays().exec(Environment("artifact", "", "0", tmp_path))
+
+    assert np.array_equal(envs[0]["bias"], expected["bias"])
+
+
+def test_round_robin_distribution():
+    assert RoundRobin().bind_locks([0, 1, 2], [3, 4, 5]) == [[4], [5], [3]]
+
+
+def test_round_robin_step_removed():
+    with pytest.raises(ValueError, match="Ring"):
+        steps.RoundRobin(WorkerArrays())
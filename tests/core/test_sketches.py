@@ -0,0 +1,66 @@
+from ferdelance.core.sketches import Histogram, QuantileSketch
+
+import numpy as np
+import pytest
+
+
+def test_quantile_sketch_exact_when_small():
+    x = np.array([5.0, 1.0, np.nan, 3.0, 2.0, 4.0])
+
+    sketch = QuantileSketch(k=10).update(x)
+
+    assert sketch.n == 5
+    assert sketch.v_min == 1.0
+    assert sketch.v_max == 5.0
+    assert sketch.quantile(0.5) == 3.0
+    assert np.array_equal(sketch.quantile([0, 0.2, 1]), [1.0, 1.0, 5.0])
+
+    with pytest.raises(ValueError):
+        sketch.quantile(1.5)
+
+    assert np.isnan(QuantileSketch().quantile(0.5))
+
+
+def test_quantile_sketch_merge():
+    rng = np.random.default_rng(42)
+    x = rng.normal(size=50_000)
+
+    # batches of different size on each part, as on different nodes
+    parts = [QuantileSketch(k=128) for _ in range(4)]
+    for sketch, chunk, size in zip(parts, np.array_split(x, 4), [1000, 777, 12500, 50]):
+        for i in range(0, len(chunk), size):
+            sketch.update(chunk[i : i + size])
+
+    merged = QuantileSketch(k=128)
+    for sketch in parts:
+        merged.merge(sketch)
+
+    assert merged.n == len(x)
+    assert merged.v_min == x.min()
+    assert merged.v_max == x.max()
+
+    # memory is bounded
+    assert sum(len(level) for level in merged.levels) < 128 * 12
+
+    qs = np.linspace(0.05, 0.95, 19)
+    ranks = np.array([(x <= v).mean() for v in merged.quantile(qs)])
+    assert np.all(np.abs(ranks - qs) < 0.02)
+
+    # survives serialization as part of the metadata
+    loaded = QuantileSketch.model_validate_json(merged.model_dump_json())
+    assert np.array_equal(loaded.quantile(qs), merged.quantile(qs))
+
+    assert np.isclose(merged.histogram([-np.inf, 0.0, np.inf]).sum(), len(x))
+
+
+def test_histogram():
+    a = Histogram(edges=[0, 1, 2, 3]).update([0.5, 1.5, 1.7, 3.5, np.nan])
+    b = Histogram(edges=[0, 1, 2, 3]).update([2.5])
+
+    assert a.merge(b).counts == [1, 2, 1]
+
+    with pytest.raises(ValueError):
+        a.merge(Histogram(edges=[0, 1]))
+
+    with pytest.raises(ValueError):
+        Histogram(edges=[1, 0])
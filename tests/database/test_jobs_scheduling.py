@@ -3,7 +3,7 @@ from ferdelance.core.artifacts import Artifact
 from ferdelance.core.distributions import Collect, Distribute
 from ferdelance.core.interfaces import SchedulerContext
 from ferdelance.core.steps import Finalize, Initialize, Parallel
-from ferdelance.database.tables import JobLock as JobLockDB, Job as JobDB
+from ferdelance.database.tables import JobLock as JobLockDB, Job as JobDB, Resource as ResourceDB
 from ferdelance.database.repositories import JobRepository, ArtifactRepository, ResourceRepository
 from ferdelance.node.api import api
 from ferdelance.schemas.components import Component
@@ -161,3 +161,129 @@ async def test_job_change_status(session: AsyncSession):
 
         unlocked = await list_unlocked_jobs()
         assert len(unlocked) == 5
+
+
+@pytest.mark.asyncio
+async def test_job_bulk_scheduling(session: AsyncSession):
+    with TestClient(api) as client:
+        ar = ArtifactRepository(session)
+        jr = JobRepository(session)
+
+        await create_project(session, "123456789")
+
+        node = create_node(client, TYPE_NODE).source_id
+        workers = [create_node(client).source_id for _ in range(3)]
+
+        a = Artifact(
+            id="artifact",
+            project_id="123456789",
+            steps=[
+                Initialize(DummyOp(), Distribute()),
+                Parallel(DummyOp(), Collect()),
+                Finalize(DummyOp()),
+            ],
+        )
+
+        await ar.create_artifact(a)
+
+        jobs = a.jobs(
+            SchedulerContext(
+                artifact_id=a.id,
+                initiator=Component(id=node, type_name="node", public_key=""),
+                workers=[Component(id=w, type_name="node", public_key="") for w in workers],
+            )
+        )
+
+        created = await jr.create_jobs(a.id, jobs)
+
+        assert len(created) == len(jobs) == 5
+        assert [j.component_id for j in created] == [j.worker.id for j in jobs]
+
+        n_locks = await session.scalar(select(func.count()).select_from(JobLockDB))
+        assert n_locks == 6
+
+        n_resources = await session.scalar(select(func.count()).select_from(ResourceDB))
+        assert n_resources == 5
+
+        for j, job in zip(created, jobs):
+            assert j.path.exists()
+
+            loaded = await jr.load(j)
+
+            assert loaded.id == job.id
+            assert loaded.worker.id == job.worker.id
+            assert loaded.locks == job.locks
+
+        # jobs with the same step share the same descriptor
+        assert len(set(j.path for j in created)) < len(created)
+        assert len(set(j.path for j in created[1:4])) == 1
+
+        unlocked = await jr.list_unlocked_jobs_by_artifact_id(a.id)
+
+        assert [j.id for j in unlocked] == [created[0].id]
+
+        await jr.unlock_job(created[0])
+
+        unlocked = await jr.list_unlocked_jobs_by_artifact_id(a.id)
+
+        assert set(j.id for j in unlocked) == set(j.id for j in created[:4])
+
+
+@pytest.mark.asyncio
+async def test_job_joined_queries(session: AsyncSession):
+    with TestClient(api) as client:
+        ar = ArtifactRepository(session)
+        jr = JobRepository(session)
+        rr = ResourceRepository(session)
+
+        await create_project(session, "123456789")
+
+        node = create_node(client, TYPE_NODE).source_id
+        workers = [create_node(client).source_id for _ in range(3)]
+
+        a = Artifact(
+            id="artifact",
+            project_id="123456789",
+            steps=[
+                Initialize(DummyOp(), Distribute()),
+                Parallel(DummyOp(), Collect()),
+                Finalize(DummyOp()),
+            ],
+        )
+
+        await ar.create_artifact(a)
+
+        jobs = a.jobs(
+            SchedulerContext(
+                artifact_id=a.id,
+                initiator=Component(id=node, type_name="node", public_key=""),
+                workers=[Component(id=w, type_name="node", public_key="") for w in workers],
+            )
+        )
+
+        created = await jr.create_jobs(a.id, jobs)
+
+        job, resource, worker = await jr.get_with_resource(created[0].id)
+
+        assert job.id == created[0].id
+        assert resource.id == (await rr.get_by_job_id(job.id)).id
+        assert worker.id == node
+
+        # the job collecting from all the workers
+        last = created[4]
+
+        prev_jobs = await jr.list_previous_jobs_with_resources(last.id)
+
+        assert set(j.id for j, _, _ in prev_jobs) == set(j.id for j in await jr.list_previous_jobs(last.id))
+        assert set(c.id for _, _, c in prev_jobs) == set(workers)
+
+        for j, r, _ in prev_jobs:
+            assert r.id == (await rr.get_by_job_id(j.id)).id
+
+        next_jobs = await jr.list_next_jobs_with_components(created[0].id)
+
+        assert set(j.id for j, _ in next_jobs) == set(j.id for j in await jr.list_next_jobs(created[0].id))
+        assert set(c.id for _, c in next_jobs) == set(workers)
+
+        # steps are parsed only once
+        assert await jr.load_step(created[0]) is await jr.load_step(created[0])
@@ -0,0 +1,69 @@
+from ferdelance.database import Base, create_or_migrate
+
+from sqlalchemy import create_engine, inspect, text
+
+from pathlib import Path
+
+
+def test_create_or_migrate_adds_missing_indexes(tmp_path: Path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+
+    with engine.begin() as conn:
+        Base.metadata.create_all(conn)
+
+        # simulate a database created before the indexes were defined
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.drop(conn)
+
+    with engine.begin() as conn:
+        create_or_migrate(conn)
+
+    with engine.connect() as conn:
+        inspector = inspect(conn)
+
+        job_indexes = {ix["name"] for ix in inspector.get_indexes("jobs")}
+        lock_indexes = {ix["name"] for ix in inspector.get_indexes("job_locks")}
+
+        assert "ix_jobs_component_status_creation" in job_indexes
+        assert "ix_jobs_artifact_status" in job_indexes
+        assert "ix_job_locks_job" in lock_indexes
+        assert "ix_job_locks_next_locked" in lock_indexes
+
+        plan = conn.execute(
+            text(
+                "EXPLAIN QUERY PLAN SELECT * FROM jobs "
+                "WHERE component_id = 'c' AND status = 'SCHEDULED' ORDER BY creation_time LIMIT 1"
+            )
+        ).all()
+
+        assert any("ix_jobs_component_status_creation" in str(row) for row in plan)
+
+    # running again is a no-op
+    with engine.begin() as conn:
+        create_or_migrate(conn)
+
+    engine.dispose()
+
+
+def test_create_or_migrate_adds_missing_columns(tmp_path: Path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+
+    with engine.begin() as conn:
+        Base.metadata.create_all(conn)
+
+        conn.execute(text("INSERT INTO artifacts (id, path, status, iteration) VALUES ('a', '.', 'SCHEDULED', 0)"))
+
+        # simulate a database created before the priority was defined
+        conn.execute(text("ALTER TABLE artifacts DROP COLUMN priority"))
+
+    with engine.begin() as conn:
+        create_or_migrate(conn)
+
+    with engine.connect() as conn:
+        columns = {c["name"] for c in inspect(conn).get_columns("artifacts")}
+
+        assert "priority" in columns
+        assert conn.execute(text("SELECT priority FROM artifacts WHERE id = 'a'")).scalar() == 0
+
+    engine.dispose()
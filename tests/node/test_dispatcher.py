@@ -0,0 +1,138 @@
+from ferdelance.database.repositories import ArtifactRepository, ComponentRepository, JobRepository, ProjectRepository
+from ferdelance.node.api import api
+from ferdelance.node.services import Dispatcher, JobManagementService, TaskManagementService
+from ferdelance.schemas.components import Component
+from ferdelance.shared.status import ArtifactJobStatus, JobStatus
+from ferdelance.tasks.tasks import TaskDone, TaskError
+from ferdelance.workbench.interface import Artifact
+
+from tests.dummies import DummyModel
+from tests.utils import connect
+
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import asyncio
+import pytest
+
+
+class RecordingTaskManagementService(TaskManagementService):
+    def __init__(self, session: AsyncSession, self_component: Component, launched: list[str]) -> None:
+        super().__init__(session, self_component, "", "")
+        self.launched: list[str] = launched
+
+    async def start_locally(self, artifact_id: str, job_id: str, *args) -> None:
+        self.launched.append(job_id)
+
+
+class RecordingDispatcher(Dispatcher):
+    def __init__(self) -> None:
+        super().__init__()
+        self.launched: list[str] = list()
+
+    def task_management_service(self, session: AsyncSession, self_component: Component) -> TaskManagementService:
+        return RecordingTaskManagementService(session, self_component, self.launched)
+
+
+@pytest.mark.asyncio
+async def test_dispatcher(session: AsyncSession):
+    with TestClient(api) as server:
+        args = await connect(server, session)
+
+        ar = ArtifactRepository(session)
+        jr = JobRepository(session)
+        pr = ProjectRepository(session)
+
+        self_component = await ComponentRepository(session).get_self_component()
+
+        jms = JobManagementService(session, self_component)
+
+        project = await pr.get_by_token(args.project_token)
+
+        model = DummyModel()
+        artifact = Artifact(id="", project_id=project.id, steps=model.get_steps())
+
+        status = await jms.submit_artifact(artifact)
+        await jms.check(status.id)
+
+        job1, job2 = await jr.list_jobs_by_artifact_id(status.id)
+
+        await jms.get_task_by_job_id(job1.id)
+
+        dispatcher = RecordingDispatcher()
+        await dispatcher.start()
+
+        # completion is processed in background
+        await dispatcher.put(TaskDone(artifact_id=status.id, job_id=job1.id))
+        await dispatcher.join()
+
+        assert (await jr.get_by_id(job1.id)).status == JobStatus.COMPLETED
+        assert (await jr.get_by_id(job2.id)).status == JobStatus.SCHEDULED
+        assert dispatcher.launched == [job2.id]
+
+        # errors too
+        await jms.get_task_by_job_id(job2.id)
+
+        await dispatcher.put(TaskError(job_id=job2.id, message="failed"))
+        await dispatcher.stop()
+
+        assert not dispatcher.is_running()
+        assert (await jr.get_by_id(job2.id)).status == JobStatus.ERROR
+        assert (await ar.get_status(status.id)).status == ArtifactJobStatus.ERROR
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_not_running(session: AsyncSession):
+    with TestClient(api) as server:
+        args = await connect(server, session)
+
+        jr = JobRepository(session)
+        pr = ProjectRepository(session)
+
+        self_component = await ComponentRepository(session).get_self_component()
+
+        jms = JobManagementService(session, self_component)
+
+        project = await pr.get_by_token(args.project_token)
+
+        model = DummyModel()
+        artifact = Artifact(id="", project_id=project.id, steps=model.get_steps())
+
+        status = await jms.submit_artifact(artifact)
+        await jms.check(status.id)
+
+        job1, _ = await jr.list_jobs_by_artifact_id(status.id)
+
+        await jms.get_task_by_job_id(job1.id)
+
+        # without the consumer task, events are processed immediately
+        dispatcher = RecordingDispatcher()
+
+        await dispatcher.put(TaskDone(artifact_id=status.id, job_id=job1.id))
+
+        assert (await jr.get_by_id(job1.id)).status == JobStatus.COMPLETED
+        assert len(dispatcher.launched) == 1
+
+
+class SlowDispatcher(Dispatcher):
+    def __init__(self) -> None:
+        super().__init__()
+        self.trace: list[str] = list()
+
+    async def process(self, events: list[TaskDone | TaskError]) -> None:
+        for event in events:
+            self.trace.append(f"start {event.job_id}")
+            await asyncio.sleep(0.01)
+            self.trace.append(f"end {event.job_id}")
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_not_running_serializes_events():
+    dispatcher = SlowDispatcher()
+
+    await asyncio.gather(
+        dispatcher.put(TaskDone(artifact_id="artifact", job_id="1")),
+        dispatcher.put(TaskError(job_id="2")),
+    )
+
+    assert dispatcher.trace == ["start 1", "end 1", "start 2", "end 2"]
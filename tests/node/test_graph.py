@@ -0,0 +1,85 @@
+from ferdelance.node.services.graph import JobGraph, JobGraphRegistry
+from ferdelance.schemas.jobs import Job, JobLock
+from ferdelance.shared.status import JobStatus
+
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+
+def make_job(job_id: str, minutes: int, status: JobStatus = JobStatus.WAITING) -> Job:
+    return Job(
+        id=job_id,
+        artifact_id="artifact",
+        component_id="component",
+        path=Path("."),
+        status=status,
+        creation_time=datetime(2024, 1, 1) + timedelta(minutes=minutes),
+        execution_time=None,
+        termination_time=None,
+        iteration=0,
+    )
+
+
+def make_lock(lock_id: int, job_id: str, next_id: str, locked: bool = True) -> JobLock:
+    return JobLock(id=lock_id, job_id=job_id, next_id=next_id, locked=locked)
+
+
+def test_graph_diamond():
+    # a -> b, a -> c, b -> d, c -> d
+    jobs = [make_job(j, i) for i, j in enumerate("abcd")]
+    locks = [
+        make_lock(1, "a", "b"),
+        make_lock(2, "a", "c"),
+        make_lock(3, "b", "d"),
+        make_lock(4, "c", "d"),
+    ]
+
+    graph = JobGraph("artifact")
+    graph.add(jobs, locks)
+
+    assert graph.remaining == 4
+    assert [j.id for j in graph.pop_ready()] == ["a"]
+    assert graph.pop_ready() == []
+
+    assert sorted(graph.complete("a")) == ["b", "c"]
+    assert [j.id for j in graph.pop_ready()] == ["b", "c"]
+
+    assert graph.complete("b") == []
+    assert graph.complete("b") == []  # completion is idempotent
+    assert graph.complete("c") == ["d"]
+    assert graph.remaining == 1
+
+    graph.complete("d")
+
+    assert graph.remaining == 0
+
+    with pytest.raises(ValueError):
+        graph.complete("z")
+
+
+def test_graph_rebuild_from_released_locks():
+    jobs = [
+        make_job("a", 0, JobStatus.COMPLETED),
+        make_job("b", 1, JobStatus.RUNNING),
+        make_job("c", 2),
+        make_job("d", 3),
+    ]
+    locks = [
+        make_lock(1, "a", "b", locked=False),
+        make_lock(2, "a", "c", locked=False),
+        make_lock(3, "b", "d"),
+    ]
+
+    registry = JobGraphRegistry()
+    graph = registry.create("artifact", jobs, locks)
+
+    assert "artifact" in registry
+    assert graph.remaining == 3
+    assert [j.id for j in graph.pop_ready()] == ["c"]
+    assert graph.complete("b") == ["d"]
+
+    registry.remove("artifact")
+
+    assert registry.get("artifact") is None
@@ -11,6 +11,7 @@ from ferdelance.database.repositories import (
     ResourceRepository,
 )
 from ferdelance.node.api import api
+from ferdelance.node.services.resource import ResourceManagementService
 from ferdelance.schemas.database import Resource
 from ferdelance.schemas.resources import NewResource, ResourceIdentifier
 from ferdelance.security.exchange import Exchange
@@ -149,7 +150,10 @@ async def test_proxy_resource(session: AsyncSession):
         assert ri.producer_id == client_id
         assert ri.resource_id == resource.id
 
-        with open(resource.path, "rb") as f:
+        # the scheduler keeps a copy for the target, encrypted for it
+        relayed_path = ResourceManagementService(session).relayed_path(resource, cl.id)
+
+        with open(relayed_path, "rb") as f:
             read_content = f.read()
             try:
                 assert resource_content != read_content.decode()
@@ -173,3 +177,62 @@ async def test_proxy_resource(session: AsyncSession):
             _, get_content = exchange.stream_decrypt(stream.iter_bytes())
 
             assert resource_content == get_content.decode()
+
+
+@pytest.mark.asyncio
+async def test_proxy_resource_many_targets(session: AsyncSession):
+    with TestClient(api) as server:
+        exchange: Exchange = create_node(server)
+        others: list[Exchange] = [create_node(server), create_node(server)]
+
+        client_id = exchange.source_id
+        server_id = exchange.target_id
+
+        assert server_id is not None
+
+        artifact_id, job_id, resource = await setup_resource(session, client_id)
+
+        cr: ComponentRepository = ComponentRepository(session)
+
+        sv = await cr.get_by_id(server_id)
+
+        # the same resource is relayed to two targets, each with its own content
+        for other in others:
+            target = await cr.get_by_id(other.source_id)
+
+            exchange.set_remote_key(target.id, target.public_key)
+            exchange.set_proxy_key(sv.public_key)
+
+            headers, payload = exchange.create(
+                content=f"resource for {target.id}",
+                extra_headers=NewResource(
+                    artifact_id=artifact_id,
+                    job_id=job_id,
+                    resource_id=resource.id,
+                    file="attached",
+                ).model_dump(),
+            )
+
+            res = server.post("/resource/", headers=headers, content=payload)
+            res.raise_for_status()
+
+            exchange.clear_proxy()
+
+        for other in others:
+            headers, payload = other.create(ResourceIdentifier(resource_id=resource.id).model_dump_json())
+
+            with server.stream("GET", "/resource/", headers=headers, content=payload) as stream:
+                stream.raise_for_status()
+
+                _, get_content = other.stream_decrypt(stream.iter_bytes())
+
+                assert get_content.decode() == f"resource for {other.source_id}"
+
+        # components that are not targets of the resource cannot fetch it
+        exchange.set_remote_key(sv.id, sv.public_key)
+
+        headers, payload = exchange.create(ResourceIdentifier(resource_id=resource.id).model_dump_json())
+
+        res = server.request("GET", "/resource/", headers=headers, content=payload)
+
+        assert res.status_code != 200
@@ -0,0 +1,210 @@
+from ferdelance.config import config_manager, NodeConfiguration
+from ferdelance.const import TYPE_CLIENT
+from ferdelance.database.repositories import JobRepository
+from ferdelance.database.tables import Artifact, Component, Job, Project, Resource
+from ferdelance.node.services import ActionService
+from ferdelance.node.services.scheduling import (
+    FairSharePolicy,
+    FIFOPolicy,
+    PriorityPolicy,
+    get_scheduling_policy,
+)
+from ferdelance.schemas.components import Component as ComponentView
+from ferdelance.shared.actions import Action
+from ferdelance.shared.status import JobStatus
+from ferdelance.tasks.jobs.execution import JOB_CPUS, execution_options, ray_options
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from datetime import datetime, timedelta
+
+import os
+import pytest
+import ray
+
+
+async def populate(session: AsyncSession) -> dict[str, str]:
+    """Creates two projects with three artifacts, each one with scheduled jobs
+    for the same client. Returns the id of the oldest scheduled job of each
+    artifact."""
+    session.add(Project(id="p1", name="p1", token="token-1"))
+    session.add(Project(id="p2", name="p2", token="token-2"))
+
+    session.add(Artifact(id="a1", path=".", status="", project_id="p1", priority=0))
+    session.add(Artifact(id="a2", path=".", status="", project_id="p1", priority=5))
+    session.add(Artifact(id="a3", path=".", status="", project_id="p2", priority=0))
+
+    session.add(
+        Component(
+            id="client",
+            name="client",
+            version="test",
+            public_key="1",
+            ip_address="1",
+            url="",
+            type_name=TYPE_CLIENT,
+        )
+    )
+
+    t0 = datetime(2024, 1, 1)
+
+    jobs = [
+        # artifact, minutes from t0, status
+        ("a3", 0, JobStatus.RUNNING),
+        ("a3", 1, JobStatus.SCHEDULED),
+        ("a1", 2, JobStatus.RUNNING),
+        ("a1", 3, JobStatus.SCHEDULED),
+        ("a1", 4, JobStatus.SCHEDULED),
+        ("a2", 5, JobStatus.SCHEDULED),
+    ]
+
+    heads: dict[str, str] = dict()
+
+    for i, (artifact_id, minutes, status) in enumerate(jobs):
+        session.add(Resource(id=f"r{i}", path="", component_id="client"))
+        session.add(
+            Job(
+                id=f"j{i}",
+                step_id=i,
+                artifact_id=artifact_id,
+                component_id="client",
+                path=".",
+                status=status.name,
+                creation_time=t0 + timedelta(minutes=minutes),
+                resource_id=f"r{i}",
+            )
+        )
+
+        if status == JobStatus.SCHEDULED and artifact_id not in heads:
+            heads[artifact_id] = f"j{i}"
+
+    await session.commit()
+
+    return heads
+
+
+@pytest.mark.asyncio
+async def test_scheduling_policies(session: AsyncSession):
+    heads = await populate(session)
+
+    jr = JobRepository(session)
+
+    # the oldest scheduled job
+    assert (await FIFOPolicy().next_job(jr, "client")).id == heads["a3"]
+
+    # the artifact with highest priority
+    assert (await PriorityPolicy().next_job(jr, "client")).id == heads["a2"]
+
+    # same usage: the project waiting for longer
+    assert (await FairSharePolicy(dict(), 3600).next_job(jr, "client")).id == heads["a3"]
+
+    # project 1 has more share: its artifact with highest priority
+    assert (await FairSharePolicy({"token-1": 2.0}, 3600).next_job(jr, "client")).id == heads["a2"]
+
+
+@pytest.mark.asyncio
+async def test_scheduling_policy_from_config():
+    node = config_manager.get().node
+
+    try:
+        assert isinstance(get_scheduling_policy(), FIFOPolicy)
+
+        node.scheduling_policy = "priority"
+        assert isinstance(get_scheduling_policy(), PriorityPolicy)
+
+        node.scheduling_policy = "fair"
+        assert isinstance(get_scheduling_policy(), FairSharePolicy)
+
+        node.scheduling_policy = "random"
+        with pytest.raises(ValueError):
+            get_scheduling_policy()
+
+    finally:
+        node.scheduling_policy = "fifo"
+
+
+@pytest.mark.asyncio
+async def test_scheduling_max_jobs(session: AsyncSession):
+    heads = await populate(session)
+
+    ax = ActionService(session)
+    client = ComponentView(id="client", type_name=TYPE_CLIENT, public_key="1")
+
+    # the client is already running two jobs
+    assert (await ax.next(client, max_jobs=2)).action == Action.DO_NOTHING.name
+
+    update = await ax.next(client, max_jobs=3)
+    assert update.action == Action.EXECUTE.name
+    assert update.job_id == heads["a3"]
+
+    # the job sent is not fetched yet, but it occupies the client
+    assert (await ax.next(client, max_jobs=3)).action == Action.DO_NOTHING.name
+    assert (await ax.next(client, max_jobs=4)).action == Action.EXECUTE.name
+
+    assert (await ax.next(client)).action == Action.EXECUTE.name
+
+
+def test_node_cpu_budget():
+    node = NodeConfiguration()
+
+    assert node.cpu_budget() == (os.cpu_count() or 1)
+    assert node.job_cpus() is None
+    assert node.max_jobs() is None
+
+    # each job can use all the CPUs of the node, one at a time
+    node = NodeConfiguration(cpus=8)
+
+    assert node.cpu_budget() == 8
+    assert node.job_cpus() == 8
+    assert node.max_jobs() == 1
+
+    node = NodeConfiguration(cpus=8, cpus_per_job=3)
+
+    assert node.job_cpus() == 3
+    assert node.max_jobs() == 2
+
+    with pytest.raises(ValueError):
+        NodeConfiguration(cpus=2, cpus_per_job=4)
+
+    with pytest.raises(ValueError):
+        NodeConfiguration(cpus=-1)
+
+    # jobs would never start
+    with pytest.raises(ValueError):
+        NodeConfiguration(cpus_per_job=(os.cpu_count() or 1) + 1)
+
+
+@ray.remote
+class Probe:
+    def ping(self) -> str:
+        return "pong"
+
+
+def test_execution_options_without_job_cpus():
+    node = NodeConfiguration(cpus=2, cpus_per_job=2)
+
+    # Ray initialized without ray_options, as in embedded nodes
+    ray.init(num_cpus=1, include_dashboard=False)
+
+    try:
+        options = execution_options(node)
+
+        assert options == {"num_cpus": 1}
+
+        # the actor starts instead of waiting for a resource that does not exist
+        probe = Probe.options(**options).remote()  # type: ignore
+        assert ray.get(probe.ping.remote(), timeout=60) == "pong"  # type: ignore
+    finally:
+        ray.shutdown()
+
+    ray.init(**ray_options(node), include_dashboard=False)
+
+    try:
+        options = execution_options(node)
+
+        assert options == {"num_cpus": 2, "resources": {JOB_CPUS: 2}}
+
+        probe = Probe.options(**options).remote()  # type: ignore
+        assert ray.get(probe.ping.remote(), timeout=60) == "pong"  # type: ignore
+    finally:
+        ray.shutdown()
@@ -9,6 +9,7 @@ from ferdelance.database.repositories import (
     ArtifactRepository,
 )
 from ferdelance.node.api import api
+from ferdelance.node.services.graph import job_graphs
 from ferdelance.node.services.jobs import JobManagementService
 from ferdelance.node.services.resource import ResourceManagementService
 from ferdelance.workbench.interface import (
@@ -321,6 +322,9 @@ async def test_get_results(session: AsyncSession):
         job1 = await jr.get_by_id(job1.id)
         assert job1.status == JobStatus.COMPLETED
 
+        # the graph is rebuilt from the database, as after a restart
+        job_graphs.clear()
+
         # simulate job2 execution
         unlocked = await jr.list_unlocked_jobs_by_artifact_id(artifact.id)
 
@@ -4,6 +4,7 @@ from ferdelance import __version__
 from ferdelance.config import DataSourceStorage, Configuration, config_manager
 from ferdelance.const import TYPE_CLIENT, TYPE_USER
 from ferdelance.core.artifacts import Artifact, ArtifactStatus
+from ferdelance.core.containers import SUFFIX
 from ferdelance.database.repositories import (
     ArtifactRepository,
     ComponentRepository,
@@ -106,7 +107,7 @@ class ServerlessWorker:
                     resource.job_id,
                     resource.iteration,
                 )
-                / f"{resource.resource_id}.pkl",
+                / f"{resource.resource_id}{SUFFIX}",
             )
 
         env = task.run(env)
@@ -2,10 +2,17 @@ from typing import Any
 
 from ferdelance.commons import storage_job
 from ferdelance.config.config import DataSourceConfiguration, DataSourceStorage, config_manager
+from ferdelance.core import containers
 from ferdelance.core.artifacts import Artifact
-from ferdelance.core.estimators import MeanEstimator
-from ferdelance.database.repositories import AsyncSession, ComponentRepository, JobRepository
+from ferdelance.core.distributions import Collect
+from ferdelance.core.environment import Environment
+from ferdelance.core.estimators import CovarianceEstimator, MeanEstimator
+from ferdelance.core.operations import Operation
+from ferdelance.core.steps import Finalize, Ring
+from ferdelance.database import DataBase
+from ferdelance.database.repositories import AsyncSession, ComponentRepository, JobRepository, ResourceRepository
 from ferdelance.node.api import api
+from ferdelance.node.services import LocalRouteService
 from ferdelance.node.services.jobs import JobManagementService
 from ferdelance.schemas.components import Component
 from ferdelance.schemas.project import Project
@@ -18,9 +25,11 @@ from ferdelance.tasks.tasks import TaskError
 from tests.utils import TEST_PROJECT_TOKEN, create_node, create_workbench, send_metadata
 
 from fastapi.testclient import TestClient
+from sqlalchemy.pool import NullPool
 
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import httpx
 import logging
@@ -153,12 +162,11 @@ class TestRouteService(RouteService):
 def check_files_exists(work_directory: Path, artifact_id: str, job_id: str, iteration: int = 0):
     base_path: Path = storage_job(artifact_id, job_id, iteration, work_directory)
 
-    assert os.path.exists(base_path / "job.json")
     assert os.path.exists(base_path / "task.json")
     with open(base_path / "task.json", "r") as f:
         task_json = json.load(f)
-        assert os.path.exists(base_path / f'{task_json["produced_resource_id"]}.pkl')
-        assert not os.path.exists(base_path / f'{task_json["produced_resource_id"]}.pkl.enc')
+        assert os.path.exists(base_path / f'{task_json["produced_resource_id"]}.bin')
+        assert not os.path.exists(base_path / f'{task_json["produced_resource_id"]}.bin.enc')
 
 
 @pytest.mark.asyncio
@@ -277,12 +285,12 @@ async def test_execution(session: AsyncSession):
         # test files
         base_path: Path = storage_job(artifact.id, job.id, 0, SCHEDULER_WORK_DIR)
 
-        assert os.path.exists(base_path / "job.json")
+        assert os.path.exists(job.path)
         assert os.path.exists(base_path / "task.json")
         with open(base_path / "task.json", "r") as f:
             task_json = json.load(f)
-            assert os.path.exists(base_path / f'{task_json["produced_resource_id"]}.pkl')
-            assert not os.path.exists(base_path / f'{task_json["produced_resource_id"]}.pkl.enc')
+            assert os.path.exists(base_path / f'{task_json["produced_resource_id"]}.bin')
+            assert not os.path.exists(base_path / f'{task_json["produced_resource_id"]}.bin.enc')
 
         # get second task: client 1 execution ---------------------------------
         next_jobs = await jr.list_scheduled_jobs_for_artifact(artifact.id)
@@ -319,13 +327,16 @@ async def test_execution(session: AsyncSession):
         with open(base_path / "task.json", "r") as f:
             task_json = json.load(f)
 
-        assert os.path.exists(base_path / f'{task_json["produced_resource_id"]}.pkl')
-        assert not os.path.exists(base_path / f'{task_json["produced_resource_id"]}.pkl.enc')
+        assert os.path.exists(base_path / f'{task_json["produced_resource_id"]}.bin')
+        assert not os.path.exists(base_path / f'{task_json["produced_resource_id"]}.bin.enc')
 
         base_path: Path = storage_job(artifact.id, job.id, 0, SCHEDULER_WORK_DIR)
 
-        assert os.path.exists(base_path / "job.json")
-        assert os.path.exists(base_path / f'{task_json["produced_resource_id"]}.pkl')
+        # the resource is relayed to the next client with a copy encrypted for it
+        next_client = next(c for c in clients if c != worker.id())
+
+        assert os.path.exists(job.path)
+        assert os.path.exists(base_path / f'{task_json["produced_resource_id"]}.{next_client}.bin')
 
         # get third task: client 2 execution ----------------------------------
         next_jobs = await jr.list_scheduled_jobs_for_artifact(artifact.id)
@@ -362,13 +373,13 @@ async def test_execution(session: AsyncSession):
         with open(base_path / "task.json", "r") as f:
             task_json = json.load(f)
 
-        assert os.path.exists(base_path / f'{task_json["produced_resource_id"]}.pkl')
-        assert not os.path.exists(base_path / f'{task_json["produced_resource_id"]}.pkl.enc')
+        assert os.path.exists(base_path / f'{task_json["produced_resource_id"]}.bin')
+        assert not os.path.exists(base_path / f'{task_json["produced_resource_id"]}.bin.enc')
 
         base_path: Path = storage_job(artifact.id, job.id, 0, SCHEDULER_WORK_DIR)
 
-        assert os.path.exists(base_path / "job.json")
-        assert os.path.exists(base_path / f'{task_json["produced_resource_id"]}.pkl')
+        assert os.path.exists(job.path)
+        assert os.path.exists(base_path / f'{task_json["produced_resource_id"]}.bin')
 
         # get last task: scheduler completion ---------------------------------
         next_jobs = await jr.list_scheduled_jobs_for_artifact(artifact.id)
@@ -405,20 +416,19 @@ async def test_execution(session: AsyncSession):
         # test files
         base_path: Path = storage_job(artifact.id, job.id, 0, SCHEDULER_WORK_DIR)
 
-        assert os.path.exists(base_path / "job.json")
+        assert os.path.exists(job.path)
         assert os.path.exists(base_path / "task.json")
         with open(base_path / "task.json", "r") as f:
             task_json = json.load(f)
 
-        assert os.path.exists(base_path / f'{task_json["produced_resource_id"]}.pkl')
-        assert not os.path.exists(base_path / f'{task_json["produced_resource_id"]}.pkl.enc')
+        assert os.path.exists(base_path / f'{task_json["produced_resource_id"]}.bin')
+        assert not os.path.exists(base_path / f'{task_json["produced_resource_id"]}.bin.enc')
 
         # check result
 
-        with open(base_path / f'{task_json["produced_resource_id"]}.pkl', "rb") as f:
-            result = pickle.load(f)
+        result = containers.load(base_path / f'{task_json["produced_resource_id"]}.bin')
 
-        assert isinstance(result, dict)
+        assert isinstance(result, containers.ResourceContainer)
 
         mean_df = result["mean"]
 
@@ -433,3 +443,436 @@ async def test_execution(session: AsyncSession):
 
         for i in mean_df.index:
             assert abs(mean_df[i] - expected_df[i]) < 1e6
+
+
+class TestLocalRouteService(LocalRouteService):
+    def __init__(self, component_id: str, private_key: str, self_component: Component, api: TestClient) -> None:
+        super().__init__(component_id, private_key, self_component)
+
+        self.api = api
+        self.remote_calls: list[str] = list()
+
+    def _get(self, url: str, headers: dict[str, str], data: Any = None) -> httpx.Response:
+        self.remote_calls.append(url)
+        return self.api.request("GET", url, headers=headers, content=data)
+
+    def _post(self, url: str, headers: dict[str, str], data: Any = None) -> httpx.Response:
+        self.remote_calls.append(url)
+        return self.api.post(url, headers=headers, content=data)
+
+    def post_done(self, artifact_id: str, job_id: str) -> None:
+        LOGGER.info("Submitting done!")
+
+
+@pytest.mark.asyncio
+async def test_execution_local_route(session: AsyncSession):
+    cr: ComponentRepository = ComponentRepository(session)
+    jr: JobRepository = JobRepository(session)
+
+    DATA_PATH_1 = Path("tests") / "integration" / "data" / "california_housing.MedInc1.csv"
+
+    BASE_WORK_DIR = Path("tests") / "storage"
+    SCHEDULER_WORK_DIR = BASE_WORK_DIR / "artifacts"
+    NODE_1_WORK_DIR = BASE_WORK_DIR / "node_1"
+
+    data_1 = DataSourceStorage(
+        [
+            DataSourceConfiguration(
+                name="california1",
+                token=[TEST_PROJECT_TOKEN],
+                kind="file",
+                type="csv",
+                path=str(DATA_PATH_1),
+            )
+        ],
+    )
+
+    with TestClient(api) as server:
+        scheduler_component = await cr.get_self_component()
+
+        private_key_path: Path = config_manager.get().private_key_location()
+        scheduler: SchedulerNode = SchedulerNode(
+            session,
+            scheduler_component,
+            str(server.base_url),
+            private_key_path,
+        )
+
+        client_1: ClientNode = ClientNode(server, data_1)
+
+        workbench: WorkBenchNode = WorkBenchNode(server, scheduler.public_key())
+        project = workbench.project(TEST_PROJECT_TOKEN)
+
+        artifact = Artifact(
+            project_id=project.id,
+            steps=MeanEstimator().get_steps(),
+        )
+
+        artifact = await workbench.submit(scheduler, artifact)
+
+        # the route service must survive the transfer to a worker
+        route = pickle.loads(
+            pickle.dumps(LocalRouteService(scheduler.id(), scheduler.private_key(), scheduler_component))
+        )
+        assert isinstance(route, LocalRouteService)
+        assert route.self_component == scheduler_component
+
+        # local calls run each in a new event loop, on connections that are not pooled
+        async with DataBase().session_unpooled() as s:
+            assert isinstance(s.bind.pool, NullPool)
+
+        # first task: preparation on the scheduler, without using the API
+        job = (await jr.list_scheduled_jobs_for_artifact(artifact.id))[0]
+        assert job.component_id == scheduler.id()
+
+        route = TestLocalRouteService(scheduler.id(), scheduler.private_key(), scheduler_component, server)
+
+        TaskExecutionService(
+            route,
+            scheduler.id(),
+            artifact.id,
+            job.id,
+            scheduler.id(),
+            scheduler.url,
+            scheduler.remote_key(),
+            list(),
+            SCHEDULER_WORK_DIR,
+        ).run()
+
+        job = await jr.get_by_id(job.id)
+        assert job.status == JobStatus.RUNNING
+        assert "/task/" not in route.remote_calls
+
+        check_files_exists(SCHEDULER_WORK_DIR, artifact.id, job.id)
+
+        await scheduler.done(artifact.id, job.id)
+
+        # second task: client execution, through the API
+        job = (await jr.list_scheduled_jobs_for_artifact(artifact.id))[0]
+        assert job.component_id == client_1.id()
+
+        TaskExecutionService(
+            TestRouteService(client_1.id(), client_1.private_key(), server),
+            client_1.id(),
+            artifact.id,
+            job.id,
+            scheduler.id(),
+            scheduler.url,
+            client_1.remote_key(),
+            client_1.datasources(),
+            NODE_1_WORK_DIR,
+        ).run()
+
+        await scheduler.done(artifact.id, job.id)
+
+        # last task: completion on the scheduler, without using the API
+        job = (await jr.list_scheduled_jobs_for_artifact(artifact.id))[0]
+        assert job.component_id == scheduler.id()
+
+        route = TestLocalRouteService(scheduler.id(), scheduler.private_key(), scheduler_component, server)
+
+        TaskExecutionService(
+            route,
+            scheduler.id(),
+            artifact.id,
+            job.id,
+            scheduler.id(),
+            scheduler.url,
+            scheduler.remote_key(),
+            list(),
+            SCHEDULER_WORK_DIR,
+        ).run()
+
+        assert route.remote_calls == list()
+
+        await scheduler.done(artifact.id, job.id)
+
+        assert len(await jr.list_scheduled_jobs_for_artifact(artifact.id)) == 0
+
+        base_path: Path = storage_job(artifact.id, job.id, 0, SCHEDULER_WORK_DIR)
+
+        with open(base_path / "task.json", "r") as f:
+            task_json = json.load(f)
+
+        result = containers.load(base_path / f'{task_json["produced_resource_id"]}.bin')
+
+        expected = pd.read_csv(DATA_PATH_1).mean()
+
+        for i in expected.index:
+            assert abs(result["mean"][i] - expected[i]) < 1e-6
+
+
+@pytest.mark.asyncio
+async def test_execution_local_route_error(session: AsyncSession):
+    cr: ComponentRepository = ComponentRepository(session)
+    jr: JobRepository = JobRepository(session)
+
+    with TestClient(api) as server:
+        scheduler_component = await cr.get_self_component()
+
+        private_key_path: Path = config_manager.get().private_key_location()
+        scheduler: SchedulerNode = SchedulerNode(
+            session,
+            scheduler_component,
+            str(server.base_url),
+            private_key_path,
+        )
+
+        ClientNode(
+            server,
+            DataSourceStorage(
+                [
+                    DataSourceConfiguration(
+                        name="california1",
+                        token=[TEST_PROJECT_TOKEN],
+                        kind="file",
+                        type="csv",
+                        path=str(Path("tests") / "integration" / "data" / "california_housing.MedInc1.csv"),
+                    )
+                ],
+            ),
+        )
+
+        workbench: WorkBenchNode = WorkBenchNode(server, scheduler.public_key())
+        project = workbench.project(TEST_PROJECT_TOKEN)
+
+        artifact = await workbench.submit(
+            scheduler,
+            Artifact(
+                project_id=project.id,
+                steps=MeanEstimator().get_steps(),
+            ),
+        )
+
+        job = (await jr.list_scheduled_jobs_for_artifact(artifact.id))[0]
+        assert job.component_id == scheduler.id()
+
+        route = TestLocalRouteService(scheduler.id(), scheduler.private_key(), scheduler_component, server)
+        route.change_route(scheduler.id(), scheduler.public_key(), scheduler.url)
+
+        assert route.is_local
+
+        route.get_task_data(artifact.id, job.id)
+
+        # errors are serialized by the dispatcher of the node, as the completions
+        route.post_error(job.id, TaskError(job_id=job.id, message="failed"))
+
+        assert route.remote_calls == ["/task/error"]
+
+    # the dispatcher has processed all the events when the node stops
+    job = await jr.get_by_id(job.id)
+
+    assert job.status == JobStatus.ERROR
+
+
+class DataSums(Operation):
+    def exec(self, env: Environment) -> Environment:
+        assert env.df is not None
+
+        env["sums"] = env.df.sum().values
+
+        return env
+
+
+class StackSums(Operation):
+    def exec(self, env: Environment) -> Environment:
+        env["sums"] = np.stack([res["sums"] for res in env.iter_resources()])
+
+        return env
+
+
+async def execute_artifact(
+    jr: JobRepository,
+    server: TestClient,
+    scheduler: SchedulerNode,
+    clients: dict[str, tuple[ClientNode, Path]],
+    artifact_id: str,
+    scheduler_work_dir: Path,
+) -> Path:
+    """Executes all the jobs of an artifact through the API, until none is left.
+    Returns the path of the resource produced by the last job."""
+    rr: ResourceRepository = ResourceRepository(jr.session)
+
+    path = Path()
+
+    while jobs := await jr.list_scheduled_jobs_for_artifact(artifact_id):
+        for job in jobs:
+            if job.component_id in clients:
+                worker, work_dir = clients[job.component_id]
+                datasources = worker.datasources()
+            else:
+                worker, work_dir, datasources = scheduler, scheduler_work_dir, list()
+
+            TaskExecutionService(
+                TestRouteService(worker.id(), worker.private_key(), server),
+                worker.id(),
+                artifact_id,
+                job.id,
+                scheduler.id(),
+                scheduler.url,
+                worker.remote_key(),
+                datasources,
+                work_dir,
+            ).run()
+
+            await scheduler.done(artifact_id, job.id)
+
+            path = (await rr.get_by_job_id(job.id)).path
+
+    return path
+
+
+@pytest.mark.asyncio
+async def test_execution_secure_parallel(session: AsyncSession):
+    cr: ComponentRepository = ComponentRepository(session)
+    jr: JobRepository = JobRepository(session)
+
+    DATA_PATH_1 = Path("tests") / "integration" / "data" / "california_housing.MedInc1.csv"
+    DATA_PATH_2 = Path("tests") / "integration" / "data" / "california_housing.MedInc2.csv"
+
+    BASE_WORK_DIR = Path("tests") / "storage"
+    SCHEDULER_WORK_DIR = BASE_WORK_DIR / "artifacts"
+
+    with TestClient(api) as server:
+        scheduler_component = await cr.get_self_component()
+
+        private_key_path: Path = config_manager.get().private_key_location()
+        scheduler: SchedulerNode = SchedulerNode(
+            session,
+            scheduler_component,
+            str(server.base_url),
+            private_key_path,
+        )
+
+        clients: dict[str, tuple[ClientNode, Path]] = dict()
+
+        for i, data_path in enumerate((DATA_PATH_1, DATA_PATH_2)):
+            client = ClientNode(
+                server,
+                DataSourceStorage(
+                    [
+                        DataSourceConfiguration(
+                            name=f"california{i}",
+                            token=[TEST_PROJECT_TOKEN],
+                            kind="file",
+                            type="csv",
+                            path=str(data_path),
+                        )
+                    ],
+                ),
+            )
+            clients[client.id()] = client, BASE_WORK_DIR / f"node_{i + 1}"
+
+        workbench: WorkBenchNode = WorkBenchNode(server, scheduler.public_key())
+        project = workbench.project(TEST_PROJECT_TOKEN)
+
+        artifact = Artifact(
+            project_id=project.id,
+            steps=MeanEstimator(parallel=True).get_steps(),
+        )
+
+        artifact = await workbench.submit(scheduler, artifact)
+
+        # the masks of the first worker are sent both to itself and to the sum of the masks
+        path = await execute_artifact(jr, server, scheduler, clients, artifact.id, SCHEDULER_WORK_DIR)
+
+        jobs = await jr.list_jobs_by_artifact_id(artifact.id)
+
+        assert len(jobs) == 6
+        assert all(job.status == JobStatus.COMPLETED for job in jobs)
+
+        result = containers.load(path)
+
+        data_df = pd.concat([pd.read_csv(DATA_PATH_1), pd.read_csv(DATA_PATH_2)])
+        expected = data_df.mean()
+
+        for i in expected.index:
+            assert abs(result["mean"][i] - expected[i]) < 1e-6
+
+        # the masked covariance uses the same step
+        features = ["MedInc", "HouseAge", "AveRooms"]
+
+        artifact = Artifact(
+            project_id=project.id,
+            steps=CovarianceEstimator(features=features, masked=True).get_steps(),
+        )
+
+        artifact = await workbench.submit(scheduler, artifact)
+
+        path = await execute_artifact(jr, server, scheduler, clients, artifact.id, SCHEDULER_WORK_DIR)
+
+        result = containers.load(path)
+
+        assert np.allclose(result["covariance"], data_df[features].cov().values)
+
+
+@pytest.mark.asyncio
+async def test_execution_ring(session: AsyncSession):
+    cr: ComponentRepository = ComponentRepository(session)
+    jr: JobRepository = JobRepository(session)
+
+    DATA_PATH_1 = Path("tests") / "integration" / "data" / "california_housing.MedInc1.csv"
+    DATA_PATH_2 = Path("tests") / "integration" / "data" / "california_housing.MedInc2.csv"
+
+    BASE_WORK_DIR = Path("tests") / "storage"
+    SCHEDULER_WORK_DIR = BASE_WORK_DIR / "artifacts"
+
+    with TestClient(api) as server:
+        scheduler_component = await cr.get_self_component()
+
+        private_key_path: Path = config_manager.get().private_key_location()
+        scheduler: SchedulerNode = SchedulerNode(
+            session,
+            scheduler_component,
+            str(server.base_url),
+            private_key_path,
+        )
+
+        clients: dict[str, tuple[ClientNode, Path]] = dict()
+
+        for i, data_path in enumerate((DATA_PATH_1, DATA_PATH_2)):
+            client = ClientNode(
+                server,
+                DataSourceStorage(
+                    [
+                        DataSourceConfiguration(
+                            name=f"california{i}",
+                            token=[TEST_PROJECT_TOKEN],
+                            kind="file",
+                            type="csv",
+                            path=str(data_path),
+                        )
+                    ],
+                ),
+            )
+            clients[client.id()] = client, BASE_WORK_DIR / f"node_{i + 1}"
+
+        workbench: WorkBenchNode = WorkBenchNode(server, scheduler.public_key())
+        project = workbench.project(TEST_PROJECT_TOKEN)
+
+        artifact = Artifact(
+            project_id=project.id,
+            steps=[
+                Ring(DataSums(), ["sums"], Collect()),
+                Finalize(StackSums()),
+            ],
+        )
+
+        artifact = await workbench.submit(scheduler, artifact)
+
+        # each stage of a client sends its chunk both to itself and to the next client
+        path = await execute_artifact(jr, server, scheduler, clients, artifact.id, SCHEDULER_WORK_DIR)
+
+        jobs = await jr.list_jobs_by_artifact_id(artifact.id)
+
+        assert len(jobs) == 3 * 2 + 1
+        assert all(job.status == JobStatus.COMPLETED for job in jobs)
+
+        result = containers.load(path)
+
+        expected = pd.concat([pd.read_csv(DATA_PATH_1), pd.read_csv(DATA_PATH_2)]).sum().values
+
+        assert len(result["sums"]) == 2
+
+        for sums in result["sums"]:
+            assert np.allclose(sums, expected)
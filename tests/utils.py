@@ -1,7 +1,8 @@
 from typing import Any
 
 from ferdelance.const import TYPE_CLIENT
-from ferdelance.core.interfaces import SchedulerContext
+from ferdelance.core.environment import Environment
+from ferdelance.core.interfaces import SchedulerContext, SchedulerJob
 from ferdelance.database.repositories import ProjectRepository, AsyncSession, ArtifactRepository, JobRepository
 from ferdelance.logging import get_logger
 from ferdelance.schemas.client import ClientUpdate
@@ -15,6 +16,8 @@ from ferdelance.shared.actions import Action
 from ferdelance.shared.status import JobStatus
 
 from fastapi.testclient import TestClient
+from pandas import DataFrame
+from pathlib import Path
 from pydantic import BaseModel, ConfigDict
 
 import json
@@ -341,5 +344,50 @@ def get_scheduler_context(n_workers: int = 2) -> SchedulerContext:
     )
 
 
+def execute_jobs(
+    jobs: list[SchedulerJob],
+    work_dir: Path,
+    data: dict[str, DataFrame] | None = None,
+) -> dict[int, Environment]:
+    """Executes the jobs in order in the current process, passing the products
+    along the locks. Each worker has its own directory, where its local
+    variables are stored.
+
+    Args:
+        jobs (list[SchedulerJob]):
+            Jobs to execute, sorted in a valid execution order.
+        work_dir (Path):
+            Directory where the environments are stored.
+        data (dict[str, DataFrame] | None, optional):
+            Input data of each worker, by component id.
+            Defaults to None.
+
+    Returns:
+        dict[int, Environment]:
+            The environment produced by each job, by job id.
+    """
+    envs: dict[int, Environment] = dict()
+
+    for job in jobs:
+        job_dir = work_dir / job.worker.id / str(job.id)
+        job_dir.mkdir(parents=True)
+
+        env = Environment("artifact", "", f"{job.id}", job_dir)
+
+        if data is not None and job.worker.id in data:
+            env.df = data[job.worker.id]
+
+        for prev in jobs:
+            if job.id in prev.locks:
+                env.add_resource(f"{prev.id}", envs[prev.id].product_path())
+
+        env = job.step.step(env)
+        env.store()
+
+        envs[job.id] = env
+
+    return envs
+
+
 def random_string(length: int) -> str:
     return "".join(random.choice(string.ascii_letters) for _ in range(length))
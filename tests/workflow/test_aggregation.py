@@ -1,6 +1,7 @@
 from typing import Any
 
 from ferdelance.config import DataSourceConfiguration, DataSourceStorage
+from ferdelance.core import containers
 from ferdelance.core.artifacts import Artifact
 from ferdelance.core.distributions import Collect
 from ferdelance.core.model_operations import Train, TrainTest, Aggregation
@@ -17,13 +18,11 @@ from sklearn.ensemble import RandomForestClassifier
 from pathlib import Path
 
 import os
-import pickle
 import pytest
 
 
 def load_resource(res: Resource) -> Any:
-    with open(res.path, "rb") as f:
-        return pickle.load(f)
+    return containers.load(res.path)
 
 
 @pytest.mark.asyncio
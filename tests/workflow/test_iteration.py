@@ -146,3 +146,84 @@ async def test_iteration(session: AsyncSession):
 
     # cleanup
     shutil.rmtree(config_manager.get().storage_artifact(artifact_id))
+
+
+@pytest.mark.asyncio
+async def test_iteration_lazy(session: AsyncSession):
+    config_manager.get().node.lazy_iterations = True
+
+    try:
+        server = ServerlessExecution(session)
+
+        await server.setup()
+        await server.create_project(TEST_PROJECT_TOKEN)
+
+        worker = await server.add_worker(get_metadata(TEST_PROJECT_TOKEN))
+
+        project = await server.get_project(TEST_PROJECT_TOKEN)
+
+        model = DummyModel()
+        artifact = Artifact(
+            id="",
+            project_id=project.id,
+            steps=[
+                Iterate(
+                    iterations=3,
+                    steps=[
+                        Parallel(
+                            Train(query=project.extract(), model=model),
+                            Collect(),
+                        ),
+                        Finalize(Aggregation(model=model)),
+                    ],
+                )
+            ],
+        )
+
+        artifact_id = await server.submit(artifact)
+
+        aggregation_resource_id = ""
+
+        for it in range(3):
+            # only the jobs of the current iteration exist
+            await assert_jobs_count(server.ar, server.jr, artifact_id, it, 2 * (it + 1), 1, 1, 0, 2 * it)
+
+            # client
+            next_action = await worker.next_action()
+
+            assert next_action.action == "EXECUTE"
+
+            task = await worker.get_task(next_action)
+
+            assert task.iteration == it
+
+            # the first job of an iteration receives the aggregation of the previous one
+            if it > 0:
+                assert [r.resource_id for r in task.required_resources] == [aggregation_resource_id]
+            else:
+                assert task.required_resources == []
+
+            await server.task_completed(task)
+
+            # server
+            job_id = await server.next(server.self_component)
+
+            assert job_id is not None
+
+            task = await server.get_task(job_id)
+
+            aggregation_resource_id = task.produced_resource_id
+
+            await server.task_completed(task)
+
+        await assert_jobs_count(server.ar, server.jr, artifact_id, 2, 6, 0, 0, 0, 6)
+
+        next_action = await worker.next_action()
+
+        assert next_action.action == "DO_NOTHING"
+
+        # cleanup
+        shutil.rmtree(config_manager.get().storage_artifact(artifact_id))
+
+    finally:
+        config_manager.get().node.lazy_iterations = False